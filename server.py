@@ -10,12 +10,14 @@ import sys
 import os
 import signal
 import argparse
+import logging
+import threading
 from typing import Optional
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.config import Config, ConfigurationError
+from src.config import Config, ConfigurationError, get_config
 from src.logging_config import setup_logging, get_logger
 from src.afs_client import AFSClient
 from src.metrics_transformer import MetricsTransformer
@@ -64,20 +66,61 @@ Examples:
     return parser.parse_args()
 
 
-def setup_signal_handlers(server: Optional[MetricsServer] = None):
-    """Set up signal handlers for graceful shutdown."""
+def shutdown_components(server: Optional[MetricsServer] = None,
+                        afs_client: Optional[AFSClient] = None) -> None:
+    """
+    Release the worker pool and AFS API connections.
+    
+    Runs from the shutdown thread under the Flask server and from gunicorn's
+    exit hooks, which replace the signal handlers below.
+    """
+    logger = get_logger(__name__)
+    
+    if server:
+        logger.info("Stopping HTTP server...")
+        server.metrics_handler.close()
+    
+    if afs_client:
+        logger.info("Closing AFS API client connections...")
+        afs_client.close()
+
+
+def setup_signal_handlers(server: Optional[MetricsServer] = None,
+                          afs_client: Optional[AFSClient] = None) -> threading.Event:
+    """
+    Set up signal handlers for graceful shutdown.
+    
+    The handlers only record the signal and set an event; logging and cleanup
+    run on a dedicated shutdown thread so no locks are taken inside the
+    interrupted frame.
+    
+    Returns:
+        Event that is set once a shutdown signal has been received
+    """
+    shutdown_event = threading.Event()
+    received = []
+    
     def signal_handler(signum, frame):
+        received.append(signum)
+        shutdown_event.set()
+    
+    def shutdown_worker():
+        shutdown_event.wait()
         logger = get_logger(__name__)
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
+        logger.info(f"Received signal {received[0]}, shutting down gracefully...")
         
-        # Perform cleanup here if needed
-        if server:
-            logger.info("Stopping HTTP server...")
+        shutdown_components(server, afs_client)
         
-        sys.exit(0)
+        # sys.exit() would only end this thread; flush logs and exit the process
+        logging.shutdown()
+        os._exit(0)
+    
+    threading.Thread(target=shutdown_worker, name='shutdown', daemon=True).start()
     
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    
+    return shutdown_event
 
 
 def validate_configuration(config: Config) -> bool:
@@ -158,20 +201,20 @@ def test_afs_connection(config: Config) -> bool:
         if afs_client.test_connection():
             logger.info("AFS API connection test successful")
             
-            # Test actual data retrieval from first volume
+            # Test actual data retrieval from all volumes concurrently
             if afs_config.volumes:
-                volume = afs_config.volumes[0]
-                logger.info(f"Testing data retrieval from volume {volume.volume_id}...")
+                logger.info(f"Testing data retrieval from {len(afs_config.volumes)} volumes...")
                 
                 try:
-                    quota_data = afs_client.get_volume_quotas(
-                        volume_id=volume.volume_id,
-                        zone=volume.zone,
+                    quota_results = afs_client.get_volume_quotas_batch(
+                        afs_config.volumes,
                         timeout=collection_config.timeout_seconds
                     )
                     
-                    dir_count = len(quota_data.get('dir_quota_list', []))
-                    logger.info(f"Successfully retrieved quota data for {dir_count} directories")
+                    for (volume_id, zone), quota_data in quota_results.items():
+                        dir_count = len(quota_data.get('dir_quota_list', []))
+                        logger.info(f"Successfully retrieved quota data for {dir_count} directories "
+                                   f"from volume {volume_id} in zone {zone}")
                     
                 except Exception as e:
                     logger.error(f"Data retrieval test failed: {e}")
@@ -193,7 +236,7 @@ def main():
     
     try:
         # Load configuration
-        config = Config(config_file=args.config)
+        config = get_config(args.config)
         
         # Set up logging
         logging_config = config.get_logging_config()
@@ -240,7 +283,8 @@ def main():
             access_key=afs_config.access_key,
             secret_key=afs_config.secret_key,
             base_url=afs_config.base_url,
-            retry_config=retry_config
+            retry_config=retry_config,
+            cache_ttl=collection_config.cache_duration
         )
         
         # Create metrics transformer
@@ -260,13 +304,14 @@ def main():
         )
         
         # Set up signal handlers
-        setup_signal_handlers(server)
+        setup_signal_handlers(server, afs_client)
         
         logger.info("All components initialized successfully")
         
         # Start server
         logger.info("Starting HTTP server...")
-        server.start_server(debug=args.debug)
+        server.start_server(debug=args.debug,
+                            on_shutdown=lambda: shutdown_components(server, afs_client))
         
     except ConfigurationError as e:
         # Don't use logger here as logging might not be set up
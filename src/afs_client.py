@@ -5,26 +5,76 @@ AFS API Client module for handling HMAC authentication and quota data retrieval.
 import hashlib
 import hmac
 import base64
+import logging
+import socket
+import threading
 import time
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
+try:
+    # orjson is an optional, faster drop-in for parsing quota payloads
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # msgspec, when installed, decodes and validates quota payloads in one C pass
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from src.config import VolumeConfig
 from src.exceptions import (
     AuthenticationError, APIError, NetworkError, TimeoutError, 
     InvalidCredentialsError, SignatureError, create_network_error, 
     create_timeout_error, create_api_error
 )
-from src.logging_config import get_logger, log_operation, log_api_request
+from src.logging_config import get_logger, log_operation, log_api_request, logger_context
 from src.retry_handler import RetryHandler, RetryConfig, create_retry_config
 
 
+class _QuotaResponse(TypedDict):
+    """Schema of the dir_quota response that the client relies on."""
+    dir_quota_list: List[Dict[str, Any]]
+
+
+# Built once; None means the json_loads path with manual validation is used
+_QUOTA_DECODER = msgspec.json.Decoder(_QuotaResponse) if msgspec is not None else None
+
+# Characters in volume IDs that are replaced in circuit breaker names
+_CIRCUIT_BREAKER_NAME_TABLE = str.maketrans({'&': '_', '=': '_'})
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTP adapter that enables TCP keep-alive on pooled connections so idle
+    sockets survive between scrapes instead of being dropped by middleboxes.
+    """
+    
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
 class AFSClient:
     """
     AFS API client with HMAC-SHA256 authentication support.
     """
     
-    def __init__(self, access_key: str, secret_key: str, base_url: str, retry_config: Optional[RetryConfig] = None):
+    # Fixed prefix of the string to sign, kept as bytes to skip per-call encoding
+    _SIGN_PREFIX = b'x-date: '
+    
+    def __init__(self, access_key: str, secret_key: str, base_url: str, retry_config: Optional[RetryConfig] = None,
+                 cache_ttl: float = 0.0, max_workers: int = 5):
         """
         Initialize AFS client with credentials and base URL.
         
@@ -33,11 +83,12 @@ class AFSClient:
             secret_key: AFS API secret key  
             base_url: Base URL for AFS API endpoints
             retry_config: Retry configuration (uses default if None)
+            cache_ttl: Seconds to reuse a volume's quota response (0 disables caching)
+            max_workers: Maximum concurrent fetches for batch requests
         """
-        self.access_key = access_key
-        self.secret_key = secret_key
         self.base_url = base_url.rstrip('/')
         self.logger = get_logger(__name__)
+        self._set_credentials(access_key, secret_key)
         
         # Initialize retry handler
         self.retry_config = retry_config or create_retry_config(
@@ -47,6 +98,86 @@ class AFSClient:
         )
         self.retry_handler = RetryHandler(self.retry_config)
         
+        # Shared HTTP session so connections (and TLS handshakes) are reused
+        # across requests instead of being re-established on every fetch
+        self._session = requests.Session()
+        # Pool is never smaller than the fetch fan-out, so concurrent workers
+        # overlap on warm connections instead of discarding surplus ones
+        adapter = _KeepAliveAdapter(pool_connections=16, pool_maxsize=max(32, max_workers), max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            # Quota lists are repetitive JSON; urllib3 decompresses transparently
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        
+        # Parsed quota responses keyed by (volume_id, zone) -> (expiry, data)
+        self.cache_ttl = cache_ttl
+        self._quota_cache: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        self._quota_cache_lock = threading.Lock()
+        
+        # In-flight fetches keyed by (volume_id, zone) so identical concurrent
+        # requests share one API call
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Circuit breaker name and retry log context per (volume_id, zone); the
+        # same volumes recur every scrape so these are built once
+        self._retry_params: Dict[Tuple[str, str], Tuple[str, Dict[str, str]]] = {}
+        
+        # Worker pool for fanning out multi-volume requests (threads start lazily)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='afs-fetch')
+    
+    def _set_credentials(self, access_key: str, secret_key: str) -> None:
+        """
+        Store credentials and reset all state derived from them.
+        
+        Args:
+            access_key: AFS API access key
+            secret_key: AFS API secret key
+        """
+        self.access_key = access_key
+        self.secret_key = secret_key
+        
+        # Keyed HMAC state, built on first use and copied for each signature
+        # so the secret is only encoded and padded once
+        self._hmac_template: Optional[hmac.HMAC] = None
+        
+        # Constant part of the HMAC Authorization header; only the signature varies
+        self._auth_prefix = (
+            f'hmac accesskey="{access_key}",'
+            f'algorithm="hmac-sha256",'
+            f'headers="x-date",'
+            f'signature="'
+        )
+        
+        # Last (X-Date, Authorization) pair; the signature only covers the
+        # second-resolution date, so requests within one second share it
+        self._signed_date: Optional[Tuple[str, str]] = None
+        
+        # Set once test_connection() has validated these credentials
+        self._connection_tested = False
+    
+    def rotate_credentials(self, access_key: str, secret_key: str) -> None:
+        """
+        Replace the API credentials used for signing requests.
+        
+        Args:
+            access_key: New AFS API access key
+            secret_key: New AFS API secret key
+        """
+        self._set_credentials(access_key, secret_key)
+        self.logger.info("AFS API credentials rotated")
+    
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release pooled connections.
+        """
+        self._executor.shutdown(wait=False)
+        self._session.close()
+        
     def _get_current_date(self) -> str:
         """
         Get current date in UTC/GMT format for X-Date header.
@@ -54,8 +185,8 @@ class AFSClient:
         Returns:
             Date string in GMT format (e.g., 'Wed, 15 Oct 2025 11:58:51 GMT')
         """
-        # Use UTC timezone to match the bash script format
-        return datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')
+        # RFC 1123 date in GMT; locale-independent unlike strftime's %a/%b
+        return formatdate(usegmt=True)
     
     def _generate_signature(self, date_string: str, method: str = 'GET', 
                           path: str = '', content_type: str = '') -> str:
@@ -75,18 +206,17 @@ class AFSClient:
             AuthenticationError: If signature generation fails
         """
         try:
-            # Create string to sign using the correct AFS format: "x-date: {date_string}"
-            string_to_sign = f"x-date: {date_string}"
+            # Generate HMAC-SHA256 signature from the cached keyed state
+            if self._hmac_template is None:
+                self._hmac_template = hmac.new(self.secret_key.encode('utf-8'), None, hashlib.sha256)
             
-            # Generate HMAC-SHA256 signature
-            signature = hmac.new(
-                self.secret_key.encode('utf-8'),
-                string_to_sign.encode('utf-8'),
-                hashlib.sha256
-            ).digest()
+            # Sign the correct AFS format: "x-date: {date_string}" (RFC 1123 dates are ASCII)
+            mac = self._hmac_template.copy()
+            mac.update(self._SIGN_PREFIX + date_string.encode('ascii'))
+            signature = mac.digest()
             
             # Return base64 encoded signature
-            return base64.b64encode(signature).decode('utf-8')
+            return base64.b64encode(signature).decode('ascii')
             
         except Exception as e:
             self.logger.error(f"Failed to generate HMAC signature: {e}")
@@ -112,16 +242,16 @@ class AFSClient:
             # Get current GMT date
             date_string = self._get_current_date()
             
-            # Generate HMAC signature
-            signature = self._generate_signature(date_string, method, path, content_type)
-            
-            # Create HMAC authorization header in the format expected by AFS API
-            auth_header = (
-                f'hmac accesskey="{self.access_key}",'
-                f'algorithm="hmac-sha256",'
-                f'headers="x-date",'
-                f'signature="{signature}"'
-            )
+            signed_date = self._signed_date
+            if signed_date is not None and signed_date[0] == date_string:
+                auth_header = signed_date[1]
+            else:
+                # Generate HMAC signature
+                signature = self._generate_signature(date_string, method, path, content_type)
+                
+                # Create HMAC authorization header in the format expected by AFS API
+                auth_header = self._auth_prefix + signature + '"'
+                self._signed_date = (date_string, auth_header)
             
             return {
                 'X-Date': date_string,
@@ -132,14 +262,21 @@ class AFSClient:
             self.logger.error(f"Failed to create authentication headers: {e}")
             raise SignatureError(f"Authentication header creation failed: {e}", original_error=e)
     
-    def get_volume_quotas(self, volume_id: str, zone: str, timeout: int = 30) -> Dict:
+    def get_volume_quotas(self, volume_id: str, zone: str, timeout: int = 30,
+                          deadline: Optional[float] = None) -> Dict:
         """
         Retrieve directory quota information for a specific volume and zone.
         
+        Concurrent callers for the same volume and zone share a single fetch.
+        When cache_ttl is set, a successful response is also reused for that
+        many seconds.
+        
         Args:
             volume_id: AFS volume identifier
             zone: AFS zone identifier
             timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() value after which no further
+                request attempts are made
             
         Returns:
             Dictionary containing quota data from AFS API
@@ -148,16 +285,116 @@ class AFSClient:
             AuthenticationError: If authentication fails
             APIError: If API request fails or returns invalid data
         """
+        key = (volume_id, zone)
+        if self.cache_ttl > 0:
+            quota_data = self._get_cached_quotas(key)
+            if quota_data is not None:
+                return quota_data
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+        
+        if not is_leader:
+            self.logger.debug(f"Joining in-flight quota request for volume {volume_id}")
+            return future.result()
+        
+        try:
+            quota_data = self._fetch_volume_quotas(volume_id, zone, timeout, deadline=deadline)
+            if self.cache_ttl > 0:
+                with self._quota_cache_lock:
+                    self._quota_cache[key] = (time.monotonic() + self.cache_ttl, quota_data)
+            future.set_result(quota_data)
+            return quota_data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def get_volume_quotas_batch(self, volumes: List[VolumeConfig],
+                                timeout: int = 30) -> Dict[Tuple[str, str], Dict]:
+        """
+        Retrieve quota information for several volumes concurrently.
+        
+        Args:
+            volumes: Volume configurations to fetch
+            timeout: Request timeout in seconds for each volume
+            
+        Returns:
+            Dictionary mapping (volume_id, zone) to quota data
+            
+        Raises:
+            AuthenticationError: If authentication fails for any volume
+            APIError: If any volume request fails or returns invalid data
+        """
+        # Duplicate volume entries are fetched once
+        keys = dict.fromkeys((volume.volume_id, volume.zone) for volume in volumes)
+        future_to_key = {
+            self._executor.submit(self.get_volume_quotas, volume_id, zone, timeout): (volume_id, zone)
+            for volume_id, zone in keys
+        }
+        
+        return {future_to_key[future]: future.result() for future in as_completed(future_to_key)}
+    
+    def _get_cached_quotas(self, key: Tuple[str, str]) -> Optional[Dict]:
+        """
+        Return a cached quota response if it has not expired.
+        
+        Args:
+            key: (volume_id, zone) cache key
+            
+        Returns:
+            Cached quota data, or None if missing or expired
+        """
+        with self._quota_cache_lock:
+            entry = self._quota_cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            self.logger.debug(f"Using cached quota data for volume {key[0]}")
+            return entry[1]
+        return None
+    
+    def clear_cache(self) -> None:
+        """Drop all cached quota responses."""
+        with self._quota_cache_lock:
+            self._quota_cache.clear()
+    
+    def _fetch_volume_quotas(self, volume_id: str, zone: str, timeout: int,
+                             deadline: Optional[float] = None) -> Dict:
+        """
+        Fetch quota data from the AFS API with retry and circuit breaker protection.
+        
+        Args:
+            volume_id: AFS volume identifier
+            zone: AFS zone identifier
+            timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() deadline for all attempts
+            
+        Returns:
+            Dictionary containing quota data from AFS API
+        """
+        key = (volume_id, zone)
+        params = self._retry_params.get(key)
+        if params is None:
+            # Create a clean circuit breaker name without special characters
+            circuit_breaker_name = 'afs_api_' + volume_id.translate(_CIRCUIT_BREAKER_NAME_TABLE)
+            params = (circuit_breaker_name, {'volume_id': volume_id, 'zone': zone})
+            self._retry_params[key] = params
+        
         # Use retry handler for the API request
-        # Create a clean circuit breaker name without special characters
-        clean_volume_id = volume_id.replace('&', '_').replace('=', '_')
+        circuit_breaker_name, context = params
         result = self.retry_handler.execute_with_retry(
             self._get_volume_quotas_single_attempt,
             volume_id,
             zone,
             timeout,
-            circuit_breaker_name=f"afs_api_{clean_volume_id}",
-            context={'volume_id': volume_id, 'zone': zone}
+            deadline,
+            circuit_breaker_name=circuit_breaker_name,
+            context=context,
+            retry_deadline=deadline
         )
         
         if result.success:
@@ -165,7 +402,8 @@ class AFSClient:
         else:
             raise result.error
     
-    def _get_volume_quotas_single_attempt(self, volume_id: str, zone: str, timeout: int) -> Dict:
+    def _get_volume_quotas_single_attempt(self, volume_id: str, zone: str, timeout: int,
+                                          deadline: Optional[float] = None) -> Dict:
         """
         Single attempt to retrieve volume quotas (used by retry handler).
         
@@ -173,194 +411,220 @@ class AFSClient:
             volume_id: AFS volume identifier
             zone: AFS zone identifier
             timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() deadline; the attempt is skipped
+                once it has passed and the HTTP timeout is capped to what remains
             
         Returns:
             Dictionary containing quota data from AFS API
         """
-        # Context is already set by retry handler, just add operation-specific info
-        self.logger.set_context(operation='get_volume_quotas')
-        
-        try:
-            # Construct API endpoint path using the correct AFS API format
-            path = f"/storage/afs/data/v1/volume/{volume_id}/dir_quotas"
-            url = f"{self.base_url}{path}"
+        with logger_context(operation='get_volume_quotas', volume_id=volume_id):
+            try:
+                # Don't start work the scraper has already given up on
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.logger.warning(f"Scrape deadline exceeded, skipping request for volume {volume_id}")
+                        raise TimeoutError(
+                            "Scrape deadline exceeded before AFS API request",
+                            timeout_duration=timeout,
+                            retryable=False
+                        )
+                    timeout = min(timeout, remaining)
             
-            with log_operation(self.logger, f"AFS API request for volume {volume_id}", level='DEBUG'):
-                # Create authentication headers
-                headers = self._create_auth_headers(method='GET', path=path)
-                
-                # Add additional headers
-                headers.update({
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                })
-                
-                # Add required parameters for AFS API
-                params = {
-                    'volume_id': volume_id,
-                    'zone': zone
-                }
+                # Construct API endpoint path using the correct AFS API format
+                path = f"/storage/afs/data/v1/volume/{volume_id}/dir_quotas"
+                url = f"{self.base_url}{path}"
+            
+                with log_operation(self.logger, f"AFS API request for volume {volume_id}", level='DEBUG'):
+                    # Create authentication headers
+                    headers = self._create_auth_headers(method='GET', path=path)
                 
-                self.logger.debug(f"Making API request to endpoint {path}")
+                    # Add required parameters for AFS API
+                    params = {
+                        'volume_id': volume_id,
+                        'zone': zone
+                    }
                 
-                # Log complete request details for debugging
-                self.logger.info("=" * 60)
-                self.logger.info("🌐 完整的 AFS API 请求详情")
-                self.logger.info("=" * 60)
-                self.logger.info(f"📍 URL: {url}")
-                self.logger.info(f"🔧 Method: GET")
-                self.logger.info(f"📋 Headers:")
-                for key, value in headers.items():
-                    # Use print to bypass log sanitization for debugging
-                    print(f"    {key}: {value}")
-                    self.logger.info(f"    {key}: {'***FULL_VALUE_PRINTED_ABOVE***' if key == 'Authorization' else value}")
-                self.logger.info(f"📊 Parameters:")
-                for key, value in params.items():
-                    self.logger.info(f"    {key}: {value}")
-                self.logger.info(f"⏱️  Timeout: {timeout}s")
-                self.logger.info("=" * 60)
+                    # Full request details are only assembled when DEBUG is enabled
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        header_lines = "\n".join(
+                            f"    {key}: {'***REDACTED***' if key == 'Authorization' else value}"
+                            for key, value in headers.items()
+                        )
+                        self.logger.debug(
+                            f"AFS API request: GET {url}\n"
+                            f"  Headers:\n{header_lines}\n"
+                            f"  Parameters: {params}\n"
+                            f"  Timeout: {timeout}s"
+                        )
                 
-                # Make API request with timing
-                start_time = time.time()
-                try:
-                    response = requests.get(
-                        url,
-                        headers=headers,
-                        params=params,
-                        timeout=timeout
-                    )
-                except requests.exceptions.Timeout as e:
-                    duration = time.time() - start_time
-                    self.logger.error(f"Request timeout after {timeout} seconds")
-                    raise create_timeout_error(timeout, "AFS API request")
+                    # Make API request with timing
+                    start_time = time.time()
+                    try:
+                        response = self._session.get(
+                            url,
+                            headers=headers,
+                            params=params,
+                            timeout=timeout
+                        )
+                    except requests.exceptions.Timeout as e:
+                        duration = time.time() - start_time
+                        self.logger.error(f"Request timeout after {timeout} seconds")
+                        raise create_timeout_error(timeout, "AFS API request")
                     
-                except requests.exceptions.ConnectionError as e:
-                    self.logger.error(f"Connection error: {str(e)[:200]}")
-                    raise create_network_error(e, {'volume_id': volume_id, 'zone': zone})
+                    except requests.exceptions.ConnectionError as e:
+                        self.logger.error("Connection error: %.200s", e)
+                        raise create_network_error(e, {'volume_id': volume_id, 'zone': zone})
                     
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(f"Request error: {str(e)[:200]}")
-                    raise create_network_error(e, {'volume_id': volume_id, 'zone': zone})
+                    except requests.exceptions.RequestException as e:
+                        self.logger.error("Request error: %.200s", e)
+                        raise create_network_error(e, {'volume_id': volume_id, 'zone': zone})
                 
-                duration = time.time() - start_time
+                    duration = time.time() - start_time
                 
-                # Log complete response details for debugging
-                self.logger.info("📥 完整的 AFS API 响应详情")
-                self.logger.info("=" * 60)
-                self.logger.info(f"📊 Status Code: {response.status_code}")
-                self.logger.info(f"⏱️  Duration: {duration:.3f}s")
-                self.logger.info(f"📋 Response Headers:")
-                for key, value in response.headers.items():
-                    self.logger.info(f"    {key}: {value}")
+                    # Full response details, including a content preview, for debugging
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        # Preview from the raw bytes so the full body is never decoded to str
+                        raw_content = response.content
+                        header_lines = "\n".join(
+                            f"    {key}: {value}" for key, value in response.headers.items()
+                        )
+                        self.logger.debug(
+                            f"AFS API response: {response.status_code} in {duration:.3f}s\n"
+                            f"  Headers:\n{header_lines}\n"
+                            f"  Content ({len(raw_content)} bytes): "
+                            f"{raw_content[:1000].decode('utf-8', errors='replace')}"
+                            f"{'...' if len(raw_content) > 1000 else ''}"
+                        )
                 
-                # Log response content (first 1000 characters)
-                response_text = response.text
-                self.logger.info(f"📄 Response Content ({len(response_text)} chars):")
-                if len(response_text) > 1000:
-                    self.logger.info(f"    {response_text[:1000]}...")
-                else:
-                    self.logger.info(f"    {response_text}")
-                self.logger.info("=" * 60)
+                    # Log API request details
+                    log_api_request(
+                        self.logger,
+                        method='GET',
+                        url=url,
+                        status_code=response.status_code,
+                        duration=duration
+                    )
                 
-                # Log API request details
-                log_api_request(
-                    self.logger,
-                    method='GET',
-                    url=url,
-                    status_code=response.status_code,
-                    duration=duration
-                )
+                    # Handle authentication errors
+                    if response.status_code == 401:
+                        self.logger.error("Authentication failed - invalid credentials or signature")
+                        raise InvalidCredentialsError("Invalid credentials or signature")
                 
-                # Handle authentication errors
-                if response.status_code == 401:
-                    self.logger.error("Authentication failed - invalid credentials or signature")
-                    raise InvalidCredentialsError("Invalid credentials or signature")
+                    # Handle forbidden access
+                    if response.status_code == 403:
+                        self.logger.error("Access forbidden - check permissions")
+                        raise InvalidCredentialsError("Access forbidden - check permissions")
                 
-                # Handle forbidden access
-                if response.status_code == 403:
-                    self.logger.error("Access forbidden - check permissions")
-                    raise InvalidCredentialsError("Access forbidden - check permissions")
+                    # Handle not found
+                    if response.status_code == 404:
+                        self.logger.error("Volume not found")
+                        raise create_api_error(404, f"Volume {volume_id} not found in zone {zone}")
                 
-                # Handle not found
-                if response.status_code == 404:
-                    self.logger.error("Volume not found")
-                    raise create_api_error(404, f"Volume {volume_id} not found in zone {zone}")
+                    # Handle rate limiting
+                    if response.status_code == 429:
+                        retry_after = int(response.headers.get('Retry-After', 60))
+                        self.logger.warning(f"Rate limited, retry after {retry_after} seconds")
+                        raise create_api_error(429, "Rate limit exceeded", {'retry_after': retry_after})
                 
-                # Handle rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    self.logger.warning(f"Rate limited, retry after {retry_after} seconds")
-                    raise create_api_error(429, "Rate limit exceeded", {'retry_after': retry_after})
+                    # Handle other client errors
+                    if 400 <= response.status_code < 500:
+                        error_text = response.text[:200] or "No error details"
+                        self.logger.error(f"Client error {response.status_code}: {error_text}")
+                        raise create_api_error(response.status_code, error_text)
                 
-                # Handle other client errors
-                if 400 <= response.status_code < 500:
-                    error_text = response.text[:200] if response.text else "No error details"
-                    self.logger.error(f"Client error {response.status_code}: {error_text}")
-                    raise create_api_error(response.status_code, error_text)
+                    # Handle server errors
+                    if response.status_code >= 500:
+                        error_text = response.text[:200] or "No error details"
+                        self.logger.error(f"Server error {response.status_code}: {error_text}")
+                        raise create_api_error(response.status_code, error_text)
                 
-                # Handle server errors
-                if response.status_code >= 500:
-                    error_text = response.text[:200] if response.text else "No error details"
-                    self.logger.error(f"Server error {response.status_code}: {error_text}")
-                    raise create_api_error(response.status_code, error_text)
+                    # Check for successful response
+                    if response.status_code != 200:
+                        self.logger.error(f"Unexpected status code {response.status_code}")
+                        raise create_api_error(response.status_code, "Unexpected status code")
                 
-                # Check for successful response
-                if response.status_code != 200:
-                    self.logger.error(f"Unexpected status code {response.status_code}")
-                    raise create_api_error(response.status_code, "Unexpected status code")
+                    # Parse and validate JSON response
+                    quota_data = self._parse_quota_response(response.content)
                 
-                # Parse JSON response
-                try:
-                    quota_data = response.json()
-                    
-                    # Validate response structure
-                    if not isinstance(quota_data, dict):
-                        raise APIError("Invalid response format: expected JSON object")
-                    
-                    if 'dir_quota_list' not in quota_data:
-                        raise APIError("Invalid response format: missing dir_quota_list")
-                    
                     # Log success with data summary
-                    dir_count = len(quota_data.get('dir_quota_list', []))
+                    dir_count = len(quota_data['dir_quota_list'])
                     self.logger.info(f"Successfully retrieved quota data for {dir_count} directories")
-                    
+                
                     return quota_data
-                    
-                except ValueError as e:
-                    self.logger.error(f"Invalid JSON response: {e}")
-                    raise APIError(f"Invalid JSON response: {e}", original_error=e)
                 
-        except (AuthenticationError, APIError, NetworkError, TimeoutError):
-            # Re-raise our custom exceptions
-            raise
+            except (AuthenticationError, APIError, NetworkError, TimeoutError):
+                # Re-raise our custom exceptions
+                raise
             
-        except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)[:200]}")
-            raise APIError(f"Unexpected error: {e}", original_error=e)
+            except Exception as e:
+                self.logger.error("Unexpected error: %.200s", e)
+                raise APIError(f"Unexpected error: {e}", original_error=e)
+    
+    def _parse_quota_response(self, content: bytes) -> Dict:
+        """
+        Decode a quota response body and validate its structure.
+        
+        Args:
+            content: Raw response body
             
-        finally:
-            # Clear context
-            self.logger.clear_context()
+        Returns:
+            Dictionary containing a dir_quota_list list
+            
+        Raises:
+            APIError: If the body is not valid JSON or has the wrong shape
+        """
+        if _QUOTA_DECODER is not None:
+            try:
+                return _QUOTA_DECODER.decode(content)
+            except msgspec.ValidationError as e:
+                self.logger.error(f"Invalid response format: {e}")
+                raise APIError(f"Invalid response format: {e}", original_error=e)
+            except msgspec.DecodeError as e:
+                self.logger.error(f"Invalid JSON response: {e}")
+                raise APIError(f"Invalid JSON response: {e}", original_error=e)
+        
+        try:
+            quota_data = json_loads(content)
+        except ValueError as e:
+            # Both json and orjson decode errors subclass ValueError
+            self.logger.error(f"Invalid JSON response: {e}")
+            raise APIError(f"Invalid JSON response: {e}", original_error=e)
+        
+        # Validate response structure with a single lookup
+        if not isinstance(quota_data, dict):
+            raise APIError("Invalid response format: expected JSON object")
+        
+        dir_quota_list = quota_data.get('dir_quota_list')
+        if not isinstance(dir_quota_list, list):
+            if dir_quota_list is None:
+                raise APIError("Invalid response format: missing dir_quota_list")
+            raise APIError("Invalid response format: dir_quota_list is not a list")
+        
+        return quota_data
     
     def test_connection(self) -> bool:
         """
         Test connection to AFS API by making a simple authenticated request.
         
+        A successful result is remembered until the credentials are rotated,
+        so repeated checks do no signing work.
+        
         Returns:
             True if connection is successful, False otherwise
         """
-        self.logger.set_context(operation='test_connection')
+        if self._connection_tested:
+            return True
         
-        try:
-            with log_operation(self.logger, "AFS API connection test", level='INFO'):
-                # Try to create auth headers to test credentials
-                self._create_auth_headers()
-                self.logger.info("AFS API connection test successful")
-                return True
+        with logger_context(operation='test_connection'):
+            try:
+                with log_operation(self.logger, "AFS API connection test", level='INFO'):
+                    # Try to create auth headers to test credentials
+                    self._create_auth_headers()
+                    self._connection_tested = True
+                    self.logger.info("AFS API connection test successful")
+                    return True
                 
-        except Exception as e:
-            self.logger.error(f"AFS API connection test failed: {str(e)[:200]}")
-            return False
-            
-        finally:
-            self.logger.clear_context()
\ No newline at end of file
+            except Exception as e:
+                self.logger.error("AFS API connection test failed: %.200s", e)
+                return False
\ No newline at end of file
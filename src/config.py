@@ -1,13 +1,18 @@
 """Configuration management module for AFS Prometheus metrics collector."""
 
+import copy
+import json
 import os
-import yaml
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Any, Tuple
+from dataclasses import astuple, dataclass
 from pathlib import Path
 
+# Re-exported so callers can keep importing ConfigurationError from here
+from src.exceptions import ConfigurationError
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class VolumeConfig:
     """Configuration for a single AFS volume."""
     volume_id: str
@@ -20,41 +25,159 @@ class AFSConfig:
     access_key: str
     secret_key: str
     base_url: str
-    volumes: List[VolumeConfig]
+    volumes: Tuple[VolumeConfig, ...]
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerConfig:
     """HTTP server configuration."""
     host: str = "0.0.0.0"
     port: int = 8080
     request_timeout: int = 30
+    threads: int = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class CollectionConfig:
     """Data collection configuration."""
     max_retries: int = 3
     retry_delay: int = 2
     timeout_seconds: int = 25
     cache_duration: int = 30
+    max_concurrency: int = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration."""
     level: str = "INFO"
     format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 
-class ConfigurationError(Exception):
-    """Raised when configuration is invalid or missing."""
-    pass
+# Accepted logging levels, in the order they are listed in error messages
+_LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+_VALID_LOG_LEVELS = frozenset(_LOG_LEVELS)
+
+# Schemes accepted for the AFS base_url
+_URL_SCHEMES = ('http://', 'https://')
+
+# Lowercased example credentials that indicate an unedited configuration
+_PLACEHOLDER_KEYS = frozenset({'your_access_key', 'your_secret_key'})
+
+# Validation rules per config section: (field, predicate, error message).
+# Rules run in order, so later predicates may rely on earlier type checks.
+_SERVER_SCHEMA = (
+    ('host', lambda v: isinstance(v, str) and bool(v.strip()),
+     "Server host must be a non-empty string"),
+    ('port', lambda v: isinstance(v, int) and 0 < v <= 65535,
+     "Server port must be an integer between 1 and 65535"),
+    ('request_timeout', lambda v: isinstance(v, int) and v > 0,
+     "Server request_timeout must be a positive integer"),
+    ('threads', lambda v: isinstance(v, int) and v > 0,
+     "Server threads must be a positive integer"),
+)
+
+_COLLECTION_SCHEMA = (
+    ('max_retries', lambda v: isinstance(v, int) and v >= 0,
+     "Collection max_retries must be a non-negative integer"),
+    ('retry_delay', lambda v: isinstance(v, int) and v > 0,
+     "Collection retry_delay must be a positive integer"),
+    ('timeout_seconds', lambda v: isinstance(v, int) and v > 0,
+     "Collection timeout_seconds must be a positive integer"),
+    ('cache_duration', lambda v: isinstance(v, int) and v >= 0,
+     "Collection cache_duration must be a non-negative integer"),
+    ('max_concurrency', lambda v: isinstance(v, int) and v > 0,
+     "Collection max_concurrency must be a positive integer"),
+)
+
+_LOGGING_SCHEMA = (
+    ('level', lambda v: isinstance(v, str),
+     "Logging level must be a string"),
+    ('level', lambda v: v.upper() in _VALID_LOG_LEVELS,
+     f"Logging level must be one of: {', '.join(_LOG_LEVELS)}"),
+    ('format', lambda v: isinstance(v, str) and bool(v.strip()),
+     "Logging format must be a non-empty string"),
+)
+
+
+def _check_schema(section: Any, schema: tuple) -> None:
+    """Validate a config section against a schema table.
+    
+    Args:
+        section: Config dataclass instance to check
+        schema: Tuple of (field, predicate, error message) rules
+        
+    Raises:
+        ConfigurationError: With the message of the first failing rule
+    """
+    for field_name, is_valid, message in schema:
+        if not is_valid(getattr(section, field_name)):
+            raise ConfigurationError(message)
+
+
+# Parsed YAML documents keyed by path, invalidated when the file's mtime or size changes
+_YAML_CACHE: Dict[str, Any] = {}
+
+
+def _parse_yaml_file(config_file: Path) -> Any:
+    """Parse a YAML file, importing PyYAML only when a file actually needs parsing.
+    
+    Env-only deployments never pay the PyYAML import cost.
+    
+    Args:
+        config_file: Path to YAML file
+        
+    Returns:
+        Parsed YAML document
+        
+    Raises:
+        ConfigurationError: If PyYAML is unavailable or the YAML is invalid
+    """
+    try:
+        import yaml
+    except ImportError:
+        raise ConfigurationError("PyYAML is required for file-based configuration")
+    
+    # libyaml-backed loader is much faster; fall back if PyYAML was built without it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=loader)
+    except yaml.YAMLError as e:
+        raise ConfigurationError(f"Invalid YAML in configuration file {config_file}: {e}")
+
+
+def _load_yaml_file(config_file: Path) -> Any:
+    """Parse a YAML file, reusing the previous result if the file is unchanged.
+    
+    Results are cached in memory for this process only; nothing derived
+    from the file (which holds credentials) is written back to disk.
+    
+    Args:
+        config_file: Path to YAML file
+        
+    Returns:
+        Parsed YAML document (treat as read-only, it is shared between callers)
+    """
+    stat = config_file.stat()
+    path_key = str(config_file.resolve())
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    cached = _YAML_CACHE.get(path_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    config_data = _parse_yaml_file(config_file)
+    _YAML_CACHE[path_key] = (signature, config_data)
+    return config_data
 
 
 class Config:
     """Configuration manager for AFS Prometheus metrics collector."""
     
+    __slots__ = ('afs', 'server', 'collection', 'logging', '_validated_state')
+    
     def __init__(self, config_file: Optional[str] = None):
         """Initialize configuration manager.
         
@@ -66,6 +189,10 @@ class Config:
         self.collection: CollectionConfig = CollectionConfig()
         self.logging: LoggingConfig = LoggingConfig()
         
+        # Section values that last passed validate(); sections are mutable, so
+        # any reassignment or field change makes the current state differ
+        self._validated_state: Optional[tuple] = None
+        
         # Load configuration from file first (if exists)
         if config_file:
             self.load_from_file(config_file)
@@ -77,32 +204,33 @@ class Config:
     
     def load_from_env(self) -> None:
         """Load configuration from environment variables."""
+        # Snapshot once; os.getenv re-encodes the key through os.environ on every lookup
+        env = dict(os.environ)
+        
         # AFS configuration
-        access_key = os.getenv("AFS_ACCESS_KEY")
-        secret_key = os.getenv("AFS_SECRET_KEY")
-        base_url = os.getenv("AFS_BASE_URL", "https://afs.cn-sh-01.sensecoreapi.cn")
+        access_key = env.get("AFS_ACCESS_KEY")
+        secret_key = env.get("AFS_SECRET_KEY")
+        base_url = env.get("AFS_BASE_URL", "https://afs.cn-sh-01.sensecoreapi.cn")
         
         if access_key and secret_key:
             volumes = []
             
             # Try to parse volumes from JSON format first (Kubernetes style)
-            volumes_json = os.getenv("AFS_VOLUMES")
+            volumes_json = env.get("AFS_VOLUMES")
             if volumes_json:
                 try:
-                    import json
-                    volumes_data = json.loads(volumes_json)
-                    for volume_data in volumes_data:
-                        volumes.append(VolumeConfig(
-                            volume_id=volume_data["volume_id"],
-                            zone=volume_data["zone"]
-                        ))
+                    volume_config = VolumeConfig
+                    volumes = [
+                        volume_config(volume_id=volume_data["volume_id"], zone=volume_data["zone"])
+                        for volume_data in json.loads(volumes_json)
+                    ]
                 except (json.JSONDecodeError, KeyError, TypeError) as e:
                     raise ConfigurationError(f"Invalid AFS_VOLUMES format: {e}")
             
             # Fallback to single volume format
             if not volumes:
-                volume_id = os.getenv("AFS_VOLUME_ID")
-                zone = os.getenv("AFS_ZONE")
+                volume_id = env.get("AFS_VOLUME_ID")
+                zone = env.get("AFS_ZONE")
                 if volume_id and zone:
                     volumes.append(VolumeConfig(volume_id=volume_id, zone=zone))
             
@@ -110,26 +238,28 @@ class Config:
                 access_key=access_key,
                 secret_key=secret_key,
                 base_url=base_url,
-                volumes=volumes
+                volumes=tuple(volumes)
             )
         
         # Server configuration
         self.server = ServerConfig(
-            host=os.getenv("SERVER_HOST", "0.0.0.0"),
-            port=int(os.getenv("SERVER_PORT", "8080")),
-            request_timeout=int(os.getenv("REQUEST_TIMEOUT", "30"))
+            host=env.get("SERVER_HOST", "0.0.0.0"),
+            port=int(env.get("SERVER_PORT", "8080")),
+            request_timeout=int(env.get("REQUEST_TIMEOUT", "30")),
+            threads=int(env.get("SERVER_THREADS", "8"))
         )
         
         # Collection configuration
         self.collection = CollectionConfig(
-            max_retries=int(os.getenv("MAX_RETRIES", "3")),
-            retry_delay=int(os.getenv("RETRY_DELAY", "2")),
-            timeout_seconds=int(os.getenv("COLLECTION_TIMEOUT", "25")),
-            cache_duration=int(os.getenv("CACHE_DURATION", "30"))
+            max_retries=int(env.get("MAX_RETRIES", "3")),
+            retry_delay=int(env.get("RETRY_DELAY", "2")),
+            timeout_seconds=int(env.get("COLLECTION_TIMEOUT", "25")),
+            cache_duration=int(env.get("CACHE_DURATION", "30")),
+            max_concurrency=int(env.get("COLLECTION_MAX_CONCURRENCY", "4"))
         )
         
         # Logging configuration
-        log_format = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        log_format = env.get("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         
         # Handle special format keywords
         if log_format.lower() == "json":
@@ -138,7 +268,7 @@ class Config:
             log_format = "%(levelname)s - %(message)s"
         
         self.logging = LoggingConfig(
-            level=os.getenv("LOG_LEVEL", "INFO"),
+            level=env.get("LOG_LEVEL", "INFO"),
             format=log_format
         )
     
@@ -156,8 +286,7 @@ class Config:
             if not config_file.exists():
                 raise ConfigurationError(f"Configuration file not found: {config_path}")
             
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
+            config_data = _load_yaml_file(config_file)
             
             if not config_data:
                 raise ConfigurationError(f"Configuration file is empty: {config_path}")
@@ -165,14 +294,11 @@ class Config:
             # Load AFS configuration
             if 'afs' in config_data:
                 afs_config = config_data['afs']
-                volumes = []
-                
-                if 'volumes' in afs_config:
-                    for vol_config in afs_config['volumes']:
-                        volumes.append(VolumeConfig(
-                            volume_id=vol_config['volume_id'],
-                            zone=vol_config['zone']
-                        ))
+                volume_config = VolumeConfig
+                volumes = tuple([
+                    volume_config(volume_id=vol_config['volume_id'], zone=vol_config['zone'])
+                    for vol_config in afs_config.get('volumes', ())
+                ])
                 
                 self.afs = AFSConfig(
                     access_key=afs_config.get('access_key', ''),
@@ -187,7 +313,8 @@ class Config:
                 self.server = ServerConfig(
                     host=server_config.get('host', '0.0.0.0'),
                     port=server_config.get('port', 8080),
-                    request_timeout=server_config.get('request_timeout', 30)
+                    request_timeout=server_config.get('request_timeout', 30),
+                    threads=server_config.get('threads', 8)
                 )
             
             # Load collection configuration
@@ -197,7 +324,8 @@ class Config:
                     max_retries=collection_config.get('max_retries', 3),
                     retry_delay=collection_config.get('retry_delay', 2),
                     timeout_seconds=collection_config.get('timeout_seconds', 25),
-                    cache_duration=collection_config.get('cache_duration', 30)
+                    cache_duration=collection_config.get('cache_duration', 30),
+                    max_concurrency=collection_config.get('max_concurrency', 4)
                 )
             
             # Load logging configuration
@@ -208,12 +336,17 @@ class Config:
                     format=logging_config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
                 )
                 
-        except yaml.YAMLError as e:
-            raise ConfigurationError(f"Invalid YAML in configuration file {config_path}: {e}")
-        except (KeyError, TypeError, ValueError) as e:
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # AttributeError: a section is a scalar or list instead of a mapping
             raise ConfigurationError(f"Invalid configuration structure in {config_path}: {e}")
-        except Exception as e:
-            raise ConfigurationError(f"Error loading configuration file {config_path}: {e}")
+        except OSError as e:
+            # Reads from network-mounted config can fail transiently
+            raise ConfigurationError(
+                f"I/O error reading configuration file {config_path}: {e}",
+                retryable=True,
+                retry_after=5,
+                original_error=e
+            )
     
     def get_afs_config(self) -> AFSConfig:
         """Get AFS configuration.
@@ -255,63 +388,88 @@ class Config:
     def validate(self) -> bool:
         """Validate the complete configuration.
         
+        The validated section values are remembered; later calls return
+        immediately while no section has been replaced or modified.
+        
         Returns:
             True if configuration is valid
             
         Raises:
             ConfigurationError: If configuration is invalid
         """
+        state = self._section_state()
+        if state == self._validated_state:
+            return True
+        
         self._validate_afs_config()
         self._validate_server_config()
         self._validate_collection_config()
         self._validate_logging_config()
+        self._validated_state = state
         return True
     
+    def _section_state(self) -> tuple:
+        """Get the field values of every section, as compared by validate().
+        
+        Returns:
+            Tuple with one entry per section (None for a missing AFS section)
+        """
+        return tuple(
+            None if section is None else astuple(section)
+            for section in (self.afs, self.server, self.collection, self.logging)
+        )
+    
     def _validate_afs_config(self) -> None:
         """Validate AFS configuration.
         
         Raises:
             ConfigurationError: If AFS configuration is invalid
         """
-        if not self.afs:
+        afs = self.afs
+        if not afs:
             raise ConfigurationError("AFS configuration is required")
         
         # Validate access key format
-        if not self.afs.access_key or not isinstance(self.afs.access_key, str):
+        access_key = afs.access_key
+        if not access_key or not isinstance(access_key, str):
             raise ConfigurationError("AFS access_key is required and must be a non-empty string")
         
-        if len(self.afs.access_key.strip()) == 0:
+        if not access_key.strip():
             raise ConfigurationError("AFS access_key cannot be empty")
         
         # Validate secret key format
-        if not self.afs.secret_key or not isinstance(self.afs.secret_key, str):
+        secret_key = afs.secret_key
+        if not secret_key or not isinstance(secret_key, str):
             raise ConfigurationError("AFS secret_key is required and must be a non-empty string")
         
-        if len(self.afs.secret_key.strip()) == 0:
+        if not secret_key.strip():
             raise ConfigurationError("AFS secret_key cannot be empty")
         
         # Validate base URL format
-        if not self.afs.base_url or not isinstance(self.afs.base_url, str):
+        base_url = afs.base_url
+        if not base_url or not isinstance(base_url, str):
             raise ConfigurationError("AFS base_url is required and must be a non-empty string")
         
-        if not self.afs.base_url.startswith(('http://', 'https://')):
+        if not base_url.startswith(_URL_SCHEMES):
             raise ConfigurationError("AFS base_url must start with http:// or https://")
         
         # Validate volumes configuration
-        if not self.afs.volumes:
+        if not afs.volumes:
             raise ConfigurationError("At least one AFS volume must be configured")
         
-        for i, volume in enumerate(self.afs.volumes):
-            if not volume.volume_id or not isinstance(volume.volume_id, str):
+        for i, volume in enumerate(afs.volumes):
+            volume_id = volume.volume_id
+            if not volume_id or not isinstance(volume_id, str):
                 raise ConfigurationError(f"Volume {i}: volume_id is required and must be a non-empty string")
             
-            if len(volume.volume_id.strip()) == 0:
+            if not volume_id.strip():
                 raise ConfigurationError(f"Volume {i}: volume_id cannot be empty")
             
-            if not volume.zone or not isinstance(volume.zone, str):
+            zone = volume.zone
+            if not zone or not isinstance(zone, str):
                 raise ConfigurationError(f"Volume {i}: zone is required and must be a non-empty string")
             
-            if len(volume.zone.strip()) == 0:
+            if not zone.strip():
                 raise ConfigurationError(f"Volume {i}: zone cannot be empty")
     
     def _validate_server_config(self) -> None:
@@ -320,14 +478,7 @@ class Config:
         Raises:
             ConfigurationError: If server configuration is invalid
         """
-        if not isinstance(self.server.host, str) or len(self.server.host.strip()) == 0:
-            raise ConfigurationError("Server host must be a non-empty string")
-        
-        if not isinstance(self.server.port, int) or self.server.port <= 0 or self.server.port > 65535:
-            raise ConfigurationError("Server port must be an integer between 1 and 65535")
-        
-        if not isinstance(self.server.request_timeout, int) or self.server.request_timeout <= 0:
-            raise ConfigurationError("Server request_timeout must be a positive integer")
+        _check_schema(self.server, _SERVER_SCHEMA)
     
     def _validate_collection_config(self) -> None:
         """Validate collection configuration.
@@ -335,17 +486,7 @@ class Config:
         Raises:
             ConfigurationError: If collection configuration is invalid
         """
-        if not isinstance(self.collection.max_retries, int) or self.collection.max_retries < 0:
-            raise ConfigurationError("Collection max_retries must be a non-negative integer")
-        
-        if not isinstance(self.collection.retry_delay, int) or self.collection.retry_delay <= 0:
-            raise ConfigurationError("Collection retry_delay must be a positive integer")
-        
-        if not isinstance(self.collection.timeout_seconds, int) or self.collection.timeout_seconds <= 0:
-            raise ConfigurationError("Collection timeout_seconds must be a positive integer")
-        
-        if not isinstance(self.collection.cache_duration, int) or self.collection.cache_duration < 0:
-            raise ConfigurationError("Collection cache_duration must be a non-negative integer")
+        _check_schema(self.collection, _COLLECTION_SCHEMA)
         
         # Validate that timeout is less than request timeout
         if self.collection.timeout_seconds >= self.server.request_timeout:
@@ -357,16 +498,7 @@ class Config:
         Raises:
             ConfigurationError: If logging configuration is invalid
         """
-        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        
-        if not isinstance(self.logging.level, str):
-            raise ConfigurationError("Logging level must be a string")
-        
-        if self.logging.level.upper() not in valid_levels:
-            raise ConfigurationError(f"Logging level must be one of: {', '.join(valid_levels)}")
-        
-        if not isinstance(self.logging.format, str) or len(self.logging.format.strip()) == 0:
-            raise ConfigurationError("Logging format must be a non-empty string")
+        _check_schema(self.logging, _LOGGING_SCHEMA)
     
     def validate_credentials_format(self) -> bool:
         """Validate AFS credentials format specifically.
@@ -391,11 +523,64 @@ class Config:
             raise ConfigurationError("AFS secret_key appears too short (minimum 16 characters)")
         
         # Check for obvious placeholder values
-        placeholder_values = ['your_access_key', 'your_secret_key', 'YOUR_ACCESS_KEY', 'YOUR_SECRET_KEY']
-        if access_key.lower() in [p.lower() for p in placeholder_values]:
+        if access_key.lower() in _PLACEHOLDER_KEYS:
             raise ConfigurationError("AFS access_key appears to be a placeholder value")
         
-        if secret_key.lower() in [p.lower() for p in placeholder_values]:
+        if secret_key.lower() in _PLACEHOLDER_KEYS:
             raise ConfigurationError("AFS secret_key appears to be a placeholder value")
         
-        return True
\ No newline at end of file
+        return True
+
+
+# Environment variables read by Config.load_from_env(); their values are part of get_config()'s cache key
+_ENV_KEYS = (
+    "AFS_ACCESS_KEY", "AFS_SECRET_KEY", "AFS_BASE_URL", "AFS_VOLUMES", "AFS_VOLUME_ID", "AFS_ZONE",
+    "SERVER_HOST", "SERVER_PORT", "REQUEST_TIMEOUT", "SERVER_THREADS",
+    "MAX_RETRIES", "RETRY_DELAY", "COLLECTION_TIMEOUT", "CACHE_DURATION", "COLLECTION_MAX_CONCURRENCY",
+    "LOG_FORMAT", "LOG_LEVEL",
+)
+
+
+@lru_cache(maxsize=4)
+def _cached_config(config_file: Optional[str], mtime_ns: int, env_state: Tuple[Optional[str], ...]) -> Config:
+    """Build and validate a Config; cached per (path, mtime, environment) by get_config()."""
+    config = Config(config_file=config_file)
+    try:
+        config.validate()
+    except ConfigurationError:
+        # Still returned; the caller's validate() reports the problem
+        pass
+    return config
+
+
+def get_config(config_file: Optional[str] = None) -> Config:
+    """Get the Config for a configuration file.
+    
+    The file is read and validated at most once per process while neither
+    it nor the configuration environment variables change; editing the file
+    or changing one of those variables yields a fresh Config. Each call
+    returns its own copy, so callers may modify it freely; validate() on an
+    unmodified copy of a valid configuration returns without re-checking.
+    
+    Args:
+        config_file: Optional path to YAML configuration file; defaults to
+            config.yaml in the working directory if it exists
+        
+    Returns:
+        Config instance
+        
+    Raises:
+        ConfigurationError: If the file cannot be read or parsed
+    """
+    if config_file is None and os.path.exists("config.yaml"):
+        config_file = "config.yaml"
+    
+    try:
+        mtime_ns = os.stat(config_file).st_mtime_ns if config_file else 0
+    except OSError:
+        # Let Config report the missing or unreadable file
+        mtime_ns = 0
+    
+    env_state = tuple(os.environ.get(key) for key in _ENV_KEYS)
+    
+    return copy.deepcopy(_cached_config(config_file, mtime_ns, env_state))
@@ -2,14 +2,50 @@
 Data models for AFS Prometheus metrics system.
 
 This module contains dataclasses for representing Prometheus metrics
-and AFS quota data structures.
+and AFS quota data structures. They are created per quota entry on every
+scrape, so they use __slots__; AFSQuotaData instances are also recycled.
 """
 
+import sys
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 
-@dataclass
+class LabelSet(dict):
+    """
+    Labels dict that also keeps its items sorted by label name.
+    
+    A LabelSet is built once and shared by every metric with the same
+    labels instead of being copied per metric, so the exposition formatter
+    can use sorted_items instead of sorting on every line. Sharing is only
+    safe because the mapping never changes, so every mutating method
+    raises TypeError.
+    
+    Attributes:
+        sorted_items: (name, value) pairs ordered by label name
+        rendered: Exposition label string, filled in by the formatter the
+            first time the set is formatted
+    """
+    __slots__ = ('sorted_items', 'rendered')
+    
+    def __init__(self, labels: Dict[str, str]):
+        super().__init__(labels)
+        self.sorted_items: Tuple[Tuple[str, str], ...] = tuple(sorted(self.items()))
+        self.rendered: Optional[str] = None
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("LabelSet is read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        # The default dict pickling re-adds items through __setitem__
+        return (LabelSet, (dict(self),))
+
+
+@dataclass(slots=True, frozen=True)
 class PrometheusMetric:
     """
     Represents a single Prometheus metric with its metadata.
@@ -28,7 +64,12 @@ class PrometheusMetric:
     metric_type: str = "gauge"
 
 
-@dataclass
+# Released AFSQuotaData instances available for reuse; bounded so an
+# unusually large response cannot pin memory after the scrape
+_QUOTA_DATA_POOL: Deque['AFSQuotaData'] = deque(maxlen=1024)
+
+
+@dataclass(slots=True)
 class AFSQuotaData:
     """
     Represents AFS quota data structure matching the API response.
@@ -60,6 +101,10 @@ class AFSQuotaData:
         """
         Create AFSQuotaData instance from API response item.
         
+        A previously released instance is repopulated when one is available.
+        volume_id and zone come from a small fixed set and become label
+        values on every metric, so they are interned to share one object.
+        
         Args:
             quota_item: Dictionary from dir_quota_list API response
             zone: Zone identifier to include in the data
@@ -67,13 +112,45 @@ class AFSQuotaData:
         Returns:
             AFSQuotaData instance
         """
-        return cls(
-            volume_id=quota_item['volume_id'],
-            zone=zone,
-            dir_path=quota_item['dir_path'],
-            file_quantity_quota=quota_item['file_quantity_quota'],
-            file_quantity_used_quota=quota_item['file_quantity_used_quota'],
-            capacity_quota=quota_item['capacity_quota'],
-            capacity_used_quota=quota_item['capacity_used_quota'],
-            state=quota_item['state']
-        )
\ No newline at end of file
+        # Read every field first so a malformed item never leaves a
+        # half-populated instance behind
+        volume_id = sys.intern(quota_item['volume_id'])
+        zone = sys.intern(zone)
+        dir_path = quota_item['dir_path']
+        file_quantity_quota = quota_item['file_quantity_quota']
+        file_quantity_used_quota = quota_item['file_quantity_used_quota']
+        capacity_quota = quota_item['capacity_quota']
+        capacity_used_quota = quota_item['capacity_used_quota']
+        state = quota_item['state']
+        
+        try:
+            instance = _QUOTA_DATA_POOL.pop()
+        except IndexError:
+            return cls(
+                volume_id=volume_id,
+                zone=zone,
+                dir_path=dir_path,
+                file_quantity_quota=file_quantity_quota,
+                file_quantity_used_quota=file_quantity_used_quota,
+                capacity_quota=capacity_quota,
+                capacity_used_quota=capacity_used_quota,
+                state=state
+            )
+        
+        instance.volume_id = volume_id
+        instance.zone = zone
+        instance.dir_path = dir_path
+        instance.file_quantity_quota = file_quantity_quota
+        instance.file_quantity_used_quota = file_quantity_used_quota
+        instance.capacity_quota = capacity_quota
+        instance.capacity_used_quota = capacity_used_quota
+        instance.state = state
+        return instance
+    
+    def release(self) -> None:
+        """
+        Return this instance to the pool used by from_api_response.
+        
+        Only call this once nothing holds a reference to the instance.
+        """
+        _QUOTA_DATA_POOL.append(self)
@@ -29,6 +29,19 @@ class ErrorCategory(Enum):
     RATE_LIMIT = "rate_limit"
 
 
+# Plain-dict views of the enum values; a dict lookup avoids the Enum .value descriptor
+_CATEGORY_VALUES = {category: category.value for category in ErrorCategory}
+_SEVERITY_VALUES = {severity: severity.value for severity in ErrorSeverity}
+
+
+def _add_context(kwargs: Dict[str, Any], key: str, value: Any) -> None:
+    """Add a key to the context in subclass kwargs, creating the dict only if missing."""
+    context = kwargs.get('context')
+    if context is None:
+        kwargs['context'] = context = {}
+    context[key] = value
+
+
 class AFSCollectorError(Exception):
     """
     Base exception for AFS collector with enhanced error context.
@@ -62,8 +75,23 @@ class AFSCollectorError(Exception):
         self.severity = severity
         self.retryable = retryable
         self.retry_after = retry_after
-        self.context = context or {}
+        self._context = context or None
         self.original_error = original_error
+        
+        # Resolve serialized enum values once for to_dict()
+        self._category_value = _CATEGORY_VALUES[category]
+        self._severity_value = _SEVERITY_VALUES[severity]
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Additional error context, allocated on first access when none was given."""
+        if self._context is None:
+            self._context = {}
+        return self._context
+    
+    @context.setter
+    def context(self, value: Dict[str, Any]) -> None:
+        self._context = value
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -72,161 +100,166 @@ class AFSCollectorError(Exception):
         Returns:
             Dictionary representation of the exception
         """
+        original_error = self.original_error
         return {
-            'error_type': self.__class__.__name__,
+            'error_type': type(self).__name__,
             'message': str(self),
-            'category': self.category.value,
-            'severity': self.severity.value,
+            'category': self._category_value,
+            'severity': self._severity_value,
             'retryable': self.retryable,
             'retry_after': self.retry_after,
             'context': self.context,
-            'original_error': str(self.original_error) if self.original_error else None
+            'original_error': str(original_error) if original_error else None
         }
 
 
 class AuthenticationError(AFSCollectorError):
     """Authentication related errors."""
     
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.AUTHENTICATION)
-        kwargs.setdefault('severity', ErrorSeverity.HIGH)
-        kwargs.setdefault('retryable', False)  # Auth errors usually not retryable
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str, *,
+                 category: ErrorCategory = ErrorCategory.AUTHENTICATION,
+                 severity: ErrorSeverity = ErrorSeverity.HIGH,
+                 retryable: bool = False,  # Auth errors usually not retryable
+                 **kwargs):
+        super().__init__(message, category=category, severity=severity, retryable=retryable, **kwargs)
 
 
 class InvalidCredentialsError(AuthenticationError):
     """Invalid or expired credentials."""
     
-    def __init__(self, message: str = "Invalid or expired credentials", **kwargs):
-        kwargs.setdefault('severity', ErrorSeverity.CRITICAL)
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str = "Invalid or expired credentials", *,
+                 severity: ErrorSeverity = ErrorSeverity.CRITICAL, **kwargs):
+        super().__init__(message, severity=severity, **kwargs)
 
 
 class SignatureError(AuthenticationError):
     """HMAC signature generation or validation errors."""
     
-    def __init__(self, message: str = "Signature generation or validation failed", **kwargs):
-        kwargs.setdefault('retryable', True)  # Signature errors might be transient
-        kwargs.setdefault('retry_after', 1)
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str = "Signature generation or validation failed", *,
+                 retryable: bool = True,  # Signature errors might be transient
+                 retry_after: Optional[int] = 1,
+                 **kwargs):
+        super().__init__(message, retryable=retryable, retry_after=retry_after, **kwargs)
 
 
 class APIError(AFSCollectorError):
     """API communication errors."""
     
-    def __init__(self, message: str, status_code: Optional[int] = None, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.API)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
-        
+    def __init__(self, message: str, status_code: Optional[int] = None, *,
+                 category: ErrorCategory = ErrorCategory.API,
+                 severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+                 retryable: Optional[bool] = None,
+                 retry_after: Optional[int] = None,
+                 **kwargs):
         # Set retryability based on status code
         if status_code:
-            kwargs.setdefault('retryable', status_code >= 500 or status_code == 429)
+            if retryable is None:
+                retryable = status_code >= 500 or status_code == 429
             if status_code == 429:  # Rate limited
-                kwargs['category'] = ErrorCategory.RATE_LIMIT
-                kwargs.setdefault('retry_after', 60)
-            elif status_code >= 500:
-                kwargs.setdefault('retry_after', 5)
+                category = ErrorCategory.RATE_LIMIT
+                if retry_after is None:
+                    retry_after = 60
+            elif status_code >= 500 and retry_after is None:
+                retry_after = 5
         
-        if 'context' not in kwargs:
-            kwargs['context'] = {}
-        kwargs['context']['status_code'] = status_code
+        _add_context(kwargs, 'status_code', status_code)
         
-        super().__init__(message, **kwargs)
+        super().__init__(message, category=category, severity=severity,
+                         retryable=bool(retryable), retry_after=retry_after, **kwargs)
 
 
 class NetworkError(AFSCollectorError):
     """Network connectivity errors."""
     
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.NETWORK)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
-        kwargs.setdefault('retryable', True)
-        kwargs.setdefault('retry_after', 5)
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str, *,
+                 category: ErrorCategory = ErrorCategory.NETWORK,
+                 severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+                 retryable: bool = True,
+                 retry_after: Optional[int] = 5,
+                 **kwargs):
+        super().__init__(message, category=category, severity=severity,
+                         retryable=retryable, retry_after=retry_after, **kwargs)
 
 
 class TimeoutError(AFSCollectorError):
     """Request timeout errors."""
     
-    def __init__(self, message: str, timeout_duration: Optional[float] = None, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.TIMEOUT)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
-        kwargs.setdefault('retryable', True)
-        kwargs.setdefault('retry_after', 10)
-        
-        if 'context' not in kwargs:
-            kwargs['context'] = {}
-        kwargs['context']['timeout_duration'] = timeout_duration
+    def __init__(self, message: str, timeout_duration: Optional[float] = None, *,
+                 category: ErrorCategory = ErrorCategory.TIMEOUT,
+                 severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+                 retryable: bool = True,
+                 retry_after: Optional[int] = 10,
+                 **kwargs):
+        _add_context(kwargs, 'timeout_duration', timeout_duration)
         
-        super().__init__(message, **kwargs)
+        super().__init__(message, category=category, severity=severity,
+                         retryable=retryable, retry_after=retry_after, **kwargs)
 
 
 class ConfigurationError(AFSCollectorError):
     """Configuration related errors."""
     
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.CONFIGURATION)
-        kwargs.setdefault('severity', ErrorSeverity.CRITICAL)
-        kwargs.setdefault('retryable', False)  # Config errors need manual intervention
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str, *,
+                 category: ErrorCategory = ErrorCategory.CONFIGURATION,
+                 severity: ErrorSeverity = ErrorSeverity.CRITICAL,
+                 retryable: bool = False,  # Config errors need manual intervention
+                 **kwargs):
+        super().__init__(message, category=category, severity=severity, retryable=retryable, **kwargs)
 
 
 class MetricsError(AFSCollectorError):
     """Metrics processing errors."""
     
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.DATA_PROCESSING)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
-        kwargs.setdefault('retryable', False)  # Data processing errors usually not retryable
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str, *,
+                 category: ErrorCategory = ErrorCategory.DATA_PROCESSING,
+                 severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+                 retryable: bool = False,  # Data processing errors usually not retryable
+                 **kwargs):
+        super().__init__(message, category=category, severity=severity, retryable=retryable, **kwargs)
 
 
 class DataValidationError(MetricsError):
     """Data validation and parsing errors."""
     
     def __init__(self, message: str, invalid_data: Optional[Any] = None, **kwargs):
-        if 'context' not in kwargs:
-            kwargs['context'] = {}
-        kwargs['context']['invalid_data_type'] = type(invalid_data).__name__ if invalid_data else None
+        _add_context(kwargs, 'invalid_data_type', type(invalid_data).__name__ if invalid_data else None)
         super().__init__(message, **kwargs)
 
 
 class ServerError(AFSCollectorError):
     """HTTP server errors."""
     
-    def __init__(self, message: str, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.SERVER)
-        kwargs.setdefault('severity', ErrorSeverity.HIGH)
-        kwargs.setdefault('retryable', False)
-        super().__init__(message, **kwargs)
+    def __init__(self, message: str, *,
+                 category: ErrorCategory = ErrorCategory.SERVER,
+                 severity: ErrorSeverity = ErrorSeverity.HIGH,
+                 retryable: bool = False,
+                 **kwargs):
+        super().__init__(message, category=category, severity=severity, retryable=retryable, **kwargs)
 
 
 class PartialCollectionError(AFSCollectorError):
     """Error when some volumes fail during collection."""
     
-    def __init__(self, message: str, failed_volumes: Optional[list] = None, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.DATA_PROCESSING)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
-        kwargs.setdefault('retryable', True)
-        kwargs.setdefault('retry_after', 30)
-        
-        if 'context' not in kwargs:
-            kwargs['context'] = {}
-        kwargs['context']['failed_volumes'] = failed_volumes or []
-        kwargs['context']['failed_count'] = len(failed_volumes) if failed_volumes else 0
+    def __init__(self, message: str, failed_volumes: Optional[list] = None, *,
+                 category: ErrorCategory = ErrorCategory.DATA_PROCESSING,
+                 severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+                 retryable: bool = True,
+                 retry_after: Optional[int] = 30,
+                 **kwargs):
+        _add_context(kwargs, 'failed_volumes', failed_volumes or [])
+        _add_context(kwargs, 'failed_count', len(failed_volumes) if failed_volumes else 0)
         
-        super().__init__(message, **kwargs)
+        super().__init__(message, category=category, severity=severity,
+                         retryable=retryable, retry_after=retry_after, **kwargs)
 
 
 class RateLimitError(APIError):
     """Rate limiting errors from API."""
     
     def __init__(self, message: str = "API rate limit exceeded", retry_after: int = 60, **kwargs):
-        kwargs.setdefault('category', ErrorCategory.RATE_LIMIT)
-        kwargs.setdefault('severity', ErrorSeverity.MEDIUM)
+        # Always retryable with the given delay, whatever the caller passed
         kwargs['retryable'] = True
-        kwargs['retry_after'] = retry_after
-        super().__init__(message, status_code=429, **kwargs)
+        super().__init__(message, status_code=429, retry_after=retry_after, **kwargs)
 
 
 # Convenience functions for creating common errors
@@ -5,17 +5,105 @@ This module implements a Flask-based HTTP server that exposes AFS storage
 metrics through a /metrics endpoint compatible with Prometheus scraping.
 """
 
+import json
+import logging
 import time
-from typing import Optional
-from flask import Flask, Response, jsonify, request
+from typing import Callable, Iterable, Iterator, List, Optional
+from flask import Flask, Response, request
 from werkzeug.exceptions import RequestTimeout
 
 from src.afs_client import AFSClient
 from src.metrics_transformer import MetricsTransformer
 from src.metrics_handler import MetricsHandler
-from src.config import Config
+from src.config import Config, ServerConfig
 from src.exceptions import AuthenticationError, APIError
-from src.logging_config import get_logger, log_operation
+from src.logging_config import TRUSTED, ContextualLogger, get_logger, log_operation
+
+
+# Prometheus text exposition format, shared by every /metrics response
+_METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+_METRICS_CONTENT_TYPE_HEADER = ('Content-Type', _METRICS_CONTENT_TYPE)
+
+
+class AccessLogMiddleware:
+    """
+    WSGI middleware that binds request logging context and logs completion.
+    
+    Reads request details straight from the WSGI environ, so scrapes do not
+    pay for Flask's before/after request hooks. GET /metrics requests that
+    can be answered from the cached payload bypass Flask entirely.
+    """
+    
+    METRICS_PATH = '/metrics'
+    
+    def __init__(self, app, logger: ContextualLogger,
+                 metrics_handler: Optional[MetricsHandler] = None):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: WSGI application to wrap
+            logger: Contextual logger for request context and access logs
+            metrics_handler: Handler whose cached payload serves the fast path
+        """
+        self.app = app
+        self.logger = logger
+        self.metrics_handler = metrics_handler
+    
+    def __call__(self, environ, start_response):
+        """Handle a WSGI request, logging its status and duration."""
+        start_time = time.perf_counter()
+        status_holder = []
+        
+        def capture_status(status, headers, exc_info=None):
+            status_holder.append(status)
+            return start_response(status, headers, exc_info)
+        
+        context_token = self.logger.set_context(
+            endpoint=environ.get('PATH_INFO', ''),
+            method=environ.get('REQUEST_METHOD', ''),
+            client_ip=environ.get('REMOTE_ADDR'),
+            user_agent=environ.get('HTTP_USER_AGENT', 'Unknown')[:100]
+        )
+        try:
+            body = self._fast_metrics(environ, capture_status)
+            if body is None:
+                body = self.app(environ, capture_status)
+            if status_holder and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Request completed - status: %s, duration: %.3fs",
+                                 status_holder[0][:3],
+                                 time.perf_counter() - start_time,
+                                 extra=TRUSTED)
+            return body
+        finally:
+            self.logger.clear_context(context_token)
+    
+    def _fast_metrics(self, environ, start_response) -> Optional[List[bytes]]:
+        """
+        Answer GET /metrics from the cached payload without entering Flask.
+        
+        Args:
+            environ: WSGI environ
+            start_response: WSGI start_response callable
+            
+        Returns:
+            Response body, or None if the request must go through Flask
+        """
+        if (self.metrics_handler is None
+                or environ.get('PATH_INFO') != self.METRICS_PATH
+                or environ.get('REQUEST_METHOD') != 'GET'):
+            return None
+        
+        try:
+            payload = self.metrics_handler.get_cached_payload()
+        except Exception:
+            # Let the Flask route produce the error response
+            return None
+        if payload is None:
+            return None
+        
+        start_response('200 OK', [_METRICS_CONTENT_TYPE_HEADER, ('Content-Length', str(len(payload)))])
+        return [payload]
 
 
 class MetricsServer:
@@ -26,6 +114,16 @@ class MetricsServer:
     - /metrics endpoint for Prometheus scraping
     """
     
+    # Fixed error bodies, encoded once instead of through jsonify per request
+    _TIMEOUT_BODY = json.dumps({
+        'error': 'Request timeout',
+        'message': 'The request took too long to process'
+    }).encode('utf-8')
+    _INTERNAL_ERROR_BODY = json.dumps({
+        'error': 'Internal server error',
+        'message': 'An unexpected error occurred'
+    }).encode('utf-8')
+    
     def __init__(self, config: Config, metrics_handler: MetricsHandler):
         """
         Initialize the metrics server.
@@ -45,8 +143,8 @@ class MetricsServer:
         # Register routes
         self._register_routes()
         
-        # Configure request timeout handling
-        self._configure_timeout_handling()
+        # Request context and access logging at the WSGI layer
+        self.app.wsgi_app = AccessLogMiddleware(self.app.wsgi_app, self.logger, metrics_handler)
     
     def _register_routes(self) -> None:
         """Register HTTP routes for the server."""
@@ -63,47 +161,18 @@ class MetricsServer:
         @self.app.errorhandler(RequestTimeout)
         def handle_timeout(error):
             """Handle request timeout errors."""
-            self.logger.set_context(endpoint=request.path, client_ip=request.remote_addr)
-            self.logger.error(f"Request timeout: {str(error)[:200]}")
-            self.logger.clear_context()
-            return jsonify({
-                'error': 'Request timeout',
-                'message': 'The request took too long to process'
-            }), 408
+            context_token = self.logger.set_context(endpoint=request.path, client_ip=request.remote_addr)
+            self.logger.error("Request timeout: %.200s", error)
+            self.logger.clear_context(context_token)
+            return Response(self._TIMEOUT_BODY, status=408, content_type='application/json')
         
         @self.app.errorhandler(500)
         def handle_internal_error(error):
             """Handle internal server errors."""
-            self.logger.set_context(endpoint=request.path, client_ip=request.remote_addr)
-            self.logger.error(f"Internal server error: {str(error)[:200]}")
-            self.logger.clear_context()
-            return jsonify({
-                'error': 'Internal server error',
-                'message': 'An unexpected error occurred'
-            }), 500
-    
-    def _configure_timeout_handling(self) -> None:
-        """Configure request timeout handling."""
-        
-        @self.app.before_request
-        def before_request():
-            """Set up request timeout and logging context."""
-            request.start_time = time.time()
-            self.logger.set_context(
-                endpoint=request.path,
-                method=request.method,
-                client_ip=request.remote_addr,
-                user_agent=request.headers.get('User-Agent', 'Unknown')[:100]
-            )
-        
-        @self.app.after_request
-        def after_request(response):
-            """Log request completion."""
-            if hasattr(request, 'start_time'):
-                duration = time.time() - request.start_time
-                self.logger.info(f"Request completed - status: {response.status_code}, duration: {duration:.3f}s")
-            self.logger.clear_context()
-            return response
+            context_token = self.logger.set_context(endpoint=request.path, client_ip=request.remote_addr)
+            self.logger.error("Internal server error: %.200s", error)
+            self.logger.clear_context(context_token)
+            return Response(self._INTERNAL_ERROR_BODY, status=500, content_type='application/json')
     
     def _handle_metrics_request(self) -> Response:
         """
@@ -114,35 +183,48 @@ class MetricsServer:
         """
         try:
             with log_operation(self.logger, "metrics request processing", level='DEBUG'):
+                # Serve the already formatted payload while the cache is fresh
+                payload = self.metrics_handler.get_cached_payload()
+                if payload is not None:
+                    self.logger.info("Returned cached metrics payload - response_size: %d bytes",
+                                     len(payload), extra=TRUSTED)
+                    return self._payload_response(payload)
+                
                 # Collect metrics using the metrics handler (with caching)
                 metrics, collection_duration = self.metrics_handler.collect_metrics()
                 
-                # Format metrics in Prometheus exposition format
-                metrics_text = self.metrics_handler.transformer.format_prometheus_metrics(metrics)
-                
                 # Log cache status for debugging
                 cache_status = self.metrics_handler.get_cache_status()
                 cache_info = "cached" if cache_status['cached'] else "fresh"
                 
-                self.logger.info(f"Returned {len(metrics)} metrics ({cache_info}) - "
-                               f"collection: {collection_duration:.3f}s, "
-                               f"response_size: {len(metrics_text)} bytes")
+                # A successful collection is published with its encoded payload;
+                # send the bytes built from these metrics, fresh or not
+                payload = self.metrics_handler.get_cached_payload(metrics)
+                if payload is not None:
+                    self.logger.info("Returned %d metrics (%s) - collection: %.3fs, response_size: %d bytes",
+                                     len(metrics), cache_info, collection_duration, len(payload),
+                                     extra=TRUSTED)
+                    return self._payload_response(payload)
+                
+                # Nothing was cached (e.g. error metrics): stream the exposition
+                # text family by family instead of building it in memory
+                chunks = self.metrics_handler.transformer.iter_prometheus_metrics(metrics)
                 
                 return Response(
-                    metrics_text,
-                    mimetype='text/plain; version=0.0.4; charset=utf-8',
+                    self._stream_metrics(chunks, len(metrics), cache_info, collection_duration),
+                    content_type=_METRICS_CONTENT_TYPE,
                     status=200
                 )
                 
         except Exception as e:
+            self.logger.error("Error processing metrics request: %.200s", e)
             error_msg = str(e)[:200]
-            self.logger.error(f"Error processing metrics request: {error_msg}")
             
             # Create simple error response
             error_text = f"# Error collecting metrics: {error_msg}\n"
             return Response(
                 error_text,
-                mimetype='text/plain; version=0.0.4; charset=utf-8',
+                content_type=_METRICS_CONTENT_TYPE,
                 status=500
             )
     
@@ -150,16 +232,74 @@ class MetricsServer:
     
 
     
-    def start_server(self, debug: bool = False) -> None:
+    def _payload_response(self, payload: bytes) -> Response:
+        """
+        Build a /metrics response from an already encoded payload.
+        
+        Args:
+            payload: UTF-8 encoded exposition text
+            
+        Returns:
+            Flask Response with an explicit Content-Length, so the WSGI
+            server can write it in one go instead of chunk-encoding
+        """
+        response = Response(
+            payload,
+            content_type=_METRICS_CONTENT_TYPE,
+            status=200
+        )
+        response.content_length = len(payload)
+        return response
+    
+    def _stream_metrics(self, chunks: Iterable[str], metric_count: int,
+                        cache_info: str, collection_duration: float) -> Iterator[bytes]:
+        """
+        Encode exposition chunks for a streamed /metrics response.
+        
+        The response size is counted while streaming and logged once the
+        last chunk has been sent.
+        
+        Args:
+            chunks: Exposition text chunks from the transformer
+            metric_count: Number of metrics being returned
+            cache_info: "cached" or "fresh", for logging
+            collection_duration: Collection duration in seconds, for logging
+            
+        Yields:
+            UTF-8 encoded response chunks
+        """
+        response_size = 0
+        try:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                response_size += len(data)
+                yield data
+        except Exception as e:
+            self.logger.error("Error streaming metrics response: %.200s", e)
+            raise
+        
+        self.logger.info("Returned %d metrics (%s) - collection: %.3fs, response_size: %d bytes",
+                         metric_count, cache_info, collection_duration, response_size,
+                         extra=TRUSTED)
+    
+    def start_server(self, debug: bool = False,
+                     on_shutdown: Optional[Callable[[], None]] = None) -> None:
         """
         Start the HTTP server.
         
+        Requests are served by gunicorn's threaded worker when it is
+        available; the Flask development server is only used in debug mode
+        or where gunicorn cannot be imported.
+        
         Args:
             debug: Enable Flask debug mode
+            on_shutdown: Cleanup to run when gunicorn stops. gunicorn installs
+                its own SIGINT/SIGTERM handlers, so the caller's signal
+                handlers never run under it; they still cover the Flask server.
         """
         server_config = self.config.get_server_config()
         
-        self.logger.set_context(
+        context_token = self.logger.set_context(
             host=server_config.host,
             port=server_config.port,
             operation='start_server'
@@ -167,17 +307,63 @@ class MetricsServer:
         
         try:
             with log_operation(self.logger, f"HTTP server startup on {server_config.host}:{server_config.port}", level='INFO'):
-                self.app.run(
-                    host=server_config.host,
-                    port=server_config.port,
-                    debug=debug,
-                    threaded=True  # Enable threading for concurrent requests
-                )
+                if debug or not self._serve_with_gunicorn(server_config, on_shutdown):
+                    self.app.run(
+                        host=server_config.host,
+                        port=server_config.port,
+                        debug=debug,
+                        threaded=True  # Enable threading for concurrent requests
+                    )
         except Exception as e:
-            self.logger.error(f"Failed to start HTTP server: {str(e)[:200]}")
+            self.logger.error("Failed to start HTTP server: %.200s", e)
             raise
         finally:
-            self.logger.clear_context()
+            self.logger.clear_context(context_token)
+    
+    def _serve_with_gunicorn(self, server_config: ServerConfig,
+                             on_shutdown: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Serve the Flask app with an embedded gunicorn arbiter.
+        
+        A single gthread worker is used so that the metrics cache and the
+        AFS client connection pool stay shared across all request threads.
+        
+        Args:
+            server_config: Server configuration
+            on_shutdown: Cleanup run in the worker when it exits (it owns the
+                components serving requests) and in the arbiter on exit
+            
+        Returns:
+            False if gunicorn is not installed, True once it has stopped
+        """
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            self.logger.warning("gunicorn not available, falling back to the Flask development server")
+            return False
+        
+        app = self.app
+        options = {
+            'bind': f"{server_config.host}:{server_config.port}",
+            'workers': 1,
+            'worker_class': 'gthread',
+            'threads': server_config.threads,
+            'timeout': server_config.request_timeout * 2,
+        }
+        if on_shutdown is not None:
+            options['worker_exit'] = lambda arbiter, worker: on_shutdown()
+            options['on_exit'] = lambda arbiter: on_shutdown()
+        
+        class _MetricsApplication(BaseApplication):
+            def load_config(self):
+                for key, value in options.items():
+                    self.cfg.set(key, value)
+            
+            def load(self):
+                return app
+        
+        _MetricsApplication().run()
+        return True
     
     def get_app(self) -> Flask:
         """
@@ -8,17 +8,81 @@ This module provides centralized logging configuration with:
 - Context managers for operation-specific logging
 """
 
+import contextvars
 import logging
 import logging.config
 import re
 import sys
+import threading
 from typing import Dict, Any, Optional, Union
 from contextlib import contextmanager
 from functools import wraps
+from time import perf_counter
 
 from src.config import LoggingConfig
 
 
+# Context bound with logger_context(); each thread/task sees its own copy
+_LOG_CONTEXT: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar('log_context', default={})
+
+
+# One ContextualLogger per logger name; instances hold no per-request state
+# (context lives in ContextVars), so they are safe to share across threads
+_LOGGER_CACHE: Dict[str, 'ContextualLogger'] = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
+
+
+# Pass as extra= for messages built only from our own counters and timings;
+# SanitizingFormatter then skips pattern matching for them. The context prefix
+# can carry client input (user_agent), so ContextualLogger sanitizes it itself.
+TRUSTED = {'sanitize': False}
+
+# Dictionary keys whose values are always redacted by sanitize_for_logging
+_SENSITIVE_KEY_PATTERN = re.compile(r'key|secret|token|password|auth', re.IGNORECASE)
+
+# Credentials that can appear in a request URL: userinfo before the host and
+# credential-like query parameters
+_URL_CREDENTIAL_PATTERN = re.compile(
+    r'(https?://[^:/?#]+:)[^@/]+(@)|([?&](?:token|api_key|access_key|secret_key|signature|password)=)[^&#]+',
+    re.IGNORECASE
+)
+
+
+def _redact_url_credential(match: re.Match) -> str:
+    """Replace the credential in a _URL_CREDENTIAL_PATTERN match."""
+    if match.group(1) is not None:
+        return f"{match.group(1)}***REDACTED***{match.group(2)}"
+    return f"{match.group(3)}***REDACTED***"
+
+
+def _combine_patterns(patterns):
+    """
+    Merge (pattern, replacement) pairs into one alternation regex.
+    
+    Each pattern becomes a named group and its replacement's group
+    references are renumbered to match the combined regex.
+    
+    Args:
+        patterns: List of (compiled pattern, replacement template) pairs
+        
+    Returns:
+        Tuple of (combined pattern, {group name: replacement template})
+    """
+    parts = []
+    replacements = {}
+    group_offset = 1
+    for index, (pattern, replacement) in enumerate(patterns):
+        name = f'p{index}'
+        parts.append(f'(?P<{name}>{pattern.pattern})')
+        replacements[name] = re.sub(
+            r'\\(\d+)',
+            lambda m, base=group_offset: f'\\g<{base + int(m.group(1))}>',
+            replacement
+        )
+        group_offset += 1 + pattern.groups
+    return re.compile('|'.join(parts), re.IGNORECASE), replacements
+
+
 class SanitizingFormatter(logging.Formatter):
     """
     Custom formatter that sanitizes sensitive information from log messages.
@@ -48,10 +112,29 @@ class SanitizingFormatter(logging.Formatter):
         # URLs with credentials
         (re.compile(r'(https?://[^:]+:)([^@]+)(@)', re.IGNORECASE), r'\1***REDACTED***\3'),
         
-        # Generic patterns for long alphanumeric strings that might be secrets
-        (re.compile(r'(["\s=:])([a-zA-Z0-9+/]{32,})(["\s,}])', re.IGNORECASE), r'\1***REDACTED***\3'),
+        # Long base64-like values that follow a credential-like key; requiring
+        # the key keeps hashes, paths and metric names from matching
+        (re.compile(r'((?:key|secret|token|sig|hmac|pwd|credential)[\w-]*["\s]*[:=]["\s]*)([a-zA-Z0-9+/=]{32,})', re.IGNORECASE), r'\1***REDACTED***'),
     ]
     
+    # All patterns as one alternation so each message is scanned once
+    _COMBINED_PATTERN, _REPLACEMENTS = _combine_patterns(SENSITIVE_PATTERNS)
+    
+    @classmethod
+    def sanitize(cls, text: str) -> str:
+        """
+        Mask sensitive values in a string in a single regex pass.
+        
+        Args:
+            text: Text to sanitize
+            
+        Returns:
+            Sanitized text
+        """
+        replacements = cls._REPLACEMENTS
+        return cls._COMBINED_PATTERN.sub(lambda m: m.expand(replacements[m.lastgroup]), text)
+    
+    
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record with sanitization of sensitive information.
@@ -62,15 +145,11 @@ class SanitizingFormatter(logging.Formatter):
         Returns:
             Formatted and sanitized log message
         """
-        # Format the record normally first
+        # Format the record normally first, then sanitize
         formatted = super().format(record)
-        
-        # Apply sanitization patterns
-        sanitized = formatted
-        for pattern, replacement in self.SENSITIVE_PATTERNS:
-            sanitized = pattern.sub(replacement, sanitized)
-        
-        return sanitized
+        if getattr(record, 'sanitize', True) is False and not record.exc_info:
+            return formatted
+        return self.sanitize(formatted)
 
 
 class ContextualLogger:
@@ -89,20 +168,47 @@ class ContextualLogger:
             logger: Base logger instance
         """
         self.logger = logger
-        self.context: Dict[str, Any] = {}
+        # Stored in a ContextVar so concurrent requests on worker threads
+        # never see or clear each other's context
+        self._context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+            f'log_context.{logger.name}', default={}
+        )
+        # (scoped context, own context, rendered prefix) of the last message
+        self._prefix_cache = (None, None, '')
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Context of the current thread or task."""
+        return self._context.get()
     
-    def set_context(self, **kwargs) -> None:
+    @context.setter
+    def context(self, value: Dict[str, Any]) -> None:
+        self._context.set(dict(value))
+    
+    def set_context(self, **kwargs) -> contextvars.Token:
         """
         Set context information for subsequent log messages.
         
         Args:
             **kwargs: Context key-value pairs
+            
+        Returns:
+            Token that restores the previous context when passed to clear_context
         """
-        self.context.update(kwargs)
+        return self._context.set({**self._context.get(), **kwargs})
     
-    def clear_context(self) -> None:
-        """Clear all context information."""
-        self.context.clear()
+    def clear_context(self, token: Optional[contextvars.Token] = None) -> None:
+        """
+        Clear context information.
+        
+        Args:
+            token: Token from set_context; restores the context that was active
+                before that call instead of clearing everything
+        """
+        if token is not None:
+            self._context.reset(token)
+        else:
+            self._context.set({})
     
     def remove_context(self, *keys) -> None:
         """
@@ -111,52 +217,84 @@ class ContextualLogger:
         Args:
             *keys: Context keys to remove
         """
-        for key in keys:
-            self.context.pop(key, None)
+        context = self._context.get()
+        self._context.set({key: value for key, value in context.items() if key not in keys})
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """
+        Check whether the underlying logger would emit a message at this level.
+        
+        Args:
+            level: Numeric logging level (e.g. logging.DEBUG)
+            
+        Returns:
+            True if messages at this level are processed
+        """
+        return self.logger.isEnabledFor(level)
     
-    def _format_message(self, message: str) -> str:
+    def _format_message(self, message: str, args: tuple = ()) -> str:
         """
         Format message with context information.
         
+        Only the context prefix is added; %-style arguments are left for the
+        logging framework to interpolate.
+        
         Args:
             message: Original log message
+            args: Arguments that will be interpolated into the message
             
         Returns:
             Message with context information prepended
         """
-        if not self.context:
+        scoped_context = _LOG_CONTEXT.get()
+        own_context = self._context.get()
+        if not own_context and not scoped_context:
             return message
         
-        context_parts = []
-        for key, value in self.context.items():
-            context_parts.append(f"{key}={value}")
+        # Context dicts are replaced, never mutated, so identity tells us
+        # whether the cached prefix is still current
+        cached_scoped, cached_own, prefix = self._prefix_cache
+        if cached_scoped is not scoped_context or cached_own is not own_context:
+            context = {**scoped_context, **own_context} if scoped_context else own_context
+            prefix = "[" + " ".join(f"{key}={value}" for key, value in context.items()) + "] "
+            # Sanitized here, once per context, because TRUSTED records skip the formatter's pass
+            prefix = SanitizingFormatter.sanitize(prefix)
+            self._prefix_cache = (scoped_context, own_context, prefix)
         
-        context_str = " ".join(context_parts)
-        return f"[{context_str}] {message}"
+        if args:
+            # Context values must not be read as format directives
+            prefix = prefix.replace('%', '%%')
+        return prefix + message
     
     def debug(self, message: str, *args, **kwargs) -> None:
         """Log debug message with context."""
-        self.logger.debug(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self._format_message(message, args), *args, **kwargs)
     
     def info(self, message: str, *args, **kwargs) -> None:
         """Log info message with context."""
-        self.logger.info(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(self._format_message(message, args), *args, **kwargs)
     
     def warning(self, message: str, *args, **kwargs) -> None:
         """Log warning message with context."""
-        self.logger.warning(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(self._format_message(message, args), *args, **kwargs)
     
     def error(self, message: str, *args, **kwargs) -> None:
         """Log error message with context."""
-        self.logger.error(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(self._format_message(message, args), *args, **kwargs)
     
     def critical(self, message: str, *args, **kwargs) -> None:
         """Log critical message with context."""
-        self.logger.critical(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(self._format_message(message, args), *args, **kwargs)
     
     def exception(self, message: str, *args, **kwargs) -> None:
         """Log exception message with context and traceback."""
-        self.logger.exception(self._format_message(message), *args, **kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.exception(self._format_message(message, args), *args, **kwargs)
 
 
 def setup_logging(logging_config: LoggingConfig) -> None:
@@ -166,6 +304,14 @@ def setup_logging(logging_config: LoggingConfig) -> None:
     Args:
         logging_config: Logging configuration object
     """
+    # Only collect the thread/process details LogRecord would otherwise look
+    # up on every call when the configured format actually shows them
+    log_format = logging_config.format
+    logging.logThreads = '%(thread' in log_format
+    logging.logProcesses = '%(process' in log_format
+    logging.logMultiprocessing = '%(processName' in log_format
+    logging.logAsyncioTasks = '%(taskName' in log_format
+    
     # Create logging configuration dictionary
     config_dict = {
         'version': 1,
@@ -225,10 +371,35 @@ def get_contextual_logger(name: str) -> ContextualLogger:
         name: Logger name (typically __name__)
         
     Returns:
-        ContextualLogger instance
+        ContextualLogger instance, shared by all callers using the same name
     """
-    base_logger = logging.getLogger(name)
-    return ContextualLogger(base_logger)
+    contextual_logger = _LOGGER_CACHE.get(name)
+    if contextual_logger is None:
+        with _LOGGER_CACHE_LOCK:
+            contextual_logger = _LOGGER_CACHE.get(name)
+            if contextual_logger is None:
+                contextual_logger = ContextualLogger(logging.getLogger(name))
+                _LOGGER_CACHE[name] = contextual_logger
+    return contextual_logger
+
+
+@contextmanager
+def logger_context(**context):
+    """
+    Context manager that adds context to every contextual log message emitted
+    within the block by the current thread or task.
+    
+    Unlike ContextualLogger.set_context, the context applies to every
+    contextual logger rather than a single instance.
+    
+    Args:
+        **context: Context key-value pairs
+    """
+    token = _LOG_CONTEXT.set({**_LOG_CONTEXT.get(), **context})
+    try:
+        yield
+    finally:
+        _LOG_CONTEXT.reset(token)
 
 
 @contextmanager
@@ -245,36 +416,33 @@ def log_operation(logger: Union[logging.Logger, ContextualLogger],
         level: Log level for operation messages
         **context: Additional context for the operation
     """
-    import time
-    
     # Set context if using contextual logger
-    if isinstance(logger, ContextualLogger):
-        original_context = logger.context.copy()
-        logger.set_context(**context)
-        log_func = getattr(logger, level.lower())
-    else:
-        log_func = getattr(logger, level.lower())
+    token = None
+    if context and isinstance(logger, ContextualLogger):
+        token = logger.set_context(**context)
     
-    start_time = time.time()
-    log_func(f"Starting {operation}")
+    # Start/completion messages are skipped entirely when the level is
+    # filtered out; failures are still logged at ERROR
+    log_func = None
+    if logger.isEnabledFor(logging.getLevelName(level.upper())):
+        log_func = getattr(logger, level.lower())
+        log_func(f"Starting {operation}")
     
+    start_time = perf_counter()
     try:
         yield
-        duration = time.time() - start_time
-        log_func(f"Completed {operation} in {duration:.3f}s")
+        if log_func is not None:
+            log_func(f"Completed {operation} in {perf_counter() - start_time:.3f}s")
         
     except Exception as e:
-        duration = time.time() - start_time
-        if isinstance(logger, ContextualLogger):
-            logger.error(f"Failed {operation} after {duration:.3f}s: {e}")
-        else:
-            logger.error(f"Failed {operation} after {duration:.3f}s: {e}")
+        duration = perf_counter() - start_time
+        logger.error(f"Failed {operation} after {duration:.3f}s: {e}")
         raise
         
     finally:
         # Restore original context if using contextual logger
-        if isinstance(logger, ContextualLogger):
-            logger.context = original_context
+        if token is not None:
+            logger.clear_context(token)
 
 
 def log_with_context(**context_kwargs):
@@ -290,13 +458,12 @@ def log_with_context(**context_kwargs):
             # Try to find a contextual logger in the instance
             if args and hasattr(args[0], 'logger') and isinstance(args[0].logger, ContextualLogger):
                 logger = args[0].logger
-                original_context = logger.context.copy()
-                logger.set_context(**context_kwargs)
+                token = logger.set_context(**context_kwargs)
                 
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    logger.context = original_context
+                    logger.clear_context(token)
             else:
                 return func(*args, **kwargs)
         
@@ -308,8 +475,8 @@ def sanitize_for_logging(data: Any) -> Any:
     """
     Sanitize data structure for safe logging.
     
-    Recursively processes dictionaries, lists, and strings to remove
-    sensitive information before logging.
+    Walks dictionaries, lists, and strings with an explicit stack (no
+    recursion) to remove sensitive information before logging.
     
     Args:
         data: Data to sanitize
@@ -317,29 +484,44 @@ def sanitize_for_logging(data: Any) -> Any:
     Returns:
         Sanitized copy of the data
     """
-    if isinstance(data, dict):
-        sanitized = {}
-        for key, value in data.items():
-            # Check if key indicates sensitive data
-            key_lower = key.lower()
-            if any(sensitive in key_lower for sensitive in ['key', 'secret', 'token', 'password', 'auth']):
-                sanitized[key] = '***REDACTED***'
+    root = [None]
+    # (item, parent container, slot in parent, sequence type to rebuild)
+    stack = [(data, root, 0, None)]
+    while stack:
+        item, parent, slot, rebuild_type = stack.pop()
+        
+        if rebuild_type is not None:
+            # All children of this sequence are sanitized; convert the list back
+            parent[slot] = rebuild_type(item)
+        
+        elif isinstance(item, dict):
+            sanitized = {}
+            parent[slot] = sanitized
+            for key, value in item.items():
+                # Check if key indicates sensitive data
+                if _SENSITIVE_KEY_PATTERN.search(key):
+                    sanitized[key] = '***REDACTED***'
+                else:
+                    sanitized[key] = None
+                    stack.append((value, sanitized, key, None))
+        
+        elif isinstance(item, (list, tuple)):
+            sanitized = [None] * len(item)
+            if type(item) is list:
+                parent[slot] = sanitized
             else:
-                sanitized[key] = sanitize_for_logging(value)
-        return sanitized
-    
-    elif isinstance(data, (list, tuple)):
-        return type(data)(sanitize_for_logging(item) for item in data)
-    
-    elif isinstance(data, str):
-        # Apply sanitization patterns to strings
-        sanitized = data
-        for pattern, replacement in SanitizingFormatter.SENSITIVE_PATTERNS:
-            sanitized = pattern.sub(replacement, sanitized)
-        return sanitized
+                stack.append((sanitized, parent, slot, type(item)))
+            for index, value in enumerate(item):
+                stack.append((value, sanitized, index, None))
+        
+        elif isinstance(item, str):
+            # Apply sanitization patterns to strings
+            parent[slot] = SanitizingFormatter.sanitize(item)
+        
+        else:
+            parent[slot] = item
     
-    else:
-        return data
+    return root[0]
 
 
 # Module-level convenience functions
@@ -388,10 +570,8 @@ def log_api_request(logger: Union[logging.Logger, ContextualLogger],
         duration: Request duration in seconds
         error: Error message if request failed
     """
-    # Sanitize URL to remove credentials
-    sanitized_url = url
-    for pattern, replacement in SanitizingFormatter.SENSITIVE_PATTERNS:
-        sanitized_url = pattern.sub(replacement, sanitized_url)
+    # Strip URL credentials in one pass; the formatter sanitizes the rest
+    sanitized_url = _URL_CREDENTIAL_PATTERN.sub(_redact_url_credential, url)
     
     if error:
         logger.error(f"API request failed: {method} {sanitized_url} - {error}")
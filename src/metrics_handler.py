@@ -4,28 +4,94 @@ Metrics handler module for orchestrating AFS data collection and transformation.
 This module provides the MetricsHandler class that coordinates data fetching
 from AFS API, transformation to Prometheus metrics, and caching for concurrent
 request handling.
+
+Thread safety: the metrics cache is a single attribute holding a
+CachedMetrics, a frozen slotted dataclass that is fully built before it is
+assigned. Rebinding an attribute is atomic in CPython, so scrape threads read
+the cache without locking and always see either the previous entry or the
+complete new one. Only a miss takes _collection_lock, once, to re-check the
+cache and join or start the single in-flight collection; the collecting
+thread then publishes its entry with a plain assignment.
 """
 
+import random
+import re
 import time
 import threading
-from typing import List, Dict, Optional, Tuple
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 
 from src.afs_client import AFSClient
 from src.metrics_transformer import MetricsTransformer
 from src.config import Config, VolumeConfig
-from src.data_models import PrometheusMetric
+from src.data_models import LabelSet, PrometheusMetric
 from src.exceptions import AuthenticationError, APIError, PartialCollectionError
 from src.logging_config import get_logger, log_operation
 
 
-@dataclass
+# A cache entry lives for at least this many collection durations, so slow
+# collections still get a useful cache-hit window
+_TTL_DURATION_FACTOR = 2.0
+# Relative jitter applied to each entry's TTL so replicas scraped together
+# do not all expire and re-collect at the same moment; it only ever
+# shortens the TTL, so an entry never outlives the configured duration
+_TTL_JITTER = 0.1
+
+# How long a volume that failed with an authentication or API error is
+# reported from its stored failure instead of being requested again
+_FAILED_VOLUME_TTL_NS = 5_000_000_000
+
+# Quota responses transformed at once; transforms are CPU-bound and only
+# contend for the GIL, while HTTP waits of other volumes overlap freely
+_TRANSFORM_CONCURRENCY = 2
+
+# Shared by every metric without labels; PrometheusMetric labels are
+# treated as read-only, so one dict serves all of them
+_NO_LABELS: Dict[str, str] = {}
+
+
+# Error categories in priority order; the anchored alternation tries each
+# lookahead in turn, so the first category found anywhere in the message
+# wins, and the match's lastgroup names it
+_ERROR_CATEGORY_PATTERN = re.compile(
+    r'(?:(?=.*timeout)(?P<timeout>)'
+    r'|(?=.*connection)(?P<connection>)'
+    r'|(?=.*authentication)(?P<authentication>)'
+    r'|(?=.*rate limit)(?P<rate_limit>)'
+    r'|(?=.*(?:404|500|502|503))(?P<api_error>))',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _classify_error(error: str) -> str:
+    """
+    Categorize a volume collection error message for monitoring.
+    
+    Args:
+        error: Error message
+        
+    Returns:
+        Error category label value
+    """
+    match = _ERROR_CATEGORY_PATTERN.match(error)
+    return match.lastgroup if match is not None else 'unknown'
+
+
+@dataclass(frozen=True, slots=True)
 class CachedMetrics:
-    """Container for cached metrics data."""
-    metrics: List[PrometheusMetric]
-    timestamp: float
+    """
+    Container for cached metrics data.
+    
+    Instances are immutable and published by swapping the handler's cache
+    reference, so readers never see a partially built entry.
+    """
+    metrics: Tuple[PrometheusMetric, ...]
+    timestamp_ns: int  # time.monotonic_ns() when the entry was created
     collection_duration: float
+    ttl_ns: int  # effective lifetime of this entry
+    payload: bytes  # encoded Prometheus exposition of metrics
 
 
 @dataclass
@@ -64,97 +130,201 @@ class MetricsHandler:
         self.transformer = transformer
         self.logger = get_logger(__name__)
         
-        # Cache for handling concurrent requests
+        # Cache for handling concurrent requests; read without locking and
+        # only ever replaced as a whole (see the module docstring)
         self._cache: Optional[CachedMetrics] = None
-        self._cache_lock = threading.RLock()
-        self._collection_lock = threading.RLock()
+        
+        # Collection in progress, shared by every scrape that misses the cache
+        # while it runs; guarded by _collection_lock
+        self._inflight: Optional[Future] = None
+        self._collection_lock = threading.Lock()
+        
+        # Recent authentication/API failures per (volume_id, zone) as
+        # (result, time.monotonic_ns() expiry), so outages are not amplified
+        # by every scrape re-requesting the failing volume
+        self._failed_volumes: Dict[Tuple[str, str], Tuple[VolumeCollectionResult, int]] = {}
+        
+        # Status metric labels per (volume_id, zone); the same volumes recur
+        # every scrape so each dict is built once and shared
+        self._volume_labels: Dict[Tuple[str, str], LabelSet] = {}
+        
+        # Configuration metadata metrics and the config values they were
+        # built from; rebuilt only when those values change
+        self._static_metadata: Tuple[Optional[Tuple], List[PrometheusMetric]] = (None, [])
         
         # Collection statistics
         self._last_collection_time: Optional[float] = None
         self._collection_count = 0
+        
+        # Worker pool for per-volume collection, kept across scrapes so its
+        # threads stay warm (threads start lazily); limits concurrent requests
+        max_workers = min(max(len(config.get_afs_config().volumes), 1),
+                          config.get_collection_config().max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='afs-collect')
+        self._transform_semaphore = threading.BoundedSemaphore(_TRANSFORM_CONCURRENCY)
     
-    def collect_metrics(self) -> Tuple[List[PrometheusMetric], float]:
+    def collect_metrics(self) -> Tuple[Sequence[PrometheusMetric], float]:
         """
         Collect metrics from all configured AFS volumes.
         
         Uses caching to handle concurrent requests efficiently. If cached data
         is available and fresh, returns it immediately. Otherwise, performs
-        a new collection.
+        a new collection; requests arriving while it runs wait for and share
+        its result instead of collecting again.
         
         Returns:
-            Tuple of (metrics list, collection duration in seconds)
+            Tuple of (metrics sequence, collection duration in seconds)
         """
-        collection_config = self.config.get_collection_config()
-        
-        # Check cache first
-        with self._cache_lock:
-            if self._cache and self._is_cache_valid():
-                self.logger.debug("Returning cached metrics")
-                return self._cache.metrics, self._cache.collection_duration
+        # Check cache first; a single reference read needs no lock
+        cached = self._cache
+        if self._is_cache_valid(cached):
+            self.logger.debug("Returning cached metrics")
+            return cached.metrics, cached.collection_duration
         
-        # Perform new collection (with lock to prevent concurrent collections)
+        # Either join the collection in flight or start one
         with self._collection_lock:
             # Double-check cache after acquiring collection lock
-            with self._cache_lock:
-                if self._cache and self._is_cache_valid():
-                    self.logger.debug("Returning cached metrics (double-check)")
-                    return self._cache.metrics, self._cache.collection_duration
-            
-            # Perform actual collection
-            self.logger.set_context(operation='collect_metrics', collection_id=self._collection_count + 1)
+            cached = self._cache
+            if self._is_cache_valid(cached):
+                self.logger.debug("Returning cached metrics (double-check)")
+                return cached.metrics, cached.collection_duration
             
-            start_time = time.time()
+            inflight = self._inflight
+            if inflight is None:
+                inflight = self._inflight = Future()
+                is_leader = True
+            else:
+                is_leader = False
+        
+        if not is_leader:
+            wait_timeout = self.config.get_collection_config().timeout_seconds * 2
             try:
-                with log_operation(self.logger, "metrics collection", level='INFO'):
-                    # Collect from all volumes
-                    all_metrics = self._fetch_all_volumes()
-                    
-                    # Add collection metadata
-                    collection_duration = time.time() - start_time
-                    metadata_metrics = self._create_collection_metadata(collection_duration)
-                    all_metrics.extend(metadata_metrics)
-                    
-                    # Update cache
-                    with self._cache_lock:
-                        self._cache = CachedMetrics(
-                            metrics=all_metrics,
-                            timestamp=time.time(),
-                            collection_duration=collection_duration
-                        )
-                    
-                    self._last_collection_time = time.time()
-                    self._collection_count += 1
-                    
-                    self.logger.info(f"Collected {len(all_metrics)} metrics from {len(self.config.get_afs_config().volumes)} volumes")
-                    
-                    return all_metrics, collection_duration
-                    
-            except Exception as e:
-                self.logger.error(f"Metrics collection failed: {str(e)[:200]}")
-                # Return error metrics
-                error_metrics = self._create_error_metrics(str(e))
+                return inflight.result(timeout=wait_timeout)
+            except FutureTimeoutError:
+                self.logger.error("Timed out after %ss waiting for in-flight metrics collection", wait_timeout)
+                return self._create_error_metrics("Timed out waiting for in-flight collection"), float(wait_timeout)
+        
+        try:
+            result = self._run_collection()
+        except BaseException as e:
+            inflight.set_exception(e)
+            raise
+        else:
+            inflight.set_result(result)
+            return result
+        finally:
+            with self._collection_lock:
+                self._inflight = None
+    
+    def _run_collection(self) -> Tuple[Sequence[PrometheusMetric], float]:
+        """
+        Perform one collection and publish it to the cache.
+        
+        Only the thread that owns the in-flight Future calls this.
+        
+        Returns:
+            Tuple of (metrics list, collection duration in seconds)
+        """
+        context_token = self.logger.set_context(operation='collect_metrics', collection_id=self._collection_count + 1)
+        
+        start_time = time.time()
+        try:
+            with log_operation(self.logger, "metrics collection", level='INFO'):
+                # Collect from all volumes
+                volume_metrics = self._fetch_all_volumes()
+                
+                # Add collection metadata
                 collection_duration = time.time() - start_time
-                return error_metrics, collection_duration
+                ttl_ns = self._effective_ttl_ns(collection_duration)
+                metadata_metrics = self._create_collection_metadata(collection_duration, ttl_ns)
+                
+                # Materialized once, at exactly its final size, for the cache
+                all_metrics = tuple(chain(volume_metrics, metadata_metrics))
+                
+                # Format once per collection so every scrape that hits the
+                # cache just writes these bytes
+                payload = self.transformer.format_prometheus_metrics(all_metrics).encode('utf-8')
+                
+                # Publish the fully built entry with a single assignment
+                self._cache = CachedMetrics(
+                    metrics=all_metrics,
+                    timestamp_ns=time.monotonic_ns(),
+                    collection_duration=collection_duration,
+                    ttl_ns=ttl_ns,
+                    payload=payload
+                )
+                
+                self._last_collection_time = time.time()
+                self._collection_count += 1
                 
-            finally:
-                self.logger.clear_context()
+                self.logger.info("Collected %d metrics from %d volumes",
+                                 len(all_metrics), len(self.config.get_afs_config().volumes))
+                
+                return all_metrics, collection_duration
+                
+        except Exception as e:
+            self.logger.error("Metrics collection failed: %.200s", e)
+            # Return error metrics
+            error_metrics = self._create_error_metrics(str(e))
+            collection_duration = time.time() - start_time
+            return error_metrics, collection_duration
+            
+        finally:
+            self.logger.clear_context(context_token)
     
-    def _is_cache_valid(self) -> bool:
+    def _is_cache_valid(self, cached: Optional[CachedMetrics]) -> bool:
         """
-        Check if cached metrics are still valid.
+        Check if a cache entry is still valid.
         
+        Args:
+            cached: Cache entry read from self._cache
+            
         Returns:
-            True if cache is valid and fresh
+            True if the entry exists and is fresh
         """
-        if not self._cache:
+        if cached is None:
             return False
         
-        collection_config = self.config.get_collection_config()
-        cache_age = time.time() - self._cache.timestamp
+        return time.monotonic_ns() - cached.timestamp_ns < cached.ttl_ns
+    
+    def _effective_ttl_ns(self, collection_duration: float) -> int:
+        """
+        Compute the lifetime of a new cache entry.
         
-        return cache_age < collection_config.cache_duration
+        The configured cache duration is stretched to a multiple of the
+        collection duration when collecting is slow, then jittered downwards.
+        A configured duration of 0 disables caching.
+        
+        Args:
+            collection_duration: Duration of the collection in seconds
+            
+        Returns:
+            Cache entry lifetime in nanoseconds (0 when caching is disabled)
+        """
+        cache_duration = self.config.get_collection_config().cache_duration
+        if cache_duration <= 0:
+            return 0
+        
+        ttl_ns = max(
+            self._cache_ttl_ns(cache_duration),
+            self._cache_ttl_ns(_TTL_DURATION_FACTOR * collection_duration)
+        )
+        return int(ttl_ns * random.uniform(1.0 - _TTL_JITTER, 1.0))
+    
+    @staticmethod
+    def _cache_ttl_ns(cache_duration: float) -> int:
+        """
+        Convert the configured cache duration to integer nanoseconds.
+        
+        Args:
+            cache_duration: Cache duration in seconds
+            
+        Returns:
+            Cache duration in nanoseconds
+        """
+        return int(cache_duration * 1_000_000_000)
     
-    def _fetch_all_volumes(self) -> List[PrometheusMetric]:
+    def _fetch_all_volumes(self) -> Iterator[PrometheusMetric]:
         """
         Fetch metrics from all configured AFS volumes.
         
@@ -162,65 +332,74 @@ class MetricsHandler:
         Handles partial failures gracefully.
         
         Returns:
-            List of PrometheusMetric objects from all successful collections
+            Iterator over the per-volume metric lists of all successful
+            collections followed by the collection status metrics
         """
         afs_config = self.config.get_afs_config()
         collection_config = self.config.get_collection_config()
         
-        all_metrics = []
+        # Each volume's list is chained rather than copied into one growing list
+        metric_lists = []
         collection_results = []
         
-        # Use ThreadPoolExecutor for concurrent collection
-        max_workers = min(len(afs_config.volumes), 5)  # Limit concurrent requests
+        # Volume fetches stop being attempted once the collection window has passed
+        deadline = time.monotonic() + collection_config.timeout_seconds
+        
+        # The AFS API serves one volume per request, so volumes cannot be
+        # batched; repeated (volume_id, zone) entries are collected once
+        unique_volumes: Dict[Tuple[str, str], VolumeConfig] = {}
+        for volume_config in afs_config.volumes:
+            unique_volumes.setdefault((volume_config.volume_id, volume_config.zone), volume_config)
+        
+        # Volumes that failed moments ago report that failure again
+        now_ns = time.monotonic_ns()
+        for key in list(unique_volumes):
+            failure = self._failed_volumes.get(key)
+            if failure is None:
+                continue
+            if now_ns < failure[1]:
+                self.logger.debug("Reusing recent failure for volume %s", key[0])
+                collection_results.append(failure[0])
+                del unique_volumes[key]
+            else:
+                self._failed_volumes.pop(key, None)
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit collection tasks for all volumes
+        if unique_volumes:
+            # Submit collection tasks for all volumes to the shared pool; even
+            # a single volume goes through it so the deadline below bounds it
             future_to_volume = {
-                executor.submit(
+                self._executor.submit(
                     self._collect_volume_metrics,
                     volume_config,
-                    collection_config.timeout_seconds
+                    collection_config.timeout_seconds,
+                    deadline
                 ): volume_config
-                for volume_config in afs_config.volumes
+                for volume_config in unique_volumes.values()
             }
             
-            # Collect results as they complete
-            for future in as_completed(future_to_volume):
-                volume_config = future_to_volume[future]
+            # Collect results as they complete, but never past the deadline
+            pending = set(future_to_volume)
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    self._abandon_volumes(pending, future_to_volume, collection_results,
+                                          collection_config.timeout_seconds)
+                    break
                 
-                try:
-                    result = future.result()
-                    collection_results.append(result)
-                    
-                    if result.success:
-                        all_metrics.extend(result.metrics)
-                        self.logger.debug(f"Successfully collected {len(result.metrics)} metrics "
-                                        f"from volume {result.volume_id} in {result.duration:.3f}s")
-                    else:
-                        self.logger.error(f"Failed to collect metrics from volume {result.volume_id}: "
-                                        f"{result.error}")
-                        
-                except Exception as e:
-                    error_msg = str(e)[:200]
-                    self.logger.error(f"Unexpected error collecting from volume "
-                                    f"{volume_config.volume_id}: {error_msg}")
-                    collection_results.append(VolumeCollectionResult(
-                        volume_id=volume_config.volume_id,
-                        zone=volume_config.zone,
-                        success=False,
-                        metrics=[],
-                        error=error_msg
-                    ))
+                for future in done:
+                    self._record_volume_result(future_to_volume[future], future.result,
+                                               metric_lists, collection_results)
         
         # Add per-volume collection status metrics
-        status_metrics = self._create_volume_status_metrics(collection_results)
-        all_metrics.extend(status_metrics)
+        metric_lists.append(self._create_volume_status_metrics(collection_results))
         
         # Check for partial failures
         failed_results = [r for r in collection_results if not r.success]
         if failed_results:
             failed_volumes = [f"{r.volume_id}@{r.zone}" for r in failed_results]
-            self.logger.warning(f"Partial collection failure: {len(failed_results)}/{len(collection_results)} volumes failed")
+            self.logger.warning("Partial collection failure: %d/%d volumes failed",
+                                len(failed_results), len(collection_results))
             
             # If all volumes failed, raise an exception
             if len(failed_results) == len(collection_results):
@@ -229,22 +408,90 @@ class MetricsHandler:
                     failed_volumes=failed_volumes
                 )
         
-        return all_metrics
+        return chain.from_iterable(metric_lists)
+    
+    def _record_volume_result(self, volume_config: VolumeConfig,
+                              get_result: Callable[[], VolumeCollectionResult],
+                              metric_lists: List[List[PrometheusMetric]],
+                              collection_results: List[VolumeCollectionResult]) -> None:
+        """
+        Record the outcome of one volume collection.
+        
+        Args:
+            volume_config: Volume that was collected
+            get_result: Returns the volume's VolumeCollectionResult; may raise
+            metric_lists: Metric lists of successful volumes, appended to
+            collection_results: Results of all volumes, appended to
+        """
+        try:
+            result = get_result()
+            collection_results.append(result)
+            
+            if result.success:
+                metric_lists.append(result.metrics)
+                self.logger.debug("Successfully collected %d metrics from volume %s in %.3fs",
+                                  len(result.metrics), result.volume_id, result.duration)
+            else:
+                self.logger.error("Failed to collect metrics from volume %s: %s",
+                                  result.volume_id, result.error)
+            
+        except Exception as e:
+            error_msg = str(e)[:200]
+            self.logger.error("Unexpected error collecting from volume %s: %s",
+                              volume_config.volume_id, error_msg)
+            collection_results.append(VolumeCollectionResult(
+                volume_id=volume_config.volume_id,
+                zone=volume_config.zone,
+                success=False,
+                metrics=[],
+                error=error_msg
+            ))
     
-    def _collect_volume_metrics(self, volume_config: VolumeConfig, timeout: int) -> VolumeCollectionResult:
+    def _abandon_volumes(self, pending: Set[Future], future_to_volume: Dict[Future, VolumeConfig],
+                         collection_results: List[VolumeCollectionResult], timeout: int) -> None:
+        """
+        Give up on volume collections still running at the scrape deadline.
+        
+        Queued collections are cancelled; running ones finish in the
+        background and their results are discarded. Each is recorded as a
+        timed-out volume.
+        
+        Args:
+            pending: Futures that have not completed
+            future_to_volume: Mapping of futures to their volume configuration
+            collection_results: Results list to append the timeouts to
+            timeout: Collection timeout in seconds
+        """
+        for future in pending:
+            future.cancel()
+            volume_config = future_to_volume[future]
+            self.logger.error("Collection timeout for volume %s after %ss",
+                              volume_config.volume_id, timeout)
+            collection_results.append(VolumeCollectionResult(
+                volume_id=volume_config.volume_id,
+                zone=volume_config.zone,
+                success=False,
+                metrics=[],
+                error=f"Collection timeout after {timeout}s",
+                duration=float(timeout)
+            ))
+    
+    def _collect_volume_metrics(self, volume_config: VolumeConfig, timeout: int,
+                                deadline: Optional[float] = None) -> VolumeCollectionResult:
         """
         Collect metrics from a single AFS volume.
         
         Args:
             volume_config: Volume configuration
             timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() deadline for the whole collection
             
         Returns:
             VolumeCollectionResult with collection outcome
         """
         # Set context for this volume collection
         volume_logger = get_logger(f"{__name__}.volume_collection")
-        volume_logger.set_context(
+        context_token = volume_logger.set_context(
             volume_id=volume_config.volume_id,
             zone=volume_config.zone,
             operation='collect_volume_metrics'
@@ -253,23 +500,25 @@ class MetricsHandler:
         start_time = time.time()
         
         try:
-            with log_operation(volume_logger, f"volume {volume_config.volume_id} collection", level='DEBUG'):
+            with log_operation(volume_logger, "volume collection", level='DEBUG'):
                 # Fetch quota data from AFS API
                 quota_data = self.afs_client.get_volume_quotas(
                     volume_id=volume_config.volume_id,
                     zone=volume_config.zone,
-                    timeout=timeout
+                    timeout=timeout,
+                    deadline=deadline
                 )
                 
                 # Transform to Prometheus metrics
-                metrics = self.transformer.transform_quota_data(
-                    quota_data=quota_data,
-                    volume_id=volume_config.volume_id,
-                    zone=volume_config.zone
-                )
+                with self._transform_semaphore:
+                    metrics = self.transformer.transform_quota_data(
+                        quota_data=quota_data,
+                        volume_id=volume_config.volume_id,
+                        zone=volume_config.zone
+                    )
                 
                 duration = time.time() - start_time
-                volume_logger.info(f"Successfully collected {len(metrics)} metrics")
+                volume_logger.info("Successfully collected %d metrics", len(metrics))
                 
                 return VolumeCollectionResult(
                     volume_id=volume_config.volume_id,
@@ -283,9 +532,9 @@ class MetricsHandler:
             duration = time.time() - start_time
             error_msg = str(e)[:200]
             
-            volume_logger.error(f"Collection failed: {error_msg}")
+            volume_logger.error("Collection failed: %s", error_msg)
             
-            return VolumeCollectionResult(
+            result = VolumeCollectionResult(
                 volume_id=volume_config.volume_id,
                 zone=volume_config.zone,
                 success=False,
@@ -293,12 +542,16 @@ class MetricsHandler:
                 error=error_msg,
                 duration=duration
             )
+            self._failed_volumes[(volume_config.volume_id, volume_config.zone)] = (
+                result, time.monotonic_ns() + _FAILED_VOLUME_TTL_NS
+            )
+            return result
             
         except Exception as e:
             duration = time.time() - start_time
             error_msg = f"Unexpected error: {str(e)[:200]}"
             
-            volume_logger.error(f"Unexpected collection error: {str(e)[:200]}")
+            volume_logger.error("Unexpected collection error: %.200s", e)
             
             return VolumeCollectionResult(
                 volume_id=volume_config.volume_id,
@@ -310,7 +563,7 @@ class MetricsHandler:
             )
             
         finally:
-            volume_logger.clear_context()
+            volume_logger.clear_context(context_token)
     
     def _create_volume_status_metrics(self, results: List[VolumeCollectionResult]) -> List[PrometheusMetric]:
         """
@@ -328,6 +581,8 @@ class MetricsHandler:
         total_duration = 0.0
         
         for result in results:
+            volume_labels = self._get_volume_labels(result.volume_id, result.zone)
+            
             # Track overall statistics
             if result.success:
                 successful_count += 1
@@ -339,10 +594,7 @@ class MetricsHandler:
             status_metrics.append(PrometheusMetric(
                 name='afs_collection_success',
                 value=1.0 if result.success else 0.0,
-                labels={
-                    'volume_id': result.volume_id,
-                    'zone': result.zone
-                },
+                labels=volume_labels,
                 help_text='Success indicator for volume collection (1=success, 0=failure)',
                 metric_type='gauge'
             ))
@@ -351,10 +603,7 @@ class MetricsHandler:
             status_metrics.append(PrometheusMetric(
                 name='afs_collection_duration_seconds',
                 value=result.duration,
-                labels={
-                    'volume_id': result.volume_id,
-                    'zone': result.zone
-                },
+                labels=volume_labels,
                 help_text='Duration of volume collection in seconds',
                 metric_type='gauge'
             ))
@@ -364,10 +613,7 @@ class MetricsHandler:
                 status_metrics.append(PrometheusMetric(
                     name='afs_volume_metrics_count',
                     value=float(len(result.metrics)),
-                    labels={
-                        'volume_id': result.volume_id,
-                        'zone': result.zone
-                    },
+                    labels=volume_labels,
                     help_text='Number of metrics collected from this volume',
                     metric_type='gauge'
                 ))
@@ -375,17 +621,7 @@ class MetricsHandler:
             # Error metric (only if there was an error)
             if not result.success and result.error:
                 # Categorize error type for better monitoring
-                error_category = "unknown"
-                if "timeout" in result.error.lower():
-                    error_category = "timeout"
-                elif "connection" in result.error.lower():
-                    error_category = "connection"
-                elif "authentication" in result.error.lower():
-                    error_category = "authentication"
-                elif "rate limit" in result.error.lower():
-                    error_category = "rate_limit"
-                elif any(code in result.error for code in ["404", "500", "502", "503"]):
-                    error_category = "api_error"
+                error_category = _classify_error(result.error)
                 
                 status_metrics.append(PrometheusMetric(
                     name='afs_collection_error',
@@ -407,35 +643,35 @@ class MetricsHandler:
                 PrometheusMetric(
                     name='afs_collection_success_rate',
                     value=successful_count / total_volumes,
-                    labels={},
+                    labels=_NO_LABELS,
                     help_text='Success rate of volume collections (0.0 to 1.0)',
                     metric_type='gauge'
                 ),
                 PrometheusMetric(
                     name='afs_collection_volumes_successful',
                     value=float(successful_count),
-                    labels={},
+                    labels=_NO_LABELS,
                     help_text='Number of volumes successfully collected',
                     metric_type='gauge'
                 ),
                 PrometheusMetric(
                     name='afs_collection_volumes_failed',
                     value=float(failed_count),
-                    labels={},
+                    labels=_NO_LABELS,
                     help_text='Number of volumes that failed collection',
                     metric_type='gauge'
                 ),
                 PrometheusMetric(
                     name='afs_collection_volumes_total',
                     value=float(total_volumes),
-                    labels={},
+                    labels=_NO_LABELS,
                     help_text='Total number of volumes attempted',
                     metric_type='gauge'
                 ),
                 PrometheusMetric(
                     name='afs_collection_average_duration_seconds',
                     value=total_duration / total_volumes,
-                    labels={},
+                    labels=_NO_LABELS,
                     help_text='Average collection duration per volume in seconds',
                     metric_type='gauge'
                 )
@@ -443,12 +679,30 @@ class MetricsHandler:
         
         return status_metrics
     
-    def _create_collection_metadata(self, duration: float) -> List[PrometheusMetric]:
+    def _get_volume_labels(self, volume_id: str, zone: str) -> LabelSet:
+        """
+        Get the shared label dict for a volume's status metrics.
+        
+        Args:
+            volume_id: Volume identifier
+            zone: Zone identifier
+            
+        Returns:
+            Shared LabelSet that must not be mutated
+        """
+        key = (volume_id, zone)
+        labels = self._volume_labels.get(key)
+        if labels is None:
+            labels = self._volume_labels.setdefault(key, LabelSet({'volume_id': volume_id, 'zone': zone}))
+        return labels
+    
+    def _create_collection_metadata(self, duration: float, cache_ttl_ns: int) -> List[PrometheusMetric]:
         """
         Create metadata metrics about the overall collection process.
         
         Args:
             duration: Total collection duration in seconds
+            cache_ttl_ns: Effective lifetime of the cache entry being created
             
         Returns:
             List of PrometheusMetric objects for collection metadata
@@ -460,7 +714,7 @@ class MetricsHandler:
         metadata_metrics.append(PrometheusMetric(
             name='afs_scrape_duration_seconds',
             value=duration,
-            labels={},
+            labels=_NO_LABELS,
             help_text='Total duration of the metrics scrape in seconds',
             metric_type='gauge'
         ))
@@ -469,7 +723,7 @@ class MetricsHandler:
         metadata_metrics.append(PrometheusMetric(
             name='afs_scrape_timestamp',
             value=current_time,
-            labels={},
+            labels=_NO_LABELS,
             help_text='Unix timestamp of the last successful scrape',
             metric_type='gauge'
         ))
@@ -478,27 +732,17 @@ class MetricsHandler:
         metadata_metrics.append(PrometheusMetric(
             name='afs_collection_total',
             value=float(self._collection_count),
-            labels={},
+            labels=_NO_LABELS,
             help_text='Total number of collection cycles performed',
             metric_type='counter'
         ))
         
-        # Configured volumes count
-        afs_config = self.config.get_afs_config()
-        metadata_metrics.append(PrometheusMetric(
-            name='afs_configured_volumes',
-            value=float(len(afs_config.volumes)),
-            labels={},
-            help_text='Number of configured AFS volumes',
-            metric_type='gauge'
-        ))
-        
         # Cache status metrics
         cache_status = self.get_cache_status()
         metadata_metrics.append(PrometheusMetric(
             name='afs_cache_hit',
             value=1.0 if cache_status['cached'] else 0.0,
-            labels={},
+            labels=_NO_LABELS,
             help_text='Whether the last scrape used cached data (1=cached, 0=fresh)',
             metric_type='gauge'
         ))
@@ -507,47 +751,33 @@ class MetricsHandler:
             metadata_metrics.append(PrometheusMetric(
                 name='afs_cache_age_seconds',
                 value=cache_status['cache_age'],
-                labels={},
+                labels=_NO_LABELS,
                 help_text='Age of cached data in seconds',
                 metric_type='gauge'
             ))
         
+        # Lifetime of the cache entry this collection creates
+        metadata_metrics.append(PrometheusMetric(
+            name='afs_cache_effective_ttl_seconds',
+            value=cache_ttl_ns / 1_000_000_000,
+            labels=_NO_LABELS,
+            help_text='Effective lifetime of the cached data in seconds',
+            metric_type='gauge'
+        ))
+        
         # Collection performance metrics
         if self._last_collection_time:
             time_since_last = current_time - self._last_collection_time
             metadata_metrics.append(PrometheusMetric(
                 name='afs_time_since_last_collection_seconds',
                 value=time_since_last,
-                labels={},
+                labels=_NO_LABELS,
                 help_text='Time since last collection in seconds',
                 metric_type='gauge'
             ))
         
         # Configuration metadata
-        collection_config = self.config.get_collection_config()
-        metadata_metrics.extend([
-            PrometheusMetric(
-                name='afs_config_max_retries',
-                value=float(collection_config.max_retries),
-                labels={},
-                help_text='Configured maximum retry attempts',
-                metric_type='gauge'
-            ),
-            PrometheusMetric(
-                name='afs_config_timeout_seconds',
-                value=float(collection_config.timeout_seconds),
-                labels={},
-                help_text='Configured collection timeout in seconds',
-                metric_type='gauge'
-            ),
-            PrometheusMetric(
-                name='afs_config_cache_duration_seconds',
-                value=float(collection_config.cache_duration),
-                labels={},
-                help_text='Configured cache duration in seconds',
-                metric_type='gauge'
-            )
-        ])
+        metadata_metrics.extend(self._get_static_metadata())
         
         # Circuit breaker status (if available)
         if hasattr(self.afs_client, 'retry_handler'):
@@ -572,6 +802,58 @@ class MetricsHandler:
         
         return metadata_metrics
     
+    def _get_static_metadata(self) -> List[PrometheusMetric]:
+        """
+        Get the metadata metrics that only depend on configuration.
+        
+        The metrics are built once and reused across scrapes until one of
+        the configuration values they report changes.
+        
+        Returns:
+            Shared list of PrometheusMetric objects; must not be mutated
+        """
+        volume_count = len(self.config.get_afs_config().volumes)
+        collection_config = self.config.get_collection_config()
+        key = (volume_count, collection_config.max_retries,
+               collection_config.timeout_seconds, collection_config.cache_duration)
+        
+        cached_key, static_metrics = self._static_metadata
+        if cached_key == key:
+            return static_metrics
+        
+        static_metrics = [
+            PrometheusMetric(
+                name='afs_configured_volumes',
+                value=float(volume_count),
+                labels=_NO_LABELS,
+                help_text='Number of configured AFS volumes',
+                metric_type='gauge'
+            ),
+            PrometheusMetric(
+                name='afs_config_max_retries',
+                value=float(collection_config.max_retries),
+                labels=_NO_LABELS,
+                help_text='Configured maximum retry attempts',
+                metric_type='gauge'
+            ),
+            PrometheusMetric(
+                name='afs_config_timeout_seconds',
+                value=float(collection_config.timeout_seconds),
+                labels=_NO_LABELS,
+                help_text='Configured collection timeout in seconds',
+                metric_type='gauge'
+            ),
+            PrometheusMetric(
+                name='afs_config_cache_duration_seconds',
+                value=float(collection_config.cache_duration),
+                labels=_NO_LABELS,
+                help_text='Configured cache duration in seconds',
+                metric_type='gauge'
+            )
+        ]
+        self._static_metadata = (key, static_metrics)
+        return static_metrics
+    
     def _create_error_metrics(self, error_message: str) -> List[PrometheusMetric]:
         """
         Create error metrics when collection fails completely.
@@ -597,18 +879,47 @@ class MetricsHandler:
         error_metrics.append(PrometheusMetric(
             name='afs_scrape_timestamp',
             value=time.time(),
-            labels={},
+            labels=_NO_LABELS,
             help_text='Unix timestamp of the last scrape attempt',
             metric_type='gauge'
         ))
         
         return error_metrics
     
+    def close(self) -> None:
+        """
+        Shut down the volume collection worker pool.
+        """
+        self._executor.shutdown(wait=True)
+    
     def clear_cache(self) -> None:
         """Clear the metrics cache to force fresh collection."""
-        with self._cache_lock:
-            self._cache = None
-            self.logger.debug("Metrics cache cleared")
+        self._cache = None
+        self._failed_volumes.clear()
+        self.logger.debug("Metrics cache cleared")
+    
+    def get_cached_payload(self, metrics: Optional[Sequence[PrometheusMetric]] = None) -> Optional[bytes]:
+        """
+        Get the Prometheus exposition payload for the cached metrics.
+        
+        The payload is formatted and UTF-8 encoded when the collection is
+        cached and reused by every scrape until the cache expires.
+        
+        Args:
+            metrics: Metrics just returned by collect_metrics(); if given, the
+                payload built from exactly those metrics is returned even when
+                the entry is already stale (e.g. with cache_duration 0)
+        
+        Returns:
+            Encoded exposition text, or None if there is no matching entry
+        """
+        cached = self._cache
+        if metrics is not None:
+            if cached is None or cached.metrics is not metrics:
+                return None
+        elif not self._is_cache_valid(cached):
+            return None
+        return cached.payload
     
     def get_cache_status(self) -> Dict[str, any]:
         """
@@ -617,26 +928,27 @@ class MetricsHandler:
         Returns:
             Dictionary with cache status information
         """
-        with self._cache_lock:
-            if not self._cache:
-                return {
-                    'cached': False,
-                    'cache_age': None,
-                    'metrics_count': 0,
-                    'collection_duration': None
-                }
-            
-            cache_age = time.time() - self._cache.timestamp
-            collection_config = self.config.get_collection_config()
-            
+        cached = self._cache
+        if not cached:
             return {
-                'cached': True,
-                'cache_age': cache_age,
-                'cache_valid': cache_age < collection_config.cache_duration,
-                'metrics_count': len(self._cache.metrics),
-                'collection_duration': self._cache.collection_duration,
-                'cache_duration_limit': collection_config.cache_duration
+                'cached': False,
+                'cache_age': None,
+                'metrics_count': 0,
+                'collection_duration': None
             }
+        
+        cache_age_ns = time.monotonic_ns() - cached.timestamp_ns
+        collection_config = self.config.get_collection_config()
+        
+        return {
+            'cached': True,
+            'cache_age': cache_age_ns / 1_000_000_000,
+            'cache_valid': cache_age_ns < cached.ttl_ns,
+            'cache_ttl': cached.ttl_ns / 1_000_000_000,
+            'metrics_count': len(cached.metrics),
+            'collection_duration': cached.collection_duration,
+            'cache_duration_limit': collection_config.cache_duration
+        }
     
     def get_collection_stats(self) -> Dict[str, any]:
         """
@@ -5,9 +5,55 @@ This module handles the transformation of AFS API responses into
 Prometheus-compatible metrics with proper labeling and sanitization.
 """
 
+import io
 import re
-from typing import Dict, List
-from src.data_models import PrometheusMetric, AFSQuotaData
+import string
+from typing import Dict, Iterable, Iterator, List, Tuple
+from src.data_models import AFSQuotaData, LabelSet, PrometheusMetric
+
+
+# Characters replaced in label values; alphanumerics, hyphens, underscores,
+# slashes and dots are kept
+_INVALID_LABEL_CHARS_PATTERN = re.compile(r'[^a-zA-Z0-9\-_/.]')
+
+# The same replacement as a translation table, covering ASCII only;
+# non-ASCII values go through the pattern instead
+_ALLOWED_LABEL_CHARS = frozenset(string.ascii_letters + string.digits + '-_/.')
+_LABEL_SANITIZE_TABLE = str.maketrans({
+    code: '_' for code in range(128) if chr(code) not in _ALLOWED_LABEL_CHARS
+})
+
+# Escapes required in label values by the exposition format
+_LABEL_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+# Floats below this magnitude hold integers exactly, so integer-valued
+# samples (byte and file counts, states, flags) can be written without ".0"
+_EXACT_INTEGER_LIMIT = 2.0 ** 53
+
+# Exposition spellings of the non-finite values
+_NON_FINITE_VALUES = {float('inf'): '+Inf', float('-inf'): '-Inf'}
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value for the exposition format.
+    
+    Integer-valued floats are written as integers; other values use the
+    shortest representation that round-trips.
+    
+    Args:
+        value: Sample value
+        
+    Returns:
+        Value string
+    """
+    if isinstance(value, int):
+        return str(value)
+    if value.is_integer() and -_EXACT_INTEGER_LIMIT < value < _EXACT_INTEGER_LIMIT:
+        return str(int(value))
+    if value != value:
+        return 'NaN'
+    return _NON_FINITE_VALUES.get(value) or repr(value)
 
 
 class MetricsTransformer:
@@ -39,12 +85,21 @@ class MetricsTransformer:
         # Extract dir_quota_list from the API response
         dir_quota_list = quota_data.get('dir_quota_list', [])
         
+        # Bound once; the loop runs for every directory of the volume
+        from_api_response = AFSQuotaData.from_api_response
+        create_usage_metrics = self._create_usage_metrics
+        extend = metrics.extend
+        
         for quota_item in dir_quota_list:
             # Create AFSQuotaData instance for easier handling
-            afs_data = AFSQuotaData.from_api_response(quota_item, zone)
+            afs_data = from_api_response(quota_item, zone)
             
-            # Generate metrics for this quota item
-            metrics.extend(self._create_usage_metrics(afs_data))
+            # Generate metrics for this quota item; the metrics copy every
+            # field they need, so the instance can be recycled afterwards
+            try:
+                extend(create_usage_metrics(afs_data))
+            finally:
+                afs_data.release()
         
         return metrics
     
@@ -58,84 +113,93 @@ class MetricsTransformer:
         Returns:
             List of PrometheusMetric objects for this quota data
         """
-        metrics = []
-        
-        # Create base labels for all metrics
+        # Create base labels once; every metric for this row shares the same
+        # dict, so it must not be mutated after construction
         base_labels = self._sanitize_labels({
             'volume_id': quota_data.volume_id,
             'zone': quota_data.zone,
             'dir_path': quota_data.dir_path
         })
         
-        # Capacity used metric
-        metrics.append(PrometheusMetric(
-            name='afs_capacity_used_bytes',
-            value=float(quota_data.capacity_used_quota),
-            labels=base_labels.copy(),
-            help_text='Used storage capacity in bytes',
-            metric_type='gauge'
-        ))
-        
-        # Capacity quota metric (0 means unlimited)
-        metrics.append(PrometheusMetric(
-            name='afs_capacity_quota_bytes',
-            value=float(quota_data.capacity_quota),
-            labels=base_labels.copy(),
-            help_text='Total capacity quota in bytes (0 means unlimited)',
-            metric_type='gauge'
-        ))
-        
-        # File quantity used metric
-        metrics.append(PrometheusMetric(
-            name='afs_file_quantity_used',
-            value=float(quota_data.file_quantity_used_quota),
-            labels=base_labels.copy(),
-            help_text='Number of files used',
-            metric_type='gauge'
-        ))
-        
-        # File quantity quota metric (0 means unlimited)
-        metrics.append(PrometheusMetric(
-            name='afs_file_quantity_quota',
-            value=float(quota_data.file_quantity_quota),
-            labels=base_labels.copy(),
-            help_text='File quantity quota (0 means unlimited)',
-            metric_type='gauge'
-        ))
-        
-        # Directory state metric
-        metrics.append(PrometheusMetric(
-            name='afs_directory_state',
-            value=float(quota_data.state),
-            labels=base_labels.copy(),
-            help_text='Directory state (1=active, 0=inactive)',
-            metric_type='gauge'
-        ))
+        # Numeric fields are converted once; the utilization percentages
+        # below reuse the same floats as the gauges
+        capacity_used = float(quota_data.capacity_used_quota)
+        capacity_quota = float(quota_data.capacity_quota)
+        file_quantity_used = float(quota_data.file_quantity_used_quota)
+        file_quantity_quota = float(quota_data.file_quantity_quota)
+        
+        # The five gauges every row has, built as one list
+        metrics = [
+            # Capacity used metric
+            PrometheusMetric(
+                name='afs_capacity_used_bytes',
+                value=capacity_used,
+                labels=base_labels,
+                help_text='Used storage capacity in bytes',
+                metric_type='gauge'
+            ),
+            
+            # Capacity quota metric (0 means unlimited)
+            PrometheusMetric(
+                name='afs_capacity_quota_bytes',
+                value=capacity_quota,
+                labels=base_labels,
+                help_text='Total capacity quota in bytes (0 means unlimited)',
+                metric_type='gauge'
+            ),
+            
+            # File quantity used metric
+            PrometheusMetric(
+                name='afs_file_quantity_used',
+                value=file_quantity_used,
+                labels=base_labels,
+                help_text='Number of files used',
+                metric_type='gauge'
+            ),
+            
+            # File quantity quota metric (0 means unlimited)
+            PrometheusMetric(
+                name='afs_file_quantity_quota',
+                value=file_quantity_quota,
+                labels=base_labels,
+                help_text='File quantity quota (0 means unlimited)',
+                metric_type='gauge'
+            ),
+            
+            # Directory state metric
+            PrometheusMetric(
+                name='afs_directory_state',
+                value=float(quota_data.state),
+                labels=base_labels,
+                help_text='Directory state (1=active, 0=inactive)',
+                metric_type='gauge'
+            )
+        ]
         
         # Calculate utilization percentages if quotas are set (not 0)
-        if quota_data.capacity_quota > 0:
-            capacity_utilization = (quota_data.capacity_used_quota / quota_data.capacity_quota) * 100
+        if capacity_quota > 0:
+            capacity_utilization = (capacity_used / capacity_quota) * 100
             metrics.append(PrometheusMetric(
                 name='afs_capacity_utilization_percent',
                 value=capacity_utilization,
-                labels=base_labels.copy(),
+                labels=base_labels,
                 help_text='Storage capacity utilization percentage',
                 metric_type='gauge'
             ))
         
-        if quota_data.file_quantity_quota > 0:
-            file_utilization = (quota_data.file_quantity_used_quota / quota_data.file_quantity_quota) * 100
+        if file_quantity_quota > 0:
+            file_utilization = (file_quantity_used / file_quantity_quota) * 100
             metrics.append(PrometheusMetric(
                 name='afs_file_quantity_utilization_percent',
                 value=file_utilization,
-                labels=base_labels.copy(),
+                labels=base_labels,
                 help_text='File quantity utilization percentage',
                 metric_type='gauge'
             ))
         
         return metrics
     
-    def _sanitize_labels(self, labels: Dict[str, str]) -> Dict[str, str]:
+    def _sanitize_labels(self, labels: Dict[str, str]) -> LabelSet:
         """
         Sanitize label values for Prometheus compatibility.
         
@@ -148,17 +212,25 @@ class MetricsTransformer:
             labels: Dictionary of label key-value pairs
             
         Returns:
-            Dictionary with sanitized label values
+            LabelSet with sanitized label values
         """
         sanitized = {}
+        substitute = _INVALID_LABEL_CHARS_PATTERN.sub
         
         for key, value in labels.items():
             # Convert value to string if it isn't already
             str_value = str(value)
             
+            # Plain identifiers (most zones and volume IDs) need no changes
+            if str_value.isascii() and str_value.isalnum():
+                sanitized[key] = str_value
+                continue
+            
             # Replace problematic characters in label values
-            # Keep alphanumeric, hyphens, underscores, slashes, and dots
-            sanitized_value = re.sub(r'[^a-zA-Z0-9\-_/.]', '_', str_value)
+            if str_value.isascii():
+                sanitized_value = str_value.translate(_LABEL_SANITIZE_TABLE)
+            else:
+                sanitized_value = substitute('_', str_value)
             
             # Remove leading/trailing underscores that might result from sanitization
             sanitized_value = sanitized_value.strip('_')
@@ -169,7 +241,7 @@ class MetricsTransformer:
             
             sanitized[key] = sanitized_value
         
-        return sanitized
+        return LabelSet(sanitized)
     
     def format_prometheus_metrics(self, metrics: List[PrometheusMetric]) -> str:
         """
@@ -186,39 +258,72 @@ class MetricsTransformer:
         Returns:
             String in Prometheus exposition format
         """
-        if not metrics:
-            return ""
+        buf = io.StringIO()
+        for metric_name, metric_list in self._group_metrics_by_name(metrics).items():
+            self._write_metric_family(buf, metric_name, metric_list)
+        return buf.getvalue()
+    
+    def iter_prometheus_metrics(self, metrics: List[PrometheusMetric]) -> Iterator[str]:
+        """
+        Yield the Prometheus exposition format one metric family at a time.
         
-        output_lines = []
-        processed_metrics = set()
+        Joining the yielded chunks gives exactly the output of
+        format_prometheus_metrics, without holding the whole text in memory.
         
-        # Group metrics by name to avoid duplicate HELP and TYPE lines
+        Args:
+            metrics: List of PrometheusMetric objects to format
+            
+        Yields:
+            HELP/TYPE lines and sample lines of one metric family
+        """
+        for metric_name, metric_list in self._group_metrics_by_name(metrics).items():
+            buf = io.StringIO()
+            self._write_metric_family(buf, metric_name, metric_list)
+            yield buf.getvalue()
+    
+    def _group_metrics_by_name(self, metrics: List[PrometheusMetric]) -> Dict[str, List[PrometheusMetric]]:
+        """
+        Group metrics by name, keeping first-seen order.
+        
+        Args:
+            metrics: List of PrometheusMetric objects
+            
+        Returns:
+            Dictionary mapping each metric name to its metrics
+        """
+        # Grouping avoids duplicate HELP and TYPE lines
         metrics_by_name = {}
         for metric in metrics:
-            if metric.name not in metrics_by_name:
-                metrics_by_name[metric.name] = []
-            metrics_by_name[metric.name].append(metric)
-        
-        # Format each metric group
-        for metric_name, metric_list in metrics_by_name.items():
-            if metric_name not in processed_metrics:
-                # Add HELP line (use help text from first metric with this name)
-                help_text = metric_list[0].help_text
-                output_lines.append(f"# HELP {metric_name} {help_text}")
-                
-                # Add TYPE line (use type from first metric with this name)
-                metric_type = metric_list[0].metric_type
-                output_lines.append(f"# TYPE {metric_name} {metric_type}")
-                
-                processed_metrics.add(metric_name)
-            
-            # Add metric lines for all instances of this metric
-            for metric in metric_list:
-                metric_line = self._format_metric_line(metric)
-                output_lines.append(metric_line)
-        
-        # Add final newline
-        return '\n'.join(output_lines) + '\n'
+            metric_list = metrics_by_name.get(metric.name)
+            if metric_list is None:
+                metric_list = metrics_by_name[metric.name] = []
+            metric_list.append(metric)
+        return metrics_by_name
+    
+    def _write_metric_family(self, buf: io.StringIO, metric_name: str,
+                             metric_list: List[PrometheusMetric]) -> None:
+        """
+        Write the HELP/TYPE lines and sample lines of one metric family.
+        
+        Sample lines are written straight into the buffer rather than built
+        with _format_metric_line and joined.
+        
+        Args:
+            buf: Buffer to write to
+            metric_name: Name shared by every metric in metric_list
+            metric_list: Metrics of this family, in output order
+        """
+        write = buf.write
+        
+        # HELP and TYPE come from the first metric with this name
+        write(f"# HELP {metric_name} {metric_list[0].help_text}\n")
+        write(f"# TYPE {metric_name} {metric_list[0].metric_type}\n")
+        
+        for metric in metric_list:
+            write(metric_name)
+            if metric.labels:
+                write(self._format_labels(metric.labels))
+            write(f" {_format_value(metric.value)}\n")
     
     def _format_metric_line(self, metric: PrometheusMetric) -> str:
         """
@@ -234,15 +339,45 @@ class MetricsTransformer:
         """
         if not metric.labels:
             # No labels case
-            return f"{metric.name} {metric.value}"
+            return f"{metric.name} {_format_value(metric.value)}"
         
-        # Format labels
-        label_pairs = []
-        for key, value in sorted(metric.labels.items()):
-            # Escape quotes and backslashes in label values
-            escaped_value = value.replace('\\', '\\\\').replace('"', '\\"')
-            label_pairs.append(f'{key}="{escaped_value}"')
+        return f"{metric.name}{self._format_labels(metric.labels)} {_format_value(metric.value)}"
+    
+    def _format_labels(self, labels: Dict[str, str]) -> str:
+        """
+        Format a label set as {label1="value1",label2="value2"}.
         
-        labels_str = '{' + ','.join(label_pairs) + '}'
+        Args:
+            labels: Non-empty label dictionary
+            
+        Returns:
+            Label string with keys sorted and values escaped
+        """
+        # A shared LabelSet is rendered once and reused by every metric
+        # carrying it (all metrics of a quota row, status metrics of a volume)
+        if isinstance(labels, LabelSet):
+            rendered = labels.rendered
+            if rendered is None:
+                rendered = labels.rendered = self._render_labels(labels.sorted_items)
+            return rendered
+        return self._render_labels(sorted(labels.items()))
+    
+    def _render_labels(self, label_items: Iterable[Tuple[str, str]]) -> str:
+        """
+        Render sorted label pairs as {label1="value1",label2="value2"}.
+        
+        Args:
+            label_items: (name, value) pairs in output order
+            
+        Returns:
+            Label string with values escaped
+        """
+        label_pairs = []
+        for key, value in label_items:
+            # Escape backslashes, quotes and newlines; sanitized values
+            # normally contain none of them
+            if '\\' in value or '"' in value or '\n' in value:
+                value = value.translate(_LABEL_ESCAPE_TABLE)
+            label_pairs.append(f'{key}="{value}"')
         
-        return f"{metric.name}{labels_str} {metric.value}"
\ No newline at end of file
+        return '{' + ','.join(label_pairs) + '}'
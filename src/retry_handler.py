@@ -46,7 +46,7 @@ class RetryAttempt:
     attempt_number: int
     delay: float
     error: Optional[Exception] = None
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float = field(default_factory=time.monotonic)
 
 
 @dataclass
@@ -80,9 +80,9 @@ class CircuitBreaker:
         self.name = name
         self.state = CircuitState.CLOSED
         self.failure_count = 0
-        self.last_failure_time = 0.0
+        self.last_failure_time = 0.0  # time.monotonic(), immune to clock steps
         self.half_open_calls = 0
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
         self.logger = get_logger(f"{__name__}.{name}")
     
     def can_execute(self) -> bool:
@@ -98,7 +98,7 @@ class CircuitBreaker:
             
             elif self.state == CircuitState.OPEN:
                 # Check if recovery timeout has passed
-                if time.time() - self.last_failure_time >= self.config.recovery_timeout:
+                if time.monotonic() - self.last_failure_time >= self.config.recovery_timeout:
                     self.logger.info(f"Circuit breaker {self.name} transitioning to HALF_OPEN")
                     self.state = CircuitState.HALF_OPEN
                     self.half_open_calls = 0
@@ -123,11 +123,19 @@ class CircuitBreaker:
             elif self.state == CircuitState.CLOSED:
                 self.failure_count = max(0, self.failure_count - 1)
     
-    def record_failure(self) -> None:
-        """Record a failed operation."""
+    def record_failure(self, now: Optional[float] = None) -> None:
+        """
+        Record a failed operation.
+        
+        Args:
+            now: Current time.monotonic() reading, if the caller has one
+        """
+        if now is None:
+            now = time.monotonic()
+        
         with self.lock:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = now
             
             if self.state == CircuitState.HALF_OPEN:
                 self.logger.warning(f"Circuit breaker {self.name} transitioning back to OPEN")
@@ -165,7 +173,7 @@ class RetryHandler:
         """
         self.config = config
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
         self.logger = get_logger(__name__)
     
     def get_circuit_breaker(self, name: str) -> CircuitBreaker:
@@ -246,6 +254,7 @@ class RetryHandler:
                           *args,
                           circuit_breaker_name: Optional[str] = None,
                           context: Optional[Dict] = None,
+                          retry_deadline: Optional[float] = None,
                           **kwargs) -> RetryResult:
         """
         Execute a function with retry logic and circuit breaker protection.
@@ -255,12 +264,14 @@ class RetryHandler:
             *args: Function arguments
             circuit_breaker_name: Name for circuit breaker (optional)
             context: Additional context for logging
+            retry_deadline: Optional time.monotonic() deadline; no retry is
+                scheduled whose backoff would end at or after it
             **kwargs: Function keyword arguments
             
         Returns:
             RetryResult with execution outcome
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         attempts = []
         circuit_breaker = None
         
@@ -268,7 +279,7 @@ class RetryHandler:
             circuit_breaker = self.get_circuit_breaker(circuit_breaker_name)
         
         # Set up logging context
-        self.logger.set_context(
+        context_token = self.logger.set_context(
             operation=func.__name__,
             circuit_breaker=circuit_breaker_name,
             **(context or {})
@@ -286,7 +297,7 @@ class RetryHandler:
                             retryable=False
                         ),
                         attempts=attempts,
-                        total_duration=time.time() - start_time,
+                        total_duration=time.monotonic() - start_time,
                         circuit_breaker_triggered=True
                     )
                 
@@ -296,11 +307,15 @@ class RetryHandler:
                     # Execute the function
                     result = func(*args, **kwargs)
                     
+                    # One clock read per attempt, shared by its record
+                    # and the total duration
+                    now = time.monotonic()
+                    
                     # Record success
                     if circuit_breaker:
                         circuit_breaker.record_success()
                     
-                    attempts.append(RetryAttempt(attempt_number=attempt, delay=0))
+                    attempts.append(RetryAttempt(attempt_number=attempt, delay=0, timestamp=now))
                     
                     self.logger.info(f"Operation succeeded on attempt {attempt}")
                     
@@ -308,29 +323,39 @@ class RetryHandler:
                         success=True,
                         result=result,
                         attempts=attempts,
-                        total_duration=time.time() - start_time
+                        total_duration=now - start_time
                     )
                 
                 except Exception as error:
+                    now = time.monotonic()
+                    
                     # Record failure
                     if circuit_breaker:
-                        circuit_breaker.record_failure()
+                        circuit_breaker.record_failure(now)
                     
                     # Determine if we should retry
                     should_retry = self.should_retry(error, attempt)
                     
-                    if should_retry and attempt < self.config.max_attempts:
+                    if should_retry:
                         # Calculate delay
                         delay = self.calculate_delay(attempt, error)
                         
+                        # Never sleep past the deadline for an attempt that
+                        # could no longer be made
+                        if retry_deadline is not None and now + delay >= retry_deadline:
+                            self.logger.debug("Not retrying, backoff of %.1fs would pass the deadline", delay)
+                            should_retry = False
+                    
+                    if should_retry:
                         attempts.append(RetryAttempt(
                             attempt_number=attempt,
                             delay=delay,
-                            error=error
+                            error=error,
+                            timestamp=now
                         ))
                         
-                        self.logger.warning(f"Attempt {attempt} failed: {str(error)[:200]}, "
-                                          f"retrying in {delay:.1f}s")
+                        self.logger.warning("Attempt %d failed: %.200s, retrying in %.1fs",
+                                            attempt, error, delay)
                         
                         # Wait before retry
                         if delay > 0:
@@ -340,16 +365,17 @@ class RetryHandler:
                         attempts.append(RetryAttempt(
                             attempt_number=attempt,
                             delay=0,
-                            error=error
+                            error=error,
+                            timestamp=now
                         ))
                         
-                        self.logger.error(f"Operation failed after {attempt} attempts: {str(error)[:200]}")
+                        self.logger.error("Operation failed after %d attempts: %.200s", attempt, error)
                         
                         return RetryResult(
                             success=False,
                             error=error,
                             attempts=attempts,
-                            total_duration=time.time() - start_time
+                            total_duration=now - start_time
                         )
             
             # Should not reach here, but handle gracefully
@@ -357,11 +383,11 @@ class RetryHandler:
                 success=False,
                 error=AFSCollectorError("Maximum retry attempts exceeded"),
                 attempts=attempts,
-                total_duration=time.time() - start_time
+                total_duration=time.monotonic() - start_time
             )
         
         finally:
-            self.logger.clear_context()
+            self.logger.clear_context(context_token)
     
     def get_circuit_breaker_status(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -381,17 +407,19 @@ def retry_on_failure(config: Optional[RetryConfig] = None,
     """
     Decorator to automatically retry function calls on failure.
     
+    Each decorated function gets one RetryHandler, shared by all of its
+    calls, so its circuit breaker keeps failure state between calls.
+    
     Args:
         config: Retry configuration (uses default if None)
         circuit_breaker_name: Name for circuit breaker
         context: Additional context for logging
     """
     def decorator(func):
+        handler = RetryHandler(config or RetryConfig())
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            retry_config = config or RetryConfig()
-            handler = RetryHandler(retry_config)
-            
             result = handler.execute_with_retry(
                 func,
                 *args,
@@ -405,6 +433,7 @@ def retry_on_failure(config: Optional[RetryConfig] = None,
             else:
                 raise result.error
         
+        wrapper.retry_handler = handler
         return wrapper
     return decorator
 
@@ -3,15 +3,20 @@ Unit tests for AFS API client authentication and API functionality.
 """
 
 import pytest
+import json
 import hashlib
 import hmac
 import base64
+import threading
+import time
 from datetime import datetime, timezone
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, PropertyMock
 import requests
 
 from src.afs_client import AFSClient
-from src.exceptions import AuthenticationError, APIError
+from src.config import VolumeConfig
+from src.logging_config import _LOG_CONTEXT
+from src.exceptions import AuthenticationError, APIError, TimeoutError
 
 
 class TestAFSClientAuthentication:
@@ -35,6 +40,25 @@ class TestAFSClientAuthentication:
         client = AFSClient(self.access_key, self.secret_key, "https://afs.example.com/")
         assert client.base_url == "https://afs.example.com"
     
+    def test_session_default_headers(self):
+        """Test that JSON headers are set once on the shared session."""
+        assert self.client._session.headers['Content-Type'] == 'application/json'
+        assert self.client._session.headers['Accept'] == 'application/json'
+        assert self.client._session.headers['Accept-Encoding'] == 'gzip, deflate'
+    
+    def test_connection_pool_covers_worker_count(self):
+        """Test that the HTTP pool is at least as large as the fetch fan-out."""
+        client = AFSClient(self.access_key, self.secret_key, self.base_url, max_workers=64)
+        adapter = client._session.get_adapter(self.base_url)
+        
+        assert adapter.poolmanager.connection_pool_kw['maxsize'] == 64
+    
+    def test_close_closes_session(self):
+        """Test that close() releases the shared session."""
+        with patch.object(self.client._session, 'close') as mock_close:
+            self.client.close()
+        mock_close.assert_called_once()
+    
     def test_get_current_date_format(self):
         """Test that current date is returned in correct GMT format."""
         date_string = self.client._get_current_date()
@@ -71,6 +95,22 @@ class TestAFSClientAuthentication:
         
         assert actual_signature == expected_signature_b64
     
+    def test_generate_signature_reuses_keyed_state(self):
+        """Test that repeated signatures match a fresh HMAC over the x-date string."""
+        date_string = "Wed, 15 Oct 2025 10:30:45 GMT"
+        
+        expected_signature = base64.b64encode(hmac.new(
+            self.secret_key.encode('utf-8'),
+            f"x-date: {date_string}".encode('utf-8'),
+            hashlib.sha256
+        ).digest()).decode('utf-8')
+        
+        first = self.client._generate_signature(date_string)
+        second = self.client._generate_signature(date_string)
+        
+        assert first == expected_signature
+        assert second == expected_signature
+    
     def test_generate_signature_different_methods(self):
         """Test signature generation with different HTTP methods."""
         date_string = "Wed, 15 Oct 2025 10:30:45 GMT"
@@ -145,6 +185,35 @@ class TestAFSClientAuthentication:
         except Exception:
             pytest.fail("Signature is not valid base64")
     
+    @patch('src.afs_client.AFSClient._get_current_date')
+    def test_create_auth_headers_reuses_signature_within_same_date(self, mock_get_date):
+        """Test that the signature is only recomputed when the X-Date changes."""
+        mock_get_date.return_value = "Wed, 15 Oct 2025 10:30:45 GMT"
+        
+        with patch.object(self.client, '_generate_signature', wraps=self.client._generate_signature) as mock_sign:
+            first = self.client._create_auth_headers("GET", "/a")
+            second = self.client._create_auth_headers("GET", "/b")
+            
+            mock_get_date.return_value = "Wed, 15 Oct 2025 10:30:46 GMT"
+            third = self.client._create_auth_headers("GET", "/a")
+        
+        assert mock_sign.call_count == 2
+        assert first == second
+        assert third['X-Date'] == "Wed, 15 Oct 2025 10:30:46 GMT"
+        assert third['Authorization'] != first['Authorization']
+    
+    @patch('src.afs_client.AFSClient._get_current_date')
+    def test_rotate_credentials_discards_cached_signature(self, mock_get_date):
+        """Test that a signature made with old credentials is not reused after rotation."""
+        mock_get_date.return_value = "Wed, 15 Oct 2025 10:30:45 GMT"
+        
+        before = self.client._create_auth_headers()
+        self.client.rotate_credentials("new_access_key", "new_secret_key")
+        after = self.client._create_auth_headers()
+        
+        assert after['Authorization'] != before['Authorization']
+        assert 'accesskey="new_access_key"' in after['Authorization']
+    
     def test_create_auth_headers_error_handling(self):
         """Test authentication headers creation error handling."""
         # Test with invalid client setup
@@ -168,7 +237,7 @@ class TestAFSClientAPI:
         self.volume_id = "test-volume-id"
         self.zone = "test-zone"
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_success(self, mock_auth_headers, mock_requests_get):
         """Test successful volume quota retrieval."""
@@ -181,7 +250,7 @@ class TestAFSClientAPI:
         # Mock successful API response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "dir_quota_list": [
                 {
                     "volume_id": self.volume_id,
@@ -193,7 +262,7 @@ class TestAFSClientAPI:
                     "state": 1
                 }
             ]
-        }
+        }).encode('utf-8')
         mock_requests_get.return_value = mock_response
         
         # Test the method
@@ -208,9 +277,7 @@ class TestAFSClientAPI:
         expected_url = f"{self.base_url}/storage/afs/data/v1/volume/{self.volume_id}/dir_quotas"
         expected_headers = {
             'X-Date': 'Wed, 15 Oct 2025 10:30:45 GMT',
-            'Authorization': 'hmac accesskey="test_access_key",algorithm="hmac-sha256",headers="x-date",signature="mock_signature"',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Authorization': 'hmac accesskey="test_access_key",algorithm="hmac-sha256",headers="x-date",signature="mock_signature"'
         }
         expected_params = {'volume_id': self.volume_id, 'zone': self.zone}
         
@@ -221,7 +288,154 @@ class TestAFSClientAPI:
             timeout=30
         )
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
+    @patch('src.afs_client.AFSClient._create_auth_headers')
+    def test_get_volume_quotas_does_not_print_headers(self, mock_auth_headers, mock_requests_get, capsys):
+        """Test that request details are not written to stdout."""
+        mock_auth_headers.return_value = {'X-Date': 'test', 'Authorization': 'secret-signature'}
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"dir_quota_list": []}'
+        mock_requests_get.return_value = mock_response
+        
+        self.client.get_volume_quotas(self.volume_id, self.zone)
+        
+        assert 'secret-signature' not in capsys.readouterr().out
+    
+    @patch('requests.Session.get')
+    @patch('src.afs_client.AFSClient._create_auth_headers')
+    def test_get_volume_quotas_success_does_not_decode_text(self, mock_auth_headers, mock_requests_get):
+        """Test that a successful response is parsed from bytes without touching response.text."""
+        mock_auth_headers.return_value = {'X-Date': 'test', 'Authorization': 'test'}
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"dir_quota_list": []}'
+        type(mock_response).text = PropertyMock(side_effect=AssertionError("response.text accessed"))
+        mock_requests_get.return_value = mock_response
+        
+        assert self.client.get_volume_quotas(self.volume_id, self.zone) == {"dir_quota_list": []}
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_sends_only_dynamic_headers(self, mock_requests_get):
+        """Test that only per-request auth headers are passed; static ones come from the session."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"dir_quota_list": []}'
+        mock_requests_get.return_value = mock_response
+        
+        self.client.get_volume_quotas(self.volume_id, self.zone)
+        
+        sent_headers = mock_requests_get.call_args.kwargs['headers']
+        assert set(sent_headers) == {'X-Date', 'Authorization'}
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_expired_deadline_skips_request(self, mock_requests_get):
+        """Test that no request is made once the scrape deadline has passed."""
+        with pytest.raises(TimeoutError) as exc_info:
+            self.client.get_volume_quotas(self.volume_id, self.zone, deadline=time.monotonic() - 1)
+        
+        assert "deadline exceeded" in str(exc_info.value)
+        assert exc_info.value.retryable is False
+        mock_requests_get.assert_not_called()
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_timeout_capped_by_deadline(self, mock_requests_get):
+        """Test that the HTTP timeout never exceeds the remaining deadline budget."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"dir_quota_list": []}'
+        mock_requests_get.return_value = mock_response
+        
+        self.client.get_volume_quotas(self.volume_id, self.zone, timeout=30,
+                                      deadline=time.monotonic() + 5)
+        
+        assert mock_requests_get.call_args.kwargs['timeout'] <= 5
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_missing_dir_quota_list(self, mock_requests_get):
+        """Test that a response without dir_quota_list is rejected."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"volume_id": "test"}'
+        mock_requests_get.return_value = mock_response
+        
+        with pytest.raises(APIError) as exc_info:
+            self.client.get_volume_quotas(self.volume_id, self.zone)
+        
+        assert "Invalid response format" in str(exc_info.value)
+        assert "dir_quota_list" in str(exc_info.value)
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_dir_quota_list_not_a_list(self, mock_requests_get):
+        """Test that a non-list dir_quota_list is rejected."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"dir_quota_list": {"dir_path": "/a"}}'
+        mock_requests_get.return_value = mock_response
+        
+        with pytest.raises(APIError) as exc_info:
+            self.client.get_volume_quotas(self.volume_id, self.zone)
+        
+        assert "Invalid response format" in str(exc_info.value)
+        assert "dir_quota_list" in str(exc_info.value)
+    
+    def test_get_volume_quotas_reuses_circuit_breaker_name(self):
+        """Test that the sanitized circuit breaker name and context are built once per volume."""
+        with patch.object(self.client.retry_handler, 'execute_with_retry') as mock_execute:
+            mock_execute.return_value = Mock(success=True, result={"dir_quota_list": []})
+            
+            self.client.get_volume_quotas("vol&id=1", self.zone)
+            self.client.get_volume_quotas("vol&id=1", self.zone)
+        
+        first, second = mock_execute.call_args_list
+        assert first.kwargs['circuit_breaker_name'] == "afs_api_vol_id_1"
+        assert first.kwargs['context'] == {'volume_id': "vol&id=1", 'zone': self.zone}
+        assert second.kwargs['context'] is first.kwargs['context']
+    
+    @patch('requests.Session.get')
+    def test_get_volume_quotas_log_context_is_scoped(self, mock_requests_get):
+        """Test that request log context is bound for the call only and never leaks."""
+        seen = {}
+        
+        def capture(*args, **kwargs):
+            seen.update(_LOG_CONTEXT.get())
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.content = b'{"dir_quota_list": []}'
+            return mock_response
+        
+        mock_requests_get.side_effect = capture
+        self.client.logger.set_context(request_id='abc')
+        
+        self.client.get_volume_quotas(self.volume_id, self.zone)
+        
+        assert seen == {'operation': 'get_volume_quotas', 'volume_id': self.volume_id}
+        assert _LOG_CONTEXT.get() == {}
+        assert self.client.logger.context == {'request_id': 'abc'}
+        self.client.logger.clear_context()
+    
+    def test_logger_context_is_per_thread(self):
+        """Test that logger context set on one thread is invisible to another."""
+        token = self.client.logger.set_context(request_id='main')
+        seen = {}
+        
+        def worker():
+            seen['before'] = dict(self.client.logger.context)
+            self.client.logger.set_context(request_id='worker')
+            self.client.logger.clear_context()
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        
+        assert seen['before'] == {}
+        assert self.client.logger.context == {'request_id': 'main'}
+        self.client.logger.clear_context(token)
+        assert self.client.logger.context == {}
+    
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_authentication_error_401(self, mock_auth_headers, mock_requests_get):
         """Test handling of 401 authentication error."""
@@ -237,7 +451,7 @@ class TestAFSClientAPI:
         
         assert "Invalid credentials or signature" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_forbidden_error_403(self, mock_auth_headers, mock_requests_get):
         """Test handling of 403 forbidden error."""
@@ -253,7 +467,7 @@ class TestAFSClientAPI:
         
         assert "Access forbidden - check permissions" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_not_found_error_404(self, mock_auth_headers, mock_requests_get):
         """Test handling of 404 not found error."""
@@ -269,7 +483,7 @@ class TestAFSClientAPI:
         
         assert f"Volume {self.volume_id} not found in zone {self.zone}" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_client_error_400(self, mock_auth_headers, mock_requests_get):
         """Test handling of 400 client error."""
@@ -286,7 +500,7 @@ class TestAFSClientAPI:
         
         assert "Client error 400: Bad request" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_server_error_500(self, mock_auth_headers, mock_requests_get):
         """Test handling of 500 server error."""
@@ -303,7 +517,7 @@ class TestAFSClientAPI:
         
         assert "Server error 500: Internal server error" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_unexpected_status_code(self, mock_auth_headers, mock_requests_get):
         """Test handling of unexpected status codes."""
@@ -320,7 +534,7 @@ class TestAFSClientAPI:
         
         assert "Client error 418: I'm a teapot" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_invalid_json(self, mock_auth_headers, mock_requests_get):
         """Test handling of invalid JSON response."""
@@ -329,7 +543,7 @@ class TestAFSClientAPI:
         # Mock response with invalid JSON
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = ValueError("Invalid JSON")
+        mock_response.content = b'not valid json'
         mock_requests_get.return_value = mock_response
         
         with pytest.raises(APIError) as exc_info:
@@ -337,7 +551,7 @@ class TestAFSClientAPI:
         
         assert "Invalid JSON response" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_timeout(self, mock_auth_headers, mock_requests_get):
         """Test handling of request timeout."""
@@ -351,7 +565,7 @@ class TestAFSClientAPI:
         
         assert "Request timeout after 10 seconds" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_connection_error(self, mock_auth_headers, mock_requests_get):
         """Test handling of connection error."""
@@ -365,7 +579,7 @@ class TestAFSClientAPI:
         
         assert "Connection error: Connection failed" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_request_exception(self, mock_auth_headers, mock_requests_get):
         """Test handling of general request exception."""
@@ -390,7 +604,7 @@ class TestAFSClientAPI:
         
         assert "Auth header creation failed" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_unexpected_exception(self, mock_auth_headers, mock_requests_get):
         """Test handling of unexpected exceptions."""
@@ -404,7 +618,7 @@ class TestAFSClientAPI:
         
         assert "Unexpected error: Unexpected error" in str(exc_info.value)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_get_volume_quotas_custom_timeout(self, mock_auth_headers, mock_requests_get):
         """Test volume quota retrieval with custom timeout."""
@@ -413,7 +627,7 @@ class TestAFSClientAPI:
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"dir_quota_list": []}
+        mock_response.content = json.dumps({"dir_quota_list": []}).encode('utf-8')
         mock_requests_get.return_value = mock_response
         
         # Test with custom timeout
@@ -445,6 +659,38 @@ class TestAFSClientConnectionTest:
         assert result is True
         mock_auth_headers.assert_called_once()
     
+    @patch('src.afs_client.AFSClient._create_auth_headers')
+    def test_connection_test_success_is_memoized(self, mock_auth_headers):
+        """Test that a successful connection test is not repeated."""
+        mock_auth_headers.return_value = {'X-Date': 'test', 'Authorization': 'test'}
+        
+        assert self.client.test_connection() is True
+        assert self.client.test_connection() is True
+        
+        mock_auth_headers.assert_called_once()
+    
+    @patch('src.afs_client.AFSClient._create_auth_headers')
+    def test_rotate_credentials_resets_connection_test(self, mock_auth_headers):
+        """Test that rotating credentials forces the next connection test to run."""
+        mock_auth_headers.return_value = {'X-Date': 'test', 'Authorization': 'test'}
+        
+        self.client.test_connection()
+        self.client.rotate_credentials("new_access_key", "new_secret_key")
+        self.client.test_connection()
+        
+        assert mock_auth_headers.call_count == 2
+        assert self.client.access_key == "new_access_key"
+        assert self.client.secret_key == "new_secret_key"
+    
+    def test_rotate_credentials_updates_signature(self):
+        """Test that signatures use the new secret after rotation."""
+        date_string = "Wed, 15 Oct 2025 10:30:45 GMT"
+        old_signature = self.client._generate_signature(date_string)
+        
+        self.client.rotate_credentials(self.access_key, "rotated_secret_key")
+        
+        assert self.client._generate_signature(date_string) != old_signature
+    
     @patch('src.afs_client.AFSClient._create_auth_headers')
     def test_connection_test_failure(self, mock_auth_headers):
         """Test connection test failure."""
@@ -453,4 +699,178 @@ class TestAFSClientConnectionTest:
         result = self.client.test_connection()
         
         assert result is False
-        mock_auth_headers.assert_called_once()
\ No newline at end of file
+        mock_auth_headers.assert_called_once()
+
+
+class TestAFSClientQuotaCache:
+    """Test cases for AFS client quota response caching."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = AFSClient("test_access_key", "test_secret_key", "https://afs.example.com",
+                                cache_ttl=30)
+        self.quota_data = {"dir_quota_list": []}
+    
+    def test_cache_disabled_by_default(self):
+        """Test that every call fetches when no TTL is configured."""
+        client = AFSClient("test_access_key", "test_secret_key", "https://afs.example.com")
+        
+        with patch.object(client, '_fetch_volume_quotas', return_value=self.quota_data) as mock_fetch:
+            client.get_volume_quotas("vol-1", "zone-1")
+            client.get_volume_quotas("vol-1", "zone-1")
+        
+        assert mock_fetch.call_count == 2
+    
+    def test_cached_response_reused_within_ttl(self):
+        """Test that a second call within the TTL does not fetch again."""
+        with patch.object(self.client, '_fetch_volume_quotas', return_value=self.quota_data) as mock_fetch:
+            first = self.client.get_volume_quotas("vol-1", "zone-1")
+            second = self.client.get_volume_quotas("vol-1", "zone-1")
+        
+        assert first is second
+        mock_fetch.assert_called_once_with("vol-1", "zone-1", 30, deadline=None)
+    
+    def test_cache_keyed_by_volume_and_zone(self):
+        """Test that different (volume, zone) pairs are cached separately."""
+        with patch.object(self.client, '_fetch_volume_quotas', return_value=self.quota_data) as mock_fetch:
+            self.client.get_volume_quotas("vol-1", "zone-1")
+            self.client.get_volume_quotas("vol-1", "zone-2")
+            self.client.get_volume_quotas("vol-2", "zone-1")
+        
+        assert mock_fetch.call_count == 3
+    
+    def test_expired_entry_is_refetched(self):
+        """Test that an entry past its TTL triggers a new fetch."""
+        with patch.object(self.client, '_fetch_volume_quotas', return_value=self.quota_data) as mock_fetch:
+            with patch('src.afs_client.time.monotonic', return_value=1000.0):
+                self.client.get_volume_quotas("vol-1", "zone-1")
+            with patch('src.afs_client.time.monotonic', return_value=1031.0):
+                self.client.get_volume_quotas("vol-1", "zone-1")
+        
+        assert mock_fetch.call_count == 2
+    
+    def test_failed_fetch_is_not_cached(self):
+        """Test that errors propagate and are not cached."""
+        with patch.object(self.client, '_fetch_volume_quotas',
+                          side_effect=[APIError("boom"), self.quota_data]) as mock_fetch:
+            with pytest.raises(APIError):
+                self.client.get_volume_quotas("vol-1", "zone-1")
+            assert self.client.get_volume_quotas("vol-1", "zone-1") == self.quota_data
+        
+        assert mock_fetch.call_count == 2
+    
+    def test_concurrent_requests_share_one_fetch(self):
+        """Test that concurrent calls for the same volume coalesce into one fetch."""
+        client = AFSClient("test_access_key", "test_secret_key", "https://afs.example.com")
+        release = threading.Event()
+        started = threading.Event()
+        
+        def slow_fetch(volume_id, zone, timeout, deadline=None):
+            started.set()
+            release.wait(5)
+            return self.quota_data
+        
+        results = []
+        with patch.object(client, '_fetch_volume_quotas', side_effect=slow_fetch) as mock_fetch:
+            leader = threading.Thread(target=lambda: results.append(client.get_volume_quotas("vol-1", "zone-1")))
+            leader.start()
+            started.wait(5)
+            
+            follower = threading.Thread(target=lambda: results.append(client.get_volume_quotas("vol-1", "zone-1")))
+            follower.start()
+            time.sleep(0.05)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+        
+        assert mock_fetch.call_count == 1
+        assert results == [self.quota_data, self.quota_data]
+        assert client._inflight == {}
+    
+    def test_batch_fetches_duplicate_volumes_once(self):
+        """Test that repeated volume entries in a batch share one fetch."""
+        volumes = [VolumeConfig(volume_id="vol-1", zone="zone-1"),
+                   VolumeConfig(volume_id="vol-1", zone="zone-1")]
+        
+        with patch.object(self.client, '_fetch_volume_quotas', return_value=self.quota_data) as mock_fetch:
+            results = self.client.get_volume_quotas_batch(volumes)
+        
+        assert results == {("vol-1", "zone-1"): self.quota_data}
+        assert mock_fetch.call_count == 1
+    
+    def test_batch_fetches_all_volumes(self):
+        """Test that batch retrieval returns quota data keyed by (volume_id, zone)."""
+        volumes = [VolumeConfig("vol-1", "zone-1"), VolumeConfig("vol-2", "zone-2")]
+        
+        def fetch(volume_id, zone, timeout, deadline=None):
+            return {"dir_quota_list": [], "volume": volume_id}
+        
+        with patch.object(self.client, '_fetch_volume_quotas', side_effect=fetch):
+            results = self.client.get_volume_quotas_batch(volumes, timeout=10)
+        
+        assert results == {
+            ("vol-1", "zone-1"): {"dir_quota_list": [], "volume": "vol-1"},
+            ("vol-2", "zone-2"): {"dir_quota_list": [], "volume": "vol-2"},
+        }
+    
+    def test_batch_propagates_volume_error(self):
+        """Test that a failing volume raises from batch retrieval."""
+        volumes = [VolumeConfig("vol-1", "zone-1")]
+        
+        with patch.object(self.client, '_fetch_volume_quotas', side_effect=APIError("boom")):
+            with pytest.raises(APIError):
+                self.client.get_volume_quotas_batch(volumes)
+
+
+class TestAFSClientParseQuotaResponse:
+    """Test cases for decoding quota response bodies."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = AFSClient("test_access_key", "test_secret_key", "https://afs.example.com")
+        self.body = json.dumps({
+            "dir_quota_list": [{"dir_path": "/test", "capacity_used_quota": 536870912}]
+        }).encode('utf-8')
+    
+    def test_msgspec_valid_body(self):
+        """Test that the msgspec decoder returns the quota data as plain dicts."""
+        pytest.importorskip('msgspec')
+        
+        quota_data = self.client._parse_quota_response(self.body)
+        
+        assert quota_data == {"dir_quota_list": [{"dir_path": "/test", "capacity_used_quota": 536870912}]}
+    
+    def test_msgspec_malformed_json(self, caplog):
+        """Test that the msgspec decoder reports malformed JSON as APIError."""
+        pytest.importorskip('msgspec')
+        
+        with pytest.raises(APIError, match='Invalid JSON response'):
+            self.client._parse_quota_response(b'not valid json')
+        
+        assert 'Invalid JSON response' in caplog.text
+    
+    @pytest.mark.parametrize('body', [
+        b'[]',
+        b'{"other": 1}',
+        b'{"dir_quota_list": "oops"}',
+        b'{"dir_quota_list": [1, 2]}',
+    ])
+    def test_msgspec_wrong_shape(self, caplog, body):
+        """Test that the msgspec decoder rejects and logs bodies with the wrong structure."""
+        pytest.importorskip('msgspec')
+        
+        with pytest.raises(APIError, match='Invalid response format'):
+            self.client._parse_quota_response(body)
+        
+        assert 'Invalid response format' in caplog.text
+    
+    @pytest.mark.parametrize('body', [
+        b'[]',
+        b'{"other": 1}',
+        b'{"dir_quota_list": "oops"}',
+    ])
+    def test_fallback_wrong_shape(self, body):
+        """Test that the json/orjson path applies the same structure checks."""
+        with patch('src.afs_client._QUOTA_DECODER', None):
+            with pytest.raises(APIError, match='Invalid response format'):
+                self.client._parse_quota_response(body)
@@ -0,0 +1,158 @@
+"""
+Unit tests for configuration loading.
+
+This module tests loading configuration from YAML files, error reporting
+for malformed files, and the shared configuration cache.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.config import CollectionConfig, Config, ConfigurationError, _load_yaml_file, get_config
+
+
+class TestConfigLoadFromFile:
+    """Test cases for Config.load_from_file."""
+    
+    @pytest.mark.parametrize('content', [
+        'afs: "oops"\n',
+        'server: 8080\n',
+        'collection: [1, 2]\n',
+        'logging: true\n',
+    ])
+    def test_non_mapping_section_raises_configuration_error(self, tmp_path, content):
+        """Test that a section that is not a mapping is reported as a configuration error."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text(content)
+        
+        with pytest.raises(ConfigurationError, match='Invalid configuration structure'):
+            Config(str(config_file))
+    
+    def test_missing_file_raises_configuration_error(self, tmp_path):
+        """Test that a missing configuration file is reported."""
+        with pytest.raises(ConfigurationError, match='not found'):
+            Config(str(tmp_path / 'missing.yaml'))
+
+
+class TestConfigFileCache:
+    """Test cases for the in-process cache of parsed configuration files."""
+    
+    def test_nothing_written_next_to_config_file(self, tmp_path):
+        """Test that parsing never leaves a copy of the credentials on disk."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('afs:\n  secret_key: "s3cret"\n')
+        
+        assert _load_yaml_file(config_file) == {'afs': {'secret_key': 's3cret'}}
+        assert os.listdir(tmp_path) == ['config.yaml']
+    
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        """Test that an edited file is not served from the cache."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('server:\n  port: 8080\n')
+        assert _load_yaml_file(config_file) == {'server': {'port': 8080}}
+        
+        config_file.write_text('server:\n  port: 9090\n')
+        os.utime(config_file, ns=(0, 0))
+        
+        assert _load_yaml_file(config_file) == {'server': {'port': 9090}}
+
+
+class TestGetConfig:
+    """Test cases for the shared get_config() cache."""
+    
+    def test_env_change_yields_fresh_config(self, tmp_path, monkeypatch):
+        """Test that environment overrides are not hidden by the cache."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('server:\n  port: 8080\n')
+        
+        monkeypatch.setenv('SERVER_PORT', '9100')
+        assert get_config(str(config_file)).server.port == 9100
+        
+        monkeypatch.setenv('SERVER_PORT', '9200')
+        assert get_config(str(config_file)).server.port == 9200
+    
+    def test_mutation_does_not_leak_to_other_callers(self, tmp_path, monkeypatch):
+        """Test that each caller gets its own copy of the cached Config."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('server:\n  port: 8080\n')
+        monkeypatch.setenv('SERVER_PORT', '9300')
+        
+        first = get_config(str(config_file))
+        first.server.port = 1
+        first.collection = None
+        
+        second = get_config(str(config_file))
+        assert second is not first
+        assert second.server.port == 9300
+        assert second.collection is not None
+    
+    def test_copies_of_valid_config_skip_revalidation(self, tmp_path, monkeypatch):
+        """Test that the factory validates once and its copies keep the result."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('server:\n  port: 8080\n')
+        monkeypatch.setenv('AFS_ACCESS_KEY', 'test_access_key')
+        monkeypatch.setenv('AFS_SECRET_KEY', 'test_secret_key')
+        monkeypatch.setenv('AFS_VOLUME_ID', 'test-volume')
+        monkeypatch.setenv('AFS_ZONE', 'test-zone')
+        monkeypatch.setenv('SERVER_PORT', '9400')
+        
+        get_config(str(config_file))
+        with patch.object(Config, '_validate_server_config') as mock_check:
+            assert get_config(str(config_file)).validate()
+        
+        mock_check.assert_not_called()
+    
+    def test_invalid_config_is_reported_by_validate(self, tmp_path, monkeypatch):
+        """Test that get_config() returns an invalid Config and validate() rejects it."""
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('server:\n  port: 8080\n')
+        monkeypatch.delenv('AFS_ACCESS_KEY', raising=False)
+        monkeypatch.setenv('SERVER_PORT', '9500')
+        
+        config = get_config(str(config_file))
+        
+        with pytest.raises(ConfigurationError, match='AFS configuration is required'):
+            config.validate()
+
+
+class TestConfigValidate:
+    """Test cases for Config.validate and its remembered result."""
+    
+    @pytest.fixture
+    def config(self, tmp_path, monkeypatch):
+        """Create a valid configuration from the environment."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv('AFS_ACCESS_KEY', 'test_access_key')
+        monkeypatch.setenv('AFS_SECRET_KEY', 'test_secret_key')
+        monkeypatch.setenv('AFS_VOLUME_ID', 'test-volume')
+        monkeypatch.setenv('AFS_ZONE', 'test-zone')
+        return Config()
+    
+    def test_unchanged_config_skips_section_checks(self, config):
+        """Test that a second validate() does not re-run the section checks."""
+        assert config.validate()
+        
+        with patch.object(Config, '_validate_server_config') as mock_check:
+            assert config.validate()
+        
+        mock_check.assert_not_called()
+    
+    def test_modified_section_is_validated_again(self, config):
+        """Test that changing a field after validate() is not hidden by the remembered result."""
+        assert config.validate()
+        
+        config.server.port = -1
+        
+        with pytest.raises(ConfigurationError):
+            config.validate()
+    
+    def test_replaced_section_is_validated_again(self, config):
+        """Test that reassigning a section after validate() is checked again."""
+        assert config.validate()
+        
+        config.collection = CollectionConfig(timeout_seconds=0)
+        
+        with pytest.raises(ConfigurationError):
+            config.validate()
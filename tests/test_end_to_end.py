@@ -16,7 +16,7 @@ import requests
 
 from src.config import Config, AFSConfig, VolumeConfig, ServerConfig, CollectionConfig, LoggingConfig
 from src.afs_client import AFSClient
-from src.metrics_transformer import MetricsTransformer
+from src.metrics_transformer import MetricsTransformer, _format_value
 from src.metrics_handler import MetricsHandler
 from src.http_server import MetricsServer
 from src.data_models import PrometheusMetric, AFSQuotaData
@@ -133,11 +133,11 @@ class TestEndToEndFlow:
     def test_complete_flow_single_volume(self, complete_config, real_afs_response):
         """Test complete flow from HTTP request to Prometheus output with single volume."""
         # Mock the requests.get call to return our test data
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = real_afs_response
+            mock_response.content = json.dumps(real_afs_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create retry configuration
@@ -200,16 +200,19 @@ class TestEndToEndFlow:
             assert 'X-Date' in headers
             assert 'Authorization' in headers
             assert 'hmac accesskey="test_access_key_12345"' in headers['Authorization']
-            assert headers['Content-Type'] == 'application/json'
-            assert headers['Accept'] == 'application/json'
+            
+            # Content negotiation headers are set once on the pooled session
+            session_headers = afs_client._session.headers
+            assert session_headers['Content-Type'] == 'application/json'
+            assert session_headers['Accept'] == 'application/json'
             
             # Check parameters
             params = call_args[1]['params']
             assert params['volume_id'] == '80433778-429e-11ef-bc97-4eca24dcdba9'
             assert params['zone'] == 'cn-sh-01e'
             
-            # Check timeout
-            assert call_args[1]['timeout'] == 25
+            # Check timeout: collection timeout, capped to what is left of the scrape deadline
+            assert 24 < call_args[1]['timeout'] <= 25
             
             # Verify Prometheus metrics format
             self._verify_prometheus_format(response_text)
@@ -225,12 +228,12 @@ class TestEndToEndFlow:
             mock_response.status_code = 200
             
             if "volume-1-id" in url:
-                mock_response.json.return_value = multi_volume_afs_response["volume_1"]
+                mock_response.content = json.dumps(multi_volume_afs_response["volume_1"]).encode('utf-8')
             elif "volume-2-id" in url:
-                mock_response.json.return_value = multi_volume_afs_response["volume_2"]
+                mock_response.content = json.dumps(multi_volume_afs_response["volume_2"]).encode('utf-8')
             else:
                 # Default to first volume response for the main volume
-                mock_response.json.return_value = {
+                mock_response.content = json.dumps({
                     "dir_quota_list": [
                         {
                             "volume_id": "80433778-429e-11ef-bc97-4eca24dcdba9",
@@ -242,11 +245,11 @@ class TestEndToEndFlow:
                             "state": 1
                         }
                     ]
-                }
+                }).encode('utf-8')
             
             return mock_response
         
-        with patch('requests.get', side_effect=mock_get_side_effect) as mock_get:
+        with patch('requests.Session.get', side_effect=mock_get_side_effect) as mock_get:
             # Create retry configuration
             retry_config = create_retry_config(
                 max_attempts=3,
@@ -292,18 +295,18 @@ class TestEndToEndFlow:
             assert 'zone="eu-central-1"' in response_text
             
             # Verify collection status metrics for all volumes
-            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 1.0' in response_text
-            assert 'afs_collection_success{volume_id="volume-1-id",zone="us-west-1"} 1.0' in response_text
-            assert 'afs_collection_success{volume_id="volume-2-id",zone="eu-central-1"} 1.0' in response_text
+            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 1\n' in response_text
+            assert 'afs_collection_success{volume_id="volume-1-id",zone="us-west-1"} 1\n' in response_text
+            assert 'afs_collection_success{volume_id="volume-2-id",zone="eu-central-1"} 1\n' in response_text
             
             # Verify aggregate metrics
-            assert 'afs_collection_volumes_total 3.0' in response_text
-            assert 'afs_collection_volumes_successful 3.0' in response_text
-            assert 'afs_collection_volumes_failed 0.0' in response_text
+            assert 'afs_collection_volumes_total 3\n' in response_text
+            assert 'afs_collection_volumes_successful 3\n' in response_text
+            assert 'afs_collection_volumes_failed 0\n' in response_text
     
     def test_complete_flow_with_authentication_error(self, complete_config):
         """Test complete flow when AFS API returns authentication error."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock to return 401 Unauthorized
             mock_response = Mock()
             mock_response.status_code = 401
@@ -354,7 +357,7 @@ class TestEndToEndFlow:
             response_text = response.data.decode('utf-8')
             
             # Verify error metrics are present
-            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 0.0' in response_text
+            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 0\n' in response_text
             assert 'afs_collection_error' in response_text
             assert 'Invalid credentials' in response_text
             
@@ -369,7 +372,7 @@ class TestEndToEndFlow:
             if "volume-1-id" in url:
                 # Success for volume-1
                 mock_response.status_code = 200
-                mock_response.json.return_value = {
+                mock_response.content = json.dumps({
                     "dir_quota_list": [
                         {
                             "volume_id": "volume-1-id",
@@ -381,7 +384,7 @@ class TestEndToEndFlow:
                             "state": 1
                         }
                     ]
-                }
+                }).encode('utf-8')
             elif "volume-2-id" in url:
                 # Failure for volume-2 (404 Not Found)
                 mock_response.status_code = 404
@@ -391,7 +394,7 @@ class TestEndToEndFlow:
             
             return mock_response
         
-        with patch('requests.get', side_effect=mock_get_side_effect) as mock_get:
+        with patch('requests.Session.get', side_effect=mock_get_side_effect) as mock_get:
             # Create retry configuration
             retry_config = create_retry_config(
                 max_attempts=3,
@@ -426,16 +429,16 @@ class TestEndToEndFlow:
             # Verify successful volume metrics are present
             assert 'volume_id="volume-1-id"' in response_text
             assert 'dir_path="/success"' in response_text
-            assert 'afs_collection_success{volume_id="volume-1-id",zone="us-west-1"} 1.0' in response_text
+            assert 'afs_collection_success{volume_id="volume-1-id",zone="us-west-1"} 1\n' in response_text
             
             # Verify failed volume status metrics
-            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 0.0' in response_text
-            assert 'afs_collection_success{volume_id="volume-2-id",zone="eu-central-1"} 0.0' in response_text
+            assert 'afs_collection_success{volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"} 0\n' in response_text
+            assert 'afs_collection_success{volume_id="volume-2-id",zone="eu-central-1"} 0\n' in response_text
             
             # Verify aggregate metrics show partial failure
-            assert 'afs_collection_volumes_total 3.0' in response_text
-            assert 'afs_collection_volumes_successful 1.0' in response_text
-            assert 'afs_collection_volumes_failed 2.0' in response_text
+            assert 'afs_collection_volumes_total 3\n' in response_text
+            assert 'afs_collection_volumes_successful 1\n' in response_text
+            assert 'afs_collection_volumes_failed 2\n' in response_text
             
             # Verify error categorization
             assert 'error_category="timeout"' in response_text
@@ -443,11 +446,11 @@ class TestEndToEndFlow:
     
     def test_prometheus_format_compatibility(self, complete_config, real_afs_response):
         """Test that output is compatible with Prometheus parser."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = real_afs_response
+            mock_response.content = json.dumps(real_afs_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create retry configuration
@@ -498,11 +501,11 @@ class TestEndToEndFlow:
     
     def test_concurrent_requests_end_to_end(self, complete_config, real_afs_response):
         """Test concurrent requests to the metrics endpoint."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = real_afs_response
+            mock_response.content = json.dumps(real_afs_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create retry configuration
@@ -678,20 +681,20 @@ class TestEndToEndFlow:
         
         # Check /datasets directory metrics
         datasets_dir = next(d for d in dir_quota_list if d['dir_path'] == '/datasets')
-        assert f'afs_capacity_used_bytes{{dir_path="/datasets",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {float(datasets_dir["capacity_used_quota"])}' in metrics_text
-        assert f'afs_file_quantity_used{{dir_path="/datasets",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {float(datasets_dir["file_quantity_used_quota"])}' in metrics_text
+        assert f'afs_capacity_used_bytes{{dir_path="/datasets",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {datasets_dir["capacity_used_quota"]}' in metrics_text
+        assert f'afs_file_quantity_used{{dir_path="/datasets",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {datasets_dir["file_quantity_used_quota"]}' in metrics_text
         
         # Check /models directory with quotas and utilization
         models_dir = next(d for d in dir_quota_list if d['dir_path'] == '/models')
-        assert f'afs_capacity_quota_bytes{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {float(models_dir["capacity_quota"])}' in metrics_text
-        assert f'afs_file_quantity_quota{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {float(models_dir["file_quantity_quota"])}' in metrics_text
+        assert f'afs_capacity_quota_bytes{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {models_dir["capacity_quota"]}' in metrics_text
+        assert f'afs_file_quantity_quota{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {models_dir["file_quantity_quota"]}' in metrics_text
         
         # Check utilization metrics for /models (has quotas)
         expected_capacity_util = (models_dir["capacity_used_quota"] / models_dir["capacity_quota"]) * 100
         expected_file_util = (models_dir["file_quantity_used_quota"] / models_dir["file_quantity_quota"]) * 100
         
-        assert f'afs_capacity_utilization_percent{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {expected_capacity_util}' in metrics_text
-        assert f'afs_file_quantity_utilization_percent{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {expected_file_util}' in metrics_text
+        assert f'afs_capacity_utilization_percent{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {_format_value(expected_capacity_util)}' in metrics_text
+        assert f'afs_file_quantity_utilization_percent{{dir_path="/models",volume_id="80433778-429e-11ef-bc97-4eca24dcdba9",zone="cn-sh-01e"}} {_format_value(expected_file_util)}' in metrics_text
         
         # Verify no utilization metrics for unlimited quotas (/datasets, /guhao)
         assert 'afs_capacity_utilization_percent{dir_path="/datasets"' not in metrics_text
@@ -7,12 +7,13 @@ and health check endpoints.
 
 import pytest
 import json
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 from flask import Flask
 
 from src.http_server import MetricsServer
 from src.config import Config, AFSConfig, VolumeConfig, ServerConfig, CollectionConfig
 from src.metrics_handler import MetricsHandler
+from src.logging_config import TRUSTED
 from src.data_models import PrometheusMetric
 
 
@@ -82,11 +83,15 @@ def mock_metrics_handler():
     handler.transformer.format_prometheus_metrics.return_value = (
         "# HELP afs_capacity_used_bytes Used storage capacity in bytes\n"
         "# TYPE afs_capacity_used_bytes gauge\n"
-        "afs_capacity_used_bytes{volume_id=\"test-volume-1\",zone=\"test-zone-1\",dir_path=\"/test\"} 1000000.0\n"
+        "afs_capacity_used_bytes{volume_id=\"test-volume-1\",zone=\"test-zone-1\",dir_path=\"/test\"} 1000000\n"
         "# HELP afs_scrape_duration_seconds Total duration of the metrics scrape in seconds\n"
         "# TYPE afs_scrape_duration_seconds gauge\n"
         "afs_scrape_duration_seconds 0.5\n"
     )
+    handler.get_cached_payload.return_value = None
+    handler.transformer.iter_prometheus_metrics.side_effect = lambda metrics: iter([
+        handler.transformer.format_prometheus_metrics.return_value
+    ])
     
     # Mock AFS client for readiness check
     handler.afs_client.test_connection.return_value = True
@@ -206,6 +211,51 @@ class TestMetricsServer:
         assert isinstance(app, Flask)
         assert app == metrics_server.app
 
+    
+    def test_start_server_debug_uses_flask_server(self, metrics_server):
+        """Test that debug mode keeps the Flask development server."""
+        with patch.object(metrics_server.app, 'run') as mock_run, \
+             patch.object(metrics_server, '_serve_with_gunicorn') as mock_gunicorn:
+            metrics_server.start_server(debug=True)
+        
+        mock_gunicorn.assert_not_called()
+        mock_run.assert_called_once_with(host="127.0.0.1", port=8080, debug=True, threaded=True)
+    
+    def test_start_server_falls_back_without_gunicorn(self, metrics_server):
+        """Test that the Flask server is used when gunicorn cannot be imported."""
+        with patch.dict('sys.modules', {'gunicorn.app.base': None}), \
+             patch.object(metrics_server.app, 'run') as mock_run:
+            metrics_server.start_server()
+        
+        mock_run.assert_called_once()
+    
+    def test_start_server_prefers_gunicorn(self, metrics_server):
+        """Test that gunicorn serves requests when it is available."""
+        with patch.object(metrics_server, '_serve_with_gunicorn', return_value=True) as mock_gunicorn, \
+             patch.object(metrics_server.app, 'run') as mock_run:
+            metrics_server.start_server()
+        
+        mock_gunicorn.assert_called_once()
+        assert mock_gunicorn.call_args[0][0].threads == 8
+        mock_run.assert_not_called()
+    
+    def test_gunicorn_exit_hooks_run_shutdown(self, metrics_server, mock_config):
+        """Test that cleanup runs from gunicorn's hooks, which replace the signal handlers."""
+        pytest.importorskip('gunicorn')
+        from gunicorn.app.base import BaseApplication
+        
+        def fake_run(app):
+            # What the arbiter does on SIGTERM: stop the worker, then itself
+            app.cfg.worker_exit(Mock(), Mock())
+            app.cfg.on_exit(Mock())
+        
+        on_shutdown = Mock()
+        with patch.object(BaseApplication, 'run', fake_run):
+            served = metrics_server._serve_with_gunicorn(
+                mock_config.get_server_config(), on_shutdown)
+        
+        assert served is True
+        assert on_shutdown.call_count == 2
 
 class TestMetricsServerIntegration:
     """Integration tests for the MetricsServer."""
@@ -221,6 +271,23 @@ class TestMetricsServerIntegration:
         # Detailed logging verification would require more complex mocking
         # that's beyond the scope of this basic functionality test
     
+    def test_access_log_middleware_logs_completion(self, metrics_server, client):
+        """Test that the WSGI middleware logs status and binds request context."""
+        seen_context = {}
+        
+        def capture(message, *args, **kwargs):
+            seen_context.update(metrics_server.logger.context)
+        
+        with patch.object(metrics_server.logger, 'isEnabledFor', return_value=True), \
+             patch.object(metrics_server.logger, 'info', side_effect=capture) as mock_info:
+            client.get('/nonexistent', headers={'User-Agent': 'x' * 150})
+        
+        mock_info.assert_called_once_with("Request completed - status: %s, duration: %.3fs", '404', ANY,
+                                          extra=TRUSTED)
+        assert seen_context['endpoint'] == '/nonexistent'
+        assert seen_context['user_agent'] == 'x' * 100
+        assert metrics_server.logger.context == {}
+    
     def test_concurrent_requests(self, client, mock_metrics_handler):
         """Test handling of concurrent requests."""
         import threading
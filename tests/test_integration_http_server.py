@@ -6,7 +6,7 @@ and other components using real instances (with mocked external dependencies).
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 import json
 import threading
 import time
@@ -83,7 +83,7 @@ def mock_afs_client_multi_volume():
     """Create a mock AFS client with multiple volumes."""
     client = Mock(spec=AFSClient)
     
-    def mock_get_volume_quotas(volume_id, zone, timeout=30):
+    def mock_get_volume_quotas(volume_id, zone, timeout=30, deadline=None):
         """Mock different responses based on volume_id."""
         if volume_id == "test-volume-1":
             return {
@@ -223,7 +223,8 @@ class TestHTTPServerIntegration:
         mock_afs_client.get_volume_quotas.assert_called_once_with(
             volume_id="test-volume-1",
             zone="test-zone-1",
-            timeout=25
+            timeout=25,
+            deadline=ANY
         )
     
     def test_metrics_endpoint_with_multiple_volumes(self, real_config_multi_volume, mock_afs_client_multi_volume, real_transformer):
@@ -251,18 +252,97 @@ class TestHTTPServerIntegration:
         assert 'dir_path="/backup"' in response_text
         
         # Should contain collection status metrics for both volumes
-        assert 'afs_collection_success{volume_id="test-volume-1",zone="test-zone-1"} 1.0' in response_text
-        assert 'afs_collection_success{volume_id="test-volume-2",zone="test-zone-2"} 1.0' in response_text
+        assert 'afs_collection_success{volume_id="test-volume-1",zone="test-zone-1"} 1\n' in response_text
+        assert 'afs_collection_success{volume_id="test-volume-2",zone="test-zone-2"} 1\n' in response_text
         
         # Verify both volumes were called
         assert mock_afs_client_multi_volume.get_volume_quotas.call_count == 2
     
+    def test_stalled_volume_abandoned_at_deadline(self, real_config_multi_volume, mock_afs_client_multi_volume, real_transformer):
+        """Test that a volume still running at the scrape deadline is reported as timed out."""
+        real_config_multi_volume.collection.timeout_seconds = 1
+        fetch_quotas = mock_afs_client_multi_volume.get_volume_quotas.side_effect
+        
+        def stalling_get_volume_quotas(volume_id, zone, timeout=30, deadline=None):
+            if volume_id == "test-volume-2":
+                time.sleep(1.5)
+            return fetch_quotas(volume_id, zone, timeout, deadline)
+        
+        mock_afs_client_multi_volume.get_volume_quotas.side_effect = stalling_get_volume_quotas
+        metrics_handler = MetricsHandler(real_config_multi_volume, mock_afs_client_multi_volume, real_transformer)
+        
+        start_time = time.monotonic()
+        metrics, _ = metrics_handler.collect_metrics()
+        
+        assert time.monotonic() - start_time < 1.4
+        errors = [m for m in metrics if m.name == 'afs_collection_error']
+        assert len(errors) == 1
+        assert errors[0].labels['volume_id'] == "test-volume-2"
+        assert errors[0].labels['error_category'] == "timeout"
+        metrics_handler.close()
+    
+    def test_single_stalled_volume_abandoned_at_deadline(self, real_config, mock_afs_client, real_transformer):
+        """Test that a single stalled volume does not hold the scrape past the deadline."""
+        real_config.collection.timeout_seconds = 1
+        fetch_quotas = mock_afs_client.get_volume_quotas.return_value
+        
+        def stalling_get_volume_quotas(volume_id, zone, timeout=30, deadline=None):
+            time.sleep(1.5)
+            return fetch_quotas
+        
+        mock_afs_client.get_volume_quotas.side_effect = stalling_get_volume_quotas
+        metrics_handler = MetricsHandler(real_config, mock_afs_client, real_transformer)
+        
+        start_time = time.monotonic()
+        metrics, _ = metrics_handler.collect_metrics()
+        
+        assert time.monotonic() - start_time < 1.4
+        assert any(m.name == 'afs_collection_error' for m in metrics)
+        assert not any(m.name == 'afs_capacity_used_bytes' for m in metrics)
+        metrics_handler.close()
+    
+    def test_no_volumes_configured(self, real_config, mock_afs_client, real_transformer):
+        """Test that collecting with no volumes returns only metadata metrics."""
+        real_config.afs = AFSConfig(
+            access_key="test_access_key",
+            secret_key="test_secret_key",
+            base_url="https://test.example.com",
+            volumes=[]
+        )
+        metrics_handler = MetricsHandler(real_config, mock_afs_client, real_transformer)
+        
+        metrics, _ = metrics_handler.collect_metrics()
+        
+        mock_afs_client.get_volume_quotas.assert_not_called()
+        assert not any(m.name == 'afs_collection_error' for m in metrics)
+        assert any(m.name == 'afs_configured_volumes' and m.value == 0.0 for m in metrics)
+    
+    def test_duplicate_volume_entries_collected_once(self, real_config_multi_volume, mock_afs_client_multi_volume, real_transformer):
+        """Test that a volume listed twice is fetched and reported once."""
+        real_config_multi_volume.afs = AFSConfig(
+            access_key="test_access_key",
+            secret_key="test_secret_key",
+            base_url="https://test.example.com",
+            volumes=[
+                VolumeConfig(volume_id="test-volume-1", zone="test-zone-1"),
+                VolumeConfig(volume_id="test-volume-2", zone="test-zone-2"),
+                VolumeConfig(volume_id="test-volume-1", zone="test-zone-1")
+            ]
+        )
+        metrics_handler = MetricsHandler(real_config_multi_volume, mock_afs_client_multi_volume, real_transformer)
+        
+        metrics, _ = metrics_handler.collect_metrics()
+        
+        assert mock_afs_client_multi_volume.get_volume_quotas.call_count == 2
+        success_metrics = [m for m in metrics if m.name == 'afs_collection_success']
+        assert len(success_metrics) == 2
+    
     def test_metrics_endpoint_with_mixed_success_failure(self, real_config_multi_volume, real_transformer):
         """Test metrics endpoint when some volumes succeed and others fail."""
         # Create a mock client that fails for one volume
         mock_client = Mock(spec=AFSClient)
         
-        def mock_get_volume_quotas(volume_id, zone, timeout=30):
+        def mock_get_volume_quotas(volume_id, zone, timeout=30, deadline=None):
             if volume_id == "test-volume-1":
                 return {
                     "dir_quota_list": [
@@ -301,13 +381,13 @@ class TestHTTPServerIntegration:
         assert 'dir_path="/success"' in response_text
         
         # Should contain success metric for volume 1
-        assert 'afs_collection_success{volume_id="test-volume-1",zone="test-zone-1"} 1.0' in response_text
+        assert 'afs_collection_success{volume_id="test-volume-1",zone="test-zone-1"} 1\n' in response_text
         
         # Should contain failure metric for volume 2
-        assert 'afs_collection_success{volume_id="test-volume-2",zone="test-zone-2"} 0.0' in response_text
+        assert 'afs_collection_success{volume_id="test-volume-2",zone="test-zone-2"} 0\n' in response_text
         
         # Should contain error metric for volume 2
-        assert 'afs_collection_error{error="Volume not accessible",volume_id="test-volume-2",zone="test-zone-2"} 1.0' in response_text
+        assert 'afs_collection_error{error="Volume not accessible",volume_id="test-volume-2",zone="test-zone-2"} 1\n' in response_text
     
     def test_readiness_endpoint_integration(self, client, mock_afs_client):
         """Test the readiness endpoint with real components."""
@@ -350,6 +430,42 @@ class TestHTTPServerIntegration:
         # AFS client should only be called once due to caching
         assert mock_afs_client.get_volume_quotas.call_count == 1
     
+    def test_cached_payload_formatted_once(self, client, real_metrics_handler):
+        """Test that cache hits reuse the encoded payload instead of reformatting."""
+        response1 = client.get('/metrics')
+        assert response1.status_code == 200
+        
+        with patch.object(real_metrics_handler.transformer, 'format_prometheus_metrics',
+                          wraps=real_metrics_handler.transformer.format_prometheus_metrics) as mock_format:
+            response2 = client.get('/metrics')
+            response3 = client.get('/metrics')
+        
+        assert response2.data == response1.data
+        assert response3.data == response1.data
+        assert mock_format.call_count == 0
+    
+    def test_metrics_response_has_content_length(self, client):
+        """Test that the encoded payload is sent with an explicit Content-Length."""
+        for _ in range(2):
+            response = client.get('/metrics')
+            
+            assert response.status_code == 200
+            assert response.headers['Content-Length'] == str(len(response.data))
+            assert 'chunked' not in response.headers.get('Transfer-Encoding', '')
+    
+    def test_cached_metrics_bypass_flask(self, client, real_metrics_server):
+        """Test that cache hits on GET /metrics are served by the WSGI middleware."""
+        response1 = client.get('/metrics')
+        assert response1.status_code == 200
+        
+        with patch.object(real_metrics_server, '_handle_metrics_request') as mock_handle:
+            response2 = client.get('/metrics')
+        
+        mock_handle.assert_not_called()
+        assert response2.status_code == 200
+        assert response2.data == response1.data
+        assert response2.headers['Content-Type'] == response1.headers['Content-Type']
+    
     def test_cache_expiration(self, client, mock_afs_client, real_config):
         """Test that cache expires correctly."""
         # Temporarily reduce cache duration for testing
@@ -376,6 +492,49 @@ class TestHTTPServerIntegration:
             # Restore original cache duration
             real_config.collection.cache_duration = original_cache_duration
     
+    def test_cache_ttl_stretches_for_slow_collections(self, real_metrics_handler):
+        """Test that the cache lifetime covers a multiple of a slow collection."""
+        ttl = real_metrics_handler._effective_ttl_ns(60.0) / 1_000_000_000
+        assert 108.0 <= ttl <= 120.0
+        
+        metrics, _ = real_metrics_handler.collect_metrics()
+        ttl_metric = next(m for m in metrics if m.name == 'afs_cache_effective_ttl_seconds')
+        
+        # Fast collections keep the configured 30s duration; jitter only
+        # shortens it
+        assert 27.0 <= ttl_metric.value <= 30.0
+        assert real_metrics_handler.get_cache_status()['cache_ttl'] == ttl_metric.value
+    
+    def test_zero_cache_duration_disables_caching(self, client, mock_afs_client, real_config, real_metrics_handler):
+        """Test that cache_duration 0 collects on every scrape."""
+        real_config.collection.cache_duration = 0
+        
+        assert real_metrics_handler._effective_ttl_ns(60.0) == 0
+        
+        for expected_calls in (1, 2, 3):
+            response = client.get('/metrics')
+            assert response.status_code == 200
+            assert mock_afs_client.get_volume_quotas.call_count == expected_calls
+        
+        assert real_metrics_handler.get_cached_payload() is None
+    
+    def test_fresh_collection_formatted_once_per_scrape(self, client, mock_afs_client, real_config,
+                                                        real_metrics_handler, real_transformer):
+        """Test that an uncached scrape sends the payload built by its own collection."""
+        real_config.collection.cache_duration = 0
+        
+        with patch.object(real_transformer, 'format_prometheus_metrics',
+                          wraps=real_transformer.format_prometheus_metrics) as mock_format, \
+             patch.object(real_transformer, 'iter_prometheus_metrics',
+                          wraps=real_transformer.iter_prometheus_metrics) as mock_iter:
+            responses = [client.get('/metrics') for _ in range(2)]
+        
+        assert [response.status_code for response in responses] == [200, 200]
+        assert b'afs_capacity_used_bytes' in responses[1].data
+        assert responses[1].content_length == len(responses[1].data)
+        assert mock_format.call_count == 2
+        mock_iter.assert_not_called()
+    
     def test_error_handling_integration(self, client, mock_afs_client):
         """Test error handling when AFS client fails."""
         # Mock AFS client failure
@@ -407,6 +566,23 @@ class TestHTTPServerIntegration:
         assert 'afs_collection_error' in response_text
         assert 'Invalid credentials' in response_text
     
+    def test_failed_volume_not_requested_again_immediately(self, client, mock_afs_client, real_metrics_handler):
+        """Test that a volume failing with an API error is not re-requested by the next scrape."""
+        mock_afs_client.get_volume_quotas.side_effect = APIError("HTTP 503 Service Unavailable")
+        
+        response1 = client.get('/metrics')
+        response2 = client.get('/metrics')
+        
+        assert response1.status_code == 200
+        assert response2.status_code == 200
+        assert 'afs_collection_error' in response2.data.decode('utf-8')
+        assert mock_afs_client.get_volume_quotas.call_count == 1
+        
+        # Clearing the cache also forgets recent failures
+        real_metrics_handler.clear_cache()
+        client.get('/metrics')
+        assert mock_afs_client.get_volume_quotas.call_count == 2
+    
     def test_readiness_failure_integration(self, client, mock_afs_client):
         """Test readiness endpoint when AFS connectivity fails."""
         # Mock connectivity failure
@@ -523,7 +699,7 @@ class TestConcurrentRequestHandling:
         # Create a mock client with slow response
         mock_client = Mock(spec=AFSClient)
         
-        def slow_get_volume_quotas(volume_id, zone, timeout=30):
+        def slow_get_volume_quotas(volume_id, zone, timeout=30, deadline=None):
             time.sleep(0.1)  # Simulate slow API response
             return {
                 "dir_quota_list": [
@@ -576,6 +752,41 @@ class TestConcurrentRequestHandling:
         # At least half of the requests should be fast due to caching
         assert len(fast_requests) >= num_requests // 2, f"Expected at least {num_requests // 2} fast requests, got {len(fast_requests)}. Durations: {durations}"
     
+    def test_concurrent_collection_across_cache_expiry(self, real_config, mock_afs_client, real_transformer):
+        """Test many threads reading the lock-free cache while entries expire."""
+        real_config.collection.cache_duration = 0.05
+        metrics_handler = MetricsHandler(real_config, mock_afs_client, real_transformer)
+
+        num_threads = 32
+        barrier = threading.Barrier(num_threads)
+        stop_at = time.monotonic() + 0.3
+
+        def scrape():
+            barrier.wait()
+            seen = []
+            while time.monotonic() < stop_at:
+                metrics, _ = metrics_handler.collect_metrics()
+                seen.append(metrics)
+            return seen
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = [executor.submit(scrape) for _ in range(num_threads)]
+            results = [metrics for future in futures for metrics in future.result()]
+
+        # Every scrape saw a complete entry from a successful collection
+        assert results
+        for metrics in results:
+            names = {m.name for m in metrics}
+            assert 'afs_capacity_used_bytes' in names
+            assert 'afs_collection_error' not in names
+
+        # Entries expired and were replaced, but never collected per scrape
+        call_count = mock_afs_client.get_volume_quotas.call_count
+        assert 2 <= call_count < len(results)
+        assert call_count == metrics_handler.get_collection_stats()['total_collections']
+
+        metrics_handler.close()
+
     def test_request_timeout_handling(self, real_config, real_transformer):
         """Test handling of request timeouts."""
         # Create a mock client that times out
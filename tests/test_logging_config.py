@@ -0,0 +1,90 @@
+"""
+Unit tests for the logging configuration module.
+
+This module tests the redaction done by SanitizingFormatter and the context
+prefix added by ContextualLogger.
+"""
+
+import io
+import logging
+
+import pytest
+
+from src.logging_config import TRUSTED, ContextualLogger, SanitizingFormatter
+
+
+@pytest.fixture
+def log_stream():
+    """Attach a SanitizingFormatter handler to a fresh logger and yield (logger, stream)."""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(SanitizingFormatter('%(message)s'))
+    
+    base_logger = logging.getLogger('tests.logging_config')
+    base_logger.addHandler(handler)
+    base_logger.setLevel(logging.INFO)
+    base_logger.propagate = False
+    try:
+        yield ContextualLogger(base_logger), stream
+    finally:
+        base_logger.removeHandler(handler)
+
+
+class TestContextualLogger:
+    """Test cases for ContextualLogger."""
+    
+    def test_trusted_record_context_is_sanitized(self, log_stream):
+        """Test that client-controlled context is redacted even on TRUSTED records."""
+        logger, stream = log_stream
+        token = logger.set_context(endpoint='/metrics', user_agent='curl token=hunter2secret')
+        try:
+            logger.info("Served %d metrics", 3, extra=TRUSTED)
+        finally:
+            logger.clear_context(token)
+        
+        output = stream.getvalue()
+        assert 'hunter2secret' not in output
+        assert '***REDACTED***' in output
+        assert 'Served 3 metrics' in output
+    
+    def test_context_with_percent_sign(self, log_stream):
+        """Test that context values are not read as format directives."""
+        logger, stream = log_stream
+        token = logger.set_context(user_agent='agent/100%s')
+        try:
+            logger.info("Served %d metrics", 3, extra=TRUSTED)
+        finally:
+            logger.clear_context(token)
+        
+        assert stream.getvalue() == '[user_agent=agent/100%s] Served 3 metrics\n'
+
+
+class TestSanitizingFormatter:
+    """Test cases for SanitizingFormatter.sanitize."""
+    
+    LONG_VALUE = 'A' * 20 + 'b1c2d3e4f5g6h7i8j9k0'
+    
+    @pytest.mark.parametrize('text', [
+        f'secret={LONG_VALUE}',
+        f'"session_token": "{LONG_VALUE}"',
+        f'sig-v2={LONG_VALUE}',
+        f'X-Hmac-Sha256: {LONG_VALUE}',
+        f'credentials={LONG_VALUE}',
+    ])
+    def test_long_value_after_credential_key_is_redacted(self, text):
+        """Test that long tokens following a credential-like key are masked."""
+        sanitized = SanitizingFormatter.sanitize(text)
+        
+        assert self.LONG_VALUE not in sanitized
+        assert '***REDACTED***' in sanitized
+    
+    @pytest.mark.parametrize('text', [
+        'commit 9fd41ab3c2e1d0f9a8b7c6d5e4f3a2b1c0d9e8f7 deployed',
+        'sha256=e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855',
+        'volume_id=80433778429e11efbc974eca24dcdba9 zone=cn-sh-01e',
+        'dir_path=/data/aGVsbG8gd29ybGQgdGhpcyBpcyBhIGxvbmcgcGF0aA',
+        'afs_capacity_used_bytes_total_for_all_directories_in_volume 42',
+    ])
+    def test_bare_hashes_and_ids_are_kept(self, text):
+        """Test that long values without a credential-like key are not masked."""
+        assert SanitizingFormatter.sanitize(text) == text
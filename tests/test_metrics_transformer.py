@@ -5,11 +5,12 @@ This module tests the conversion of AFS quota data to Prometheus metrics,
 including label sanitization, metric naming, and edge case handling.
 """
 
+import dataclasses
 import pytest
 from unittest.mock import Mock, patch
 
 from src.metrics_transformer import MetricsTransformer
-from src.data_models import PrometheusMetric, AFSQuotaData
+from src.data_models import AFSQuotaData, LabelSet, PrometheusMetric
 
 
 class TestMetricsTransformer:
@@ -348,9 +349,17 @@ class TestMetricsTransformerLabelSanitization:
             'zone': 'zone',
             'dir_path': '/path/'  # ### becomes _, then trailing _ stripped, but / remains
         }
-        
+
         assert sanitized == expected
 
+    def test_sanitize_labels_every_ascii_character(self):
+        """Test that each ASCII character is kept or replaced as the pattern specifies."""
+        for code in range(128):
+            char = chr(code)
+            sanitized = self.transformer._sanitize_labels({'dir_path': f'a{char}b'})
+            expected = f'a{char}b' if char.isalnum() or char in '-_/.' else 'a_b'
+            assert sanitized['dir_path'] == expected, repr(char)
+
 
 class TestMetricsTransformerPrometheusFormat:
     """Test cases for Prometheus exposition format functionality."""
@@ -374,12 +383,43 @@ class TestMetricsTransformerPrometheusFormat:
         expected_lines = [
             '# HELP test_metric Test metric description',
             '# TYPE test_metric gauge',
-            'test_metric{label1="value1",label2="value2"} 42.0',
+            'test_metric{label1="value1",label2="value2"} 42',
             ''  # Final newline
         ]
         
         assert formatted == '\n'.join(expected_lines)
     
+    def test_format_prometheus_metrics_label_set(self):
+        """Test that a LabelSet is formatted like the equivalent dict."""
+        labels = LabelSet({'zone': 'z1', 'volume_id': 'v1'})
+        metric = PrometheusMetric(
+            name='test_metric',
+            value=1.0,
+            labels=labels,
+            help_text='Test metric',
+            metric_type='gauge'
+        )
+        
+        assert labels == {'volume_id': 'v1', 'zone': 'z1'}
+        assert labels.sorted_items == (('volume_id', 'v1'), ('zone', 'z1'))
+        assert self.transformer._format_metric_line(metric) == 'test_metric{volume_id="v1",zone="z1"} 1'
+    
+    def test_label_set_rendered_once(self):
+        """Test that a shared LabelSet's label string is rendered only once."""
+        labels = LabelSet({'zone': 'z1', 'dir_path': '/a"b'})
+        metrics = [
+            PrometheusMetric(name=name, value=1.0, labels=labels, help_text='Test metric', metric_type='gauge')
+            for name in ('metric_a', 'metric_b')
+        ]
+        
+        with patch.object(self.transformer, '_render_labels', wraps=self.transformer._render_labels) as mock_render:
+            output = self.transformer.format_prometheus_metrics(metrics)
+            self.transformer.format_prometheus_metrics(metrics)
+        
+        assert mock_render.call_count == 1
+        assert labels.rendered == '{dir_path="/a\\"b",zone="z1"}'
+        assert 'metric_b{dir_path="/a\\"b",zone="z1"} 1\n' in output
+    
     def test_format_prometheus_metrics_no_labels(self):
         """Test formatting of metric without labels."""
         metric = PrometheusMetric(
@@ -433,14 +473,51 @@ class TestMetricsTransformerPrometheusFormat:
         # Should have two metric lines
         metric_lines = [line for line in lines if not line.startswith('#')]
         assert len(metric_lines) == 2
-        assert 'test_metric{instance="server1"} 10.0' in metric_lines
-        assert 'test_metric{instance="server2"} 20.0' in metric_lines
+        assert 'test_metric{instance="server1"} 10' in metric_lines
+        assert 'test_metric{instance="server2"} 20' in metric_lines
     
     def test_format_prometheus_metrics_empty_list(self):
         """Test formatting of empty metrics list."""
         formatted = self.transformer.format_prometheus_metrics([])
         assert formatted == ""
     
+    @pytest.mark.parametrize('value, expected', [
+        (1.0, '1'),
+        (0.0, '0'),
+        (-3.0, '-3'),
+        (21643634736022.0, '21643634736022'),
+        (0.5411796569824219, '0.5411796569824219'),
+        (1e300, '1e+300'),
+        (float('inf'), '+Inf'),
+        (float('-inf'), '-Inf'),
+        (float('nan'), 'NaN'),
+        (7, '7'),
+    ])
+    def test_format_metric_line_values(self, value, expected):
+        """Test that sample values are written compactly and without precision loss."""
+        metric = PrometheusMetric(name='test_metric', value=value, labels={}, help_text='Test', metric_type='gauge')
+        
+        assert self.transformer._format_metric_line(metric) == f'test_metric {expected}'
+    
+    def test_iter_prometheus_metrics_yields_one_chunk_per_family(self):
+        """Test that streamed chunks are grouped by metric family."""
+        metrics = [
+            PrometheusMetric(name='metric_a', value=1.0, labels={'instance': 'server1'},
+                             help_text='Metric A', metric_type='gauge'),
+            PrometheusMetric(name='metric_b', value=2.0, labels={},
+                             help_text='Metric B', metric_type='gauge'),
+            PrometheusMetric(name='metric_a', value=3.0, labels={'instance': 'server2'},
+                             help_text='Metric A', metric_type='gauge')
+        ]
+        
+        chunks = list(self.transformer.iter_prometheus_metrics(metrics))
+        
+        assert len(chunks) == 2
+        assert chunks[0].startswith('# HELP metric_a Metric A\n')
+        assert chunks[0].count('\n') == 4
+        assert chunks[1] == '# HELP metric_b Metric B\n# TYPE metric_b gauge\nmetric_b 2\n'
+        assert ''.join(chunks) == self.transformer.format_prometheus_metrics(metrics)
+    
     def test_format_metric_line_with_quotes_in_labels(self):
         """Test formatting of metric line with quotes in label values."""
         metric = PrometheusMetric(
@@ -454,9 +531,23 @@ class TestMetricsTransformerPrometheusFormat:
         formatted_line = self.transformer._format_metric_line(metric)
         
         # Quotes and backslashes should be escaped
-        expected = 'test_metric{description="Value with\\\\backslash",path="/path/with\\"quotes"} 1.0'
+        expected = 'test_metric{description="Value with\\\\backslash",path="/path/with\\"quotes"} 1'
         assert formatted_line == expected
-    
+
+    def test_format_metric_line_with_newline_in_labels(self):
+        """Test that newlines in label values are escaped."""
+        metric = PrometheusMetric(
+            name='afs_collection_error',
+            value=1.0,
+            labels={'error': 'first line\nsecond "line"'},
+            help_text='Test',
+            metric_type='gauge'
+        )
+
+        formatted_line = self.transformer._format_metric_line(metric)
+
+        assert formatted_line == 'afs_collection_error{error="first line\\nsecond \\"line\\""} 1'
+
     def test_format_metric_line_label_sorting(self):
         """Test that labels are sorted in metric line formatting."""
         metric = PrometheusMetric(
@@ -470,7 +561,7 @@ class TestMetricsTransformerPrometheusFormat:
         formatted_line = self.transformer._format_metric_line(metric)
         
         # Labels should be sorted alphabetically
-        expected = 'test_metric{a_label="a_value",m_label="m_value",z_label="z_value"} 1.0'
+        expected = 'test_metric{a_label="a_value",m_label="m_value",z_label="z_value"} 1'
         assert formatted_line == expected
 
 
@@ -611,4 +702,115 @@ class TestMetricsTransformerEdgeCases:
         
         # Should propagate the exception
         with pytest.raises(ValueError, match="Invalid data format"):
-            self.transformer.transform_quota_data(response, "volume", "zone")
\ No newline at end of file
+            self.transformer.transform_quota_data(response, "volume", "zone")    
+    def test_data_models_are_slotted(self):
+        """Test that per-scrape data models carry no instance dict and metrics reject mutation."""
+        quota_data = AFSQuotaData(
+            volume_id="test-volume",
+            zone="test-zone",
+            dir_path="/test",
+            file_quantity_quota=0,
+            file_quantity_used_quota=0,
+            capacity_quota=0,
+            capacity_used_quota=0,
+            state=1
+        )
+        metric = self.transformer._create_usage_metrics(quota_data)[0]
+        
+        for obj in (quota_data, metric):
+            assert not hasattr(obj, '__dict__')
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            metric.value = 1.0
+    
+    def test_from_api_response_interns_volume_and_zone(self):
+        """Test that repeated volume_id and zone values share one string object."""
+        def make_item():
+            return {
+                "volume_id": "".join(["test-", "volume"]),
+                "dir_path": "/test",
+                "file_quantity_quota": 0,
+                "file_quantity_used_quota": 0,
+                "capacity_quota": 0,
+                "capacity_used_quota": 0,
+                "state": 1
+            }
+        
+        first = AFSQuotaData.from_api_response(make_item(), "".join(["test-", "zone"]))
+        second = AFSQuotaData.from_api_response(make_item(), "".join(["test-", "zone"]))
+        
+        assert first.volume_id is second.volume_id
+        assert first.zone is second.zone
+    
+    def test_released_quota_data_is_reused(self):
+        """Test that a released AFSQuotaData is repopulated instead of reallocated."""
+        item = {
+            "volume_id": "test-volume",
+            "dir_path": "/first",
+            "file_quantity_quota": 10,
+            "file_quantity_used_quota": 1,
+            "capacity_quota": 100,
+            "capacity_used_quota": 5,
+            "state": 1
+        }
+        first = AFSQuotaData.from_api_response(item, "test-zone")
+        first.release()
+        
+        second = AFSQuotaData.from_api_response(dict(item, dir_path="/second", state=0), "other-zone")
+        
+        assert second is first
+        assert second.dir_path == "/second"
+        assert second.zone == "other-zone"
+        assert second.state == 0
+    
+    def test_transform_does_not_leak_recycled_quota_data(self):
+        """Test that metrics keep their values after the quota data is recycled."""
+        def make_response(dir_path, used):
+            return {"dir_quota_list": [{
+                "volume_id": "test-volume",
+                "dir_path": dir_path,
+                "file_quantity_quota": 0,
+                "file_quantity_used_quota": 0,
+                "capacity_quota": 0,
+                "capacity_used_quota": used,
+                "state": 1
+            }]}
+        
+        first = self.transformer.transform_quota_data(make_response("/a", 1), "test-volume", "test-zone")
+        self.transformer.transform_quota_data(make_response("/b", 2), "test-volume", "test-zone")
+        
+        assert first[0].labels['dir_path'] == "/a"
+        assert first[0].value == 1.0
+    
+    def test_create_usage_metrics_share_row_labels(self):
+        """Test that all metrics for one quota row share a single labels dict."""
+        quota_data = AFSQuotaData(
+            volume_id="test-volume",
+            zone="test-zone",
+            dir_path="/test",
+            file_quantity_quota=10,
+            file_quantity_used_quota=1,
+            capacity_quota=100,
+            capacity_used_quota=5,
+            state=1
+        )
+        
+        metrics = self.transformer._create_usage_metrics(quota_data)
+        
+        assert len(metrics) == 7
+        assert all(m.labels is metrics[0].labels for m in metrics)
+        assert metrics[0].labels == {'volume_id': 'test-volume', 'zone': 'test-zone', 'dir_path': '/test'}
+    
+    def test_label_set_is_read_only(self):
+        """Test that shared label sets reject modification."""
+        labels = LabelSet({'zone': 'z1', 'volume_id': 'v1'})
+        
+        with pytest.raises(TypeError):
+            labels['zone'] = 'z2'
+        with pytest.raises(TypeError):
+            labels.update(zone='z2')
+        with pytest.raises(TypeError):
+            del labels['zone']
+        
+        assert labels == {'zone': 'z1', 'volume_id': 'v1'}
+        assert labels.sorted_items == (('volume_id', 'v1'), ('zone', 'z1'))
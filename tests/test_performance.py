@@ -7,6 +7,7 @@ numbers of directories.
 """
 
 import pytest
+import json
 import time
 import threading
 import psutil
@@ -113,11 +114,11 @@ class TestConcurrentRequests:
     
     def test_concurrent_metrics_requests_light_load(self, performance_config, mock_afs_response):
         """Test server performance with light concurrent load (10 requests)."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = mock_afs_response
+            mock_response.content = json.dumps(mock_afs_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create server components
@@ -202,11 +203,11 @@ class TestConcurrentRequests:
     
     def test_concurrent_metrics_requests_heavy_load(self, performance_config, mock_afs_response):
         """Test server performance with heavy concurrent load (50 requests)."""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = mock_afs_response
+            mock_response.content = json.dumps(mock_afs_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create server components
@@ -293,11 +294,11 @@ class TestConcurrentRequests:
         # Create a smaller response for sustained testing
         small_response = PerformanceTestHelper.create_large_afs_response(num_directories=50)
         
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = small_response
+            mock_response.content = json.dumps(small_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create server components
@@ -419,11 +420,11 @@ class TestMemoryUsage:
         
         config = PerformanceTestHelper.create_test_config(num_volumes=1)
         
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = large_response
+            mock_response.content = json.dumps(large_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Measure memory before processing
@@ -501,12 +502,12 @@ class TestMemoryUsage:
             volume_id = url.split('/')[-2] if '/' in url else 'default'
             num_dirs = 100 + hash(volume_id) % 200  # 100-300 directories per volume
             
-            mock_response.json.return_value = PerformanceTestHelper.create_large_afs_response(
+            mock_response.content = json.dumps(PerformanceTestHelper.create_large_afs_response(
                 num_directories=num_dirs
-            )
+            )).encode('utf-8')
             return mock_response
         
-        with patch('requests.get', side_effect=mock_get_side_effect) as mock_get:
+        with patch('requests.Session.get', side_effect=mock_get_side_effect) as mock_get:
             # Measure memory before processing
             gc.collect()
             start_memory = PerformanceTestHelper.get_memory_usage()
@@ -573,11 +574,11 @@ class TestLargeDirectoryHandling:
         
         config = PerformanceTestHelper.create_test_config(num_volumes=1)
         
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = large_response
+            mock_response.content = json.dumps(large_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create server components
@@ -656,11 +657,11 @@ class TestLargeDirectoryHandling:
         
         config = PerformanceTestHelper.create_test_config(num_volumes=1)
         
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = response_with_special_chars
+            mock_response.content = json.dumps(response_with_special_chars).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create transformer for testing
@@ -724,11 +725,11 @@ class TestLargeDirectoryHandling:
         
         config = PerformanceTestHelper.create_test_config(num_volumes=5)
         
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             # Configure mock response
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.json.return_value = mixed_response
+            mock_response.content = json.dumps(mixed_response).encode('utf-8')
             mock_get.return_value = mock_response
             
             # Create server components
@@ -0,0 +1,77 @@
+"""
+Unit tests for retry handling.
+
+This module tests retry decisions, backoff bounded by a deadline, and
+circuit breaker state.
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.exceptions import AFSCollectorError
+from src.retry_handler import CircuitState, RetryConfig, RetryHandler, retry_on_failure
+
+
+class TestRetryHandler:
+    """Test cases for RetryHandler.execute_with_retry."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.handler = RetryHandler(RetryConfig(max_attempts=3, base_delay=5.0, jitter=False))
+    
+    def test_retries_until_success(self):
+        """Test that retryable errors are retried."""
+        func = Mock(__name__='func', side_effect=[ConnectionError("reset"), "ok"])
+        
+        with patch('src.retry_handler.time.sleep') as mock_sleep:
+            result = self.handler.execute_with_retry(func)
+        
+        assert result.success
+        assert result.result == "ok"
+        assert func.call_count == 2
+        mock_sleep.assert_called_once_with(5.0)
+    
+    def test_backoff_not_slept_past_deadline(self):
+        """Test that no retry is scheduled when its backoff would pass the deadline."""
+        func = Mock(__name__='func', side_effect=ConnectionError("reset"))
+        
+        with patch('src.retry_handler.time.sleep') as mock_sleep:
+            result = self.handler.execute_with_retry(func, retry_deadline=time.monotonic() + 1.0)
+        
+        assert not result.success
+        assert isinstance(result.error, ConnectionError)
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+
+
+class TestRetryOnFailure:
+    """Test cases for the retry_on_failure decorator."""
+    
+    def test_repeated_failures_trip_shared_breaker(self):
+        """Test that failures from separate calls accumulate in one circuit breaker."""
+        func = Mock(__name__='func', side_effect=ConnectionError("reset"))
+        decorated = retry_on_failure(RetryConfig(max_attempts=1, failure_threshold=2),
+                                     circuit_breaker_name='shared')(func)
+        handler = decorated.retry_handler
+        
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                decorated()
+            assert decorated.retry_handler is handler
+        
+        assert handler.get_circuit_breaker('shared').state == CircuitState.OPEN
+        with pytest.raises(AFSCollectorError, match='Circuit breaker shared is open'):
+            decorated()
+        assert func.call_count == 2
+    
+    def test_each_decorated_function_gets_its_own_handler(self):
+        """Test that separately decorated functions do not share breaker state."""
+        decorator = retry_on_failure(RetryConfig(max_attempts=1), circuit_breaker_name='shared')
+        first = decorator(Mock(__name__='first', return_value=1))
+        second = decorator(Mock(__name__='second', return_value=2))
+        
+        assert first() == 1
+        assert second() == 2
+        assert first.retry_handler is not second.retry_handler